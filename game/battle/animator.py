@@ -0,0 +1,159 @@
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, QEasingCurve, Qt, pyqtSignal
+from . import timing
+
+
+class Tween:
+    __slots__ = ("duration", "elapsed", "start", "end", "curve", "on_value", "on_finish", "owner", "done")
+
+    def __init__(self, duration, start, end, curve, on_value, on_finish, owner):
+        self.duration = max(1.0, float(duration))
+        self.elapsed = 0.0
+        self.start = start
+        self.end = end
+        self.curve = curve
+        self.on_value = on_value
+        self.on_finish = on_finish
+        self.owner = owner
+        self.done = False
+
+    def value(self, progress: float):
+        k = self.curve.valueForProgress(progress) if self.curve is not None else progress
+        # works for floats and QPointF alike
+        return self.start + (self.end - self.start) * k
+
+    def stop(self):
+        self.done = True
+
+
+class Animator(QObject):
+    # one timer for the whole scene: every tween and delayed call advances in a single tick.
+    # the timer only runs while something is active.
+    activityChanged = pyqtSignal(bool)  # True when ticking starts, False when idle/paused
+
+    def __init__(self, parent=None, fps: int = 60):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(max(1, int(1000 / fps)))
+        self._timer.timeout.connect(self._tick)
+        self._clock = QElapsedTimer()
+        self._tweens: list[Tween] = []
+        self._calls: list[list] = []  # [remaining_ms, fn]
+        self._curves: dict = {}
+        self._paused = False
+        self.time_scale = 1.0  # multiplied with the global battle speed
+
+    # --- scheduling ---
+    def tween(self, duration_ms: int, start, end, on_value, on_finish=None,
+              easing=QEasingCurve.Linear, owner=None) -> Tween:
+        curve = None
+        if easing != QEasingCurve.Linear:
+            curve = self._curves.get(easing)
+            if curve is None:
+                curve = self._curves[easing] = QEasingCurve(easing)
+        tw = Tween(duration_ms, start, end, curve, on_value, on_finish, owner)
+        self._tweens.append(tw)
+        self._ensure_running()
+        return tw
+
+    def call_later(self, ms: int, fn):
+        # like QTimer.singleShot, but on the battle clock (scaled and pausable)
+        self._calls.append([max(0.0, float(ms)), fn])
+        self._ensure_running()
+
+    def cancel(self, owner):
+        for tw in self._tweens:
+            if tw.owner is owner:
+                tw.done = True
+
+    def active_count(self) -> int:
+        return sum(1 for tw in self._tweens if not tw.done)
+
+    # --- clock control ---
+    def pause(self):
+        self._paused = True
+        if self._timer.isActive():
+            self._timer.stop()
+            self.activityChanged.emit(False)
+
+    def resume(self):
+        if not self._paused:
+            return
+        self._paused = False
+        self._clock.restart()
+        if self._tweens or self._calls:
+            self._timer.start()
+            self.activityChanged.emit(True)
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def is_active(self) -> bool:
+        return self._timer.isActive()
+
+    def _ensure_running(self):
+        if self._paused or self._timer.isActive():
+            return
+        self._clock.restart()
+        self._timer.start()
+        self.activityChanged.emit(True)
+
+    def _tick(self):
+        speed = timing.speed() * self.time_scale
+        # instant speed: everything due completes on this tick
+        dt = self._clock.restart() * speed if speed > 0 else float("inf")
+
+        current, self._tweens = self._tweens, []
+        alive = []
+        for tw in current:
+            if tw.done:
+                continue
+            tw.elapsed += dt
+            finished = tw.elapsed >= tw.duration
+            try:
+                tw.on_value(tw.end if finished else tw.value(tw.elapsed / tw.duration))
+            except Exception:
+                finished = True
+            if finished:
+                tw.done = True
+                if callable(tw.on_finish):
+                    try:
+                        tw.on_finish()
+                    except Exception:
+                        pass
+            else:
+                alive.append(tw)
+        # tweens started from callbacks above begin on the next tick
+        self._tweens = alive + self._tweens
+
+        calls, self._calls = self._calls, []
+        pending = []
+        for c in calls:
+            c[0] -= dt
+            if c[0] <= 0:
+                try:
+                    c[1]()
+                except Exception:
+                    pass
+            else:
+                pending.append(c)
+        self._calls = pending + self._calls
+
+        if not self._tweens and not self._calls:
+            self._timer.stop()
+            self.activityChanged.emit(False)
+
+
+_default: Animator | None = None
+
+
+def animator_for(item) -> Animator:
+    # the scene's animator; a process-wide one for items not (yet) in a battle scene
+    global _default
+    sc = item.scene() if item is not None else None
+    anim = getattr(sc, "animator", None)
+    if anim is not None:
+        return anim
+    if _default is None:
+        _default = Animator()
+    return _default
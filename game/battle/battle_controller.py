@@ -1,118 +1,210 @@
-from PyQt5.QtCore import QTimer, QPointF
+from PyQt5.QtCore import QTimer, QPointF, QRectF
 from .battle_view import BattleView
 from .card_item import CardItem
 from .skill_card_item import SkillCardItem
+from game.core.battle_engine import BattleEngine, CHARGE_KINDS, new_seed
+from game.core.replay import BattleReplay
+from game.core.enemy_ai import EnemyPlanner
+from concurrent.futures import ThreadPoolExecutor
+from .frame_stats import profiled
+from .drop_zones import DropZoneIndex
+from .effect_item import EffectItem
+from game.core.content import get_registry, make_combatant, stage_teams
+from . import timing
 import os
-import json
+import math
 from PyQt5.QtWidgets import QLabel
-import random
-from types import SimpleNamespace
 
 
 class BattleController:
+    # battlefield halves (scene coords) that units are laid out in; the hand sits below
+    PLAYER_AREA = QRectF(20, 10, 400, 340)
+    ENEMY_AREA = QRectF(480, 10, 400, 340)
+
     def __init__(self, view: BattleView):
         self.view = view
         self.scene = view.battle_scene
+        # python time spent in the callbacks below shows up in the view's stats overlay
+        self.frame_stats = getattr(view, "frame_stats", None)
         # manual turn-based
         self.turn = 0  # even: player, odd: enemy
-        self.player: CardItem = None
-        self.enemy: CardItem = None
-        self.skill_cards = []
+        self.skill_cards = []  # bound (visible) cards of the current hand
+        self._hand_pool: list[SkillCardItem] = []
+        # headless rules; the items above only render its combatants
+        self.engine: BattleEngine | None = None
+        self._items = {}  # Combatant -> CardItem
+        # per-unit hit rects keyed by (side, team index); refreshed only when units are laid out
+        self._drop_zones = DropZoneIndex()
+        self._hovered: CardItem | None = None  # unit outlined under the dragged card
+        # floating numbers and hit particles of the whole battle, drawn by one item
+        self.fx = EffectItem(self.scene.sceneRect())
+        self.fx.setZValue(self.scene.Z_FX)
+        self.scene.addItem(self.fx)
+        self._ended = False
+        self.stage_id = None
+        # enemy turns are searched on a worker thread; the GUI thread only polls for the plan
+        self.planner: EnemyPlanner | None = None
+        self._ai_pool: ThreadPoolExecutor | None = None
+        self._ai_job = None
         # __file__ = .../game/battle/battle_controller.py; go up two to reach project root
         self._project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         # energy
-        self.energy_max = 5
-        self.energy = 5
         self._energy_label: QLabel | None = None
         # end callback
         self.on_end = None
         self._battle_result = None  # 'win' or 'lose'
         # visuals
         self._slot_bg_items = []
-        # stats
-        self.rounds = 0
-        self.damage_dealt = 0
-        self.damage_taken = 0
+        self._slot_geom = None
         # logger
         self.log_fn = None
+        # profile store (SaveManager); deck and rewards go through it, see set_save
+        self.save = None
+        self._deck: list | None = None
+
+    def set_save(self, save):
+        # the deck is cached here and refreshed by the store's change signal, not re-read per turn
+        if self.save is not None:
+            self.save.unsubscribe('deck', self._on_deck_changed)
+        self.save = save
+        self._deck = save.get_deck() if save is not None else None
+        if save is not None:
+            save.subscribe('deck', self._on_deck_changed)
+
+    def _on_deck_changed(self, key):
+        self._deck = self.save.get_deck()
 
     def load_demo_stage(self):
-        # Resolve project root from this file: .../game/battle/battle_controller.py -> project root
-        assets_dir = os.path.join(self._project_root, "assets", "Card")
-        assets_dir = os.path.abspath(assets_dir)
-        face = os.path.join(assets_dir, "FrontTexture.png")
-        enemy_face = os.path.join(assets_dir, "Plastic1.png")
-        print(f"[BattleController] Hero image path: {face} exists={os.path.exists(face)}")
-        print(f"[BattleController] Enemy image path: {enemy_face} exists={os.path.exists(enemy_face)}")
-
-        self.player = CardItem(face, name="Hero", max_hp=120, atk=25)
-        self.enemy = CardItem(enemy_face, name="Slime", max_hp=100, atk=18)
-
-        self.scene.addItem(self.player)
-        self.scene.addItem(self.enemy)
-
-        # layout: hero further left, slime further right
-        self.player.setPos(100, 150)
-        self.enemy.setPos(650, 150)
-
-        # load hero energy_max from data/cards.json if available
-        try:
-            with open(os.path.join(self._project_root, "data", "cards.json"), "r", encoding="utf-8") as f:
-                cards_cfg = json.load(f).get("cards", [])
-                for c in cards_cfg:
-                    if c.get("name") == "Hero" and "energy_max" in c:
-                        self.energy_max = int(c["energy_max"]) or 5
-                        break
-        except Exception:
-            pass
-        self.energy = self.energy_max
-
-    def start_battle(self):
+        self.load_stage(1)
+
+    def load_stage(self, stage_id):
+        reg = get_registry(self._project_root)
+        stage = reg.stage(stage_id)
+        if stage is None:
+            raise ValueError(f"stage {stage_id!r} not found in data/stages.json")
+        self.stage_id = stage_id
+        self._clear_units()
+        players, enemies = stage_teams(stage)
+        player_items = self._spawn_team('self', players, self.PLAYER_AREA)
+        enemy_items = self._spawn_team('enemy', enemies, self.ENEMY_AREA)
+
+        # energy comes from the leader's entry in data/cards.json
+        energy_max = reg.energy_max(player_items[0].name)
+        self.engine = BattleEngine([it.unit for it in player_items], [it.unit for it in enemy_items],
+                                   energy_max=energy_max)
+        # higher stages search longer and wider (see enemy_ai.difficulty)
+        self.planner = EnemyPlanner.for_floor(stage_id)
+        self._ai_job = None
+        # surface content errors (e.g. bad formulas) while loading, not mid-battle
+        self._load_content()
+
+    def _resolve_image(self, rel_path: str) -> str:
+        # allow assets/... relative to project root
+        if not rel_path or os.path.isabs(rel_path):
+            return rel_path
+        return os.path.join(self._project_root, rel_path.replace("/", os.sep))
+
+    def _spawn_team(self, side: str, entries: list, area: QRectF) -> list:
+        placed = all("x" in e and "y" in e for e in entries)
+        size, positions = self._grid_layout(len(entries), area)
+        if placed:
+            size = 200 if len(entries) <= 2 else size
+        items = []
+        for i, entry in enumerate(entries):
+            item = CardItem(self._resolve_image(entry.get("image", "")), name=entry.get("name", "?"),
+                            unit=make_combatant(entry), size=size)
+            self.scene.addItem(item)
+            item.setPos(QPointF(entry["x"], entry["y"]) if placed else positions[i])
+            self._items[item.unit] = item
+            # units always tween back to this spot, so it is their drop zone
+            self._drop_zones.set_zone((side, i), item.sceneBoundingRect())
+            items.append(item)
+        return items
+
+    @staticmethod
+    def _grid_layout(n: int, area: QRectF) -> tuple:
+        # largest square card (<= 200px, bars included) that fits n units into area
+        bar = 14
+        best_size, best_cols = 0, 1
+        for cols in range(1, n + 1):
+            rows = math.ceil(n / cols)
+            size = min(area.width() / cols, area.height() / rows - bar) * 0.92
+            if size > best_size:
+                best_size, best_cols = size, cols
+        size = int(min(200, best_size))
+        cols = best_cols
+        rows = math.ceil(n / cols)
+        cell_w, cell_h = area.width() / cols, area.height() / rows
+        positions = []
+        for i in range(n):
+            r, c = divmod(i, cols)
+            positions.append(QPointF(area.x() + c * cell_w + (cell_w - size) / 2,
+                                     area.y() + r * cell_h + (cell_h - size - bar) / 2))
+        return size, positions
+
+    def _clear_units(self):
+        for item in list(self._items.values()):
+            self.scene.animator.cancel(item)
+            self.scene.removeItem(item)
+        self._items.clear()
+        self._drop_zones.clear()
+        self._hovered = None
+        self.fx.clear()
+
+    @property
+    def player(self) -> CardItem | None:
+        # leader item: casts the hand cards
+        return self._items.get(self.engine.player) if self.engine else None
+
+    @property
+    def enemy(self) -> CardItem | None:
+        return self._items.get(self.engine.enemy) if self.engine else None
+
+    @property
+    def energy(self) -> int:
+        return self.engine.energy if self.engine else 0
+
+    @property
+    def energy_max(self) -> int:
+        return self.engine.energy_max if self.engine else 0
+
+    @property
+    def rounds(self) -> int:
+        return self.engine.rounds if self.engine else 0
+
+    @property
+    def damage_dealt(self) -> int:
+        return self.engine.damage_dealt if self.engine else 0
+
+    @property
+    def damage_taken(self) -> int:
+        return self.engine.damage_taken if self.engine else 0
+
+    def start_battle(self, seed: int | None = None):
         self.turn = 0  # player turn
-        self.rounds = 0
-        self.damage_dealt = 0
-        self.damage_taken = 0
+        self._ended = False
+        self._ai_job = None
+        if self.planner is not None:
+            self.planner.reset()
+        self.engine.start(seed=new_seed() if seed is None else seed)
         self.start_player_turn()
 
     def stop_battle(self):
         # nothing periodic now
         pass
 
+    def _load_content(self):
+        # served from the shared registry; files are re-parsed only when they change on disk
+        reg = get_registry(self._project_root)
+        deck = self._deck if self._deck is not None else reg.deck()
+        self.engine.set_content(reg.skill_cards(), reg.effect_logic(), deck, reg.compiled_cards())
+
+    @profiled
     def create_skill_cards(self):
         scene_rect = self.scene.sceneRect()
         # fixed five slots; card size 84x108
         card_w, card_h = 84, 108
         spacing = 16
-        # load definitions
-        data_dir = os.path.join(self._project_root, "data")
-        cfg_path = os.path.join(data_dir, "skillscard.json")
-        try:
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-                defs = cfg.get("cards", [])
-        except Exception:
-            defs = []
-        # map by id for deck resolution
-        defs_by_id = {c.get("id"): c for c in defs if c.get("id")}
-        # load effect logic
-        logic = self._load_effect_logic()
-        # read deck: prefer player.json deck, fallback to deck.json
-        deck_ids = []
-        try:
-            with open(os.path.join(self._project_root, "data", "player.json"), "r", encoding="utf-8") as f:
-                deck_ids = json.load(f).get("deck", [])
-        except Exception:
-            try:
-                with open(os.path.join(self._project_root, "data", "deck.json"), "r", encoding="utf-8") as f:
-                    deck_ids = json.load(f).get("deck", [])
-            except Exception:
-                deck_ids = []
-        # build pool from deck (fallback to all defs)
-        pool = [defs_by_id[i] for i in deck_ids if i in defs_by_id] or list(defs)
-        # pick up to 5 cards without replacement; if不足5则留空
-        chosen: list[dict] = []
-        if len(pool) > 0:
-            chosen = random.sample(pool, min(5, len(pool)))
 
         # compute layout for exactly five slots
         n = 5
@@ -123,162 +215,266 @@ class BattleController:
         # draw slot backgrounds (5 fixed positions)
         self._draw_slot_backgrounds(start_x, y, card_w, card_h, spacing)
 
-        # helper target checks
-        def collides(a_item, b_item):
-            try:
-                return a_item.collidesWithItem(b_item)
-            except Exception:
-                # fallback: bounding box check
-                return a_item.mapToScene(a_item.boundingRect()).boundingRect().intersects(
-                    b_item.mapToScene(b_item.boundingRect()).boundingRect()
-                )
-
-        # helpers
-        def resolve_image(rel_path: str) -> str:
-            # allow assets/... relative to project root
-            if os.path.isabs(rel_path):
-                return rel_path
-            return os.path.join(self._project_root, rel_path.replace("/", os.sep))
-
-        def add_card(idx: int, cdef: dict):
-            label = cdef.get("label", "")
-            img = resolve_image(cdef.get("image", ""))
-            cost = int(cdef.get("cost", 0))
-            origin = QPointF(start_x + idx * (card_w + spacing), y)
-            effects = cdef.get("effects", [])
-
-            # decide required target: if any effect targets enemy -> enemy, else self
-            required_target = 'self'
-            for e in effects:
-                ename = e.get('name')
-                ed = logic.get('effects', {}).get(ename, {})
-                if ed.get('target') == 'enemy':
-                    required_target = 'enemy'
-                    break
-
-            def is_valid(item: SkillCardItem):
-                if required_target == 'enemy':
-                    return collides(item, self.enemy)
-                else:
-                    return collides(item, self.player)
-
-            def apply(item: SkillCardItem):
-                if not self.spend_energy(cost):
-                    return False
-                # execute all declared effects
-                for eff in effects:
-                    ename = eff.get('name')
-                    params = dict(eff)
-                    edef = logic.get('effects', {}).get(ename, {})
-                    self._execute_effect(edef, params, label)
-                return True
-
-            card = SkillCardItem(card_w, card_h, label, origin, apply, is_valid, img)
+        # hand items are pooled: created once, then rebound every turn
+        while len(self._hand_pool) < n:
+            card = SkillCardItem(card_w, card_h, apply_fn=self._apply_card, is_valid_target_fn=self._is_valid_drop,
+                                 hover_fn=self._hover_drop)
+            card.setVisible(False)
             self.scene.addItem(card)
+            self._hand_pool.append(card)
+
+        # slots left empty if the hand has fewer than five cards
+        hand = self.engine.hand[:n]
+        for i, card in enumerate(self._hand_pool):
+            cdef = hand[i] if i < len(hand) else None
+            if cdef is None:
+                card.release()
+                continue
+            origin = QPointF(start_x + i * (card_w + spacing), y)
+            card.bind(i, cdef.get("label", ""), self._resolve_image(cdef.get("image", "")), origin,
+                      self.engine.required_target(cdef))
             self.skill_cards.append(card)
             try:
                 card.appear(220)
             except Exception:
                 pass
 
-        for i in range(5):
-            if i < len(chosen):
-                add_card(i, chosen[i])
-            else:
-                # empty slot; no card
-                pass
+    def _unit_under(self, item: SkillCardItem, side: str) -> int | None:
+        # living unit of `side` the card overlaps most
+        key = self._drop_zones.query(item.sceneBoundingRect(),
+                                     lambda k: k[0] == side and self.engine.is_valid_target(side, k[1]))
+        return None if key is None else key[1]
+
+    def _hover_drop(self, item: SkillCardItem | None):
+        # outline the unit a drop would hit; scene items are touched only when it changes
+        target = None
+        if item is not None and self.engine is not None:
+            idx = self._unit_under(item, item.required_target)
+            if idx is not None:
+                target = self._items.get(self.engine.team(item.required_target)[idx])
+        if target is self._hovered:
+            return
+        if self._hovered is not None:
+            self._hovered.set_highlight(False)
+        if target is not None:
+            target.set_highlight(True)
+        self._hovered = target
+
+    @profiled
+    def _is_valid_drop(self, item: SkillCardItem) -> bool:
+        item.drop_target = self._unit_under(item, item.required_target)
+        return item.drop_target is not None
+
+    @profiled
+    def _apply_card(self, item: SkillCardItem) -> bool:
+        events = self.engine.play_card(item.slot, item.drop_target)
+        if events is None:
+            return False
+        self.update_energy_label()
+        self._render_events(events)
+        return True
 
     def clear_skill_cards(self):
-        for c in list(self.skill_cards):
-            try:
-                self.scene.removeItem(c)
-            except Exception:
-                pass
+        for c in self._hand_pool:
+            c.release()
         self.skill_cards.clear()
 
+    @profiled
     def start_player_turn(self):
-        if self.player.is_dead() or self.enemy.is_dead():
+        if self.engine.is_over():
             self.on_battle_end()
             return
         self.turn = 0
-        self.rounds += 1
-        # refill energy at start of player's turn
-        self.energy = self.energy_max
+        self._load_content()
+        self.engine.start_player_turn()
+        if self.engine.status_events:
+            # round-start ticks (poison); a battle they end is closed by _render_events
+            self._render_events(self.engine.status_events)
+            if self.engine.is_over():
+                return
         self.update_energy_label()
         self.clear_skill_cards()
         self.create_skill_cards()
 
+    @profiled
     def end_player_turn(self):
         # player indicates end of turn
+        if self._ended:
+            return
         self.clear_skill_cards()
-        self.enemy_turn()
+        self.engine.end_player_turn()
+        self._plan_enemy_turn()
 
-    def enemy_turn(self):
-        if self.player.is_dead() or self.enemy.is_dead():
+    def _plan_enemy_turn(self):
+        if self.planner is None or self.engine.is_over():
+            self.enemy_turn()
+            return
+        if self._ai_pool is None:
+            self._ai_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enemy-ai")
+        self.turn = 1
+        # the search reads a snapshot, so rendering continues while it runs
+        job = self._ai_pool.submit(self.planner.plan, self.engine.clone())
+        self._ai_job = job
+        self._poll_plan(job)
+
+    def _poll_plan(self, job):
+        if job is not self._ai_job or self._ended:
+            return  # battle restarted or left meanwhile
+        animator = self.scene.animator
+        if not job.done() or animator.is_paused():
+            # on the battle clock, so the pause dialog also holds back the enemy's turn
+            animator.call_later(8, lambda: self._poll_plan(job))
+            return
+        self._ai_job = None
+        try:
+            plan = job.result()
+        except Exception as e:
+            print(f"[BattleController] enemy planner failed: {e}")
+            plan = None  # plain attacks
+        self.enemy_turn(plan)
+
+    @profiled
+    def enemy_turn(self, plan: list | None = None):
+        self.turn = 1
+        events = self.engine.enemy_turn(plan)
+        if not events:
             self.on_battle_end()
             return
-        attacker = self.enemy
-        defender = self.player
-
-        def on_hit():
-            prev_hp, prev_shield = defender.hp, defender.shield
-            hp_left = defender.take_damage(attacker.atk)
-            defender.play_hit_fx()
-            dealt = (prev_hp + prev_shield) - (defender.hp + defender.shield)
-            self.damage_taken += max(0, int(dealt))
-            if callable(self.log_fn):
-                try:
-                    self.log_fn(f"{attacker.name} 攻击了 {defender.name}，造成了 {max(0,int(dealt))} 点伤害")
-                except Exception:
-                    pass
-            if hp_left <= 0:
-                # player died -> lose
-                self._battle_result = 'lose' if defender is self.player else 'win'
+
+        def after():
+            if self.engine.is_over():
                 self.on_battle_end()
                 return
             # back to player's turn after enemy completes
-            QTimer.singleShot(250, self.start_player_turn)
+            self.scene.animator.call_later(250, self.start_player_turn)
+
+        # units act in turn order; overlap their charges a little so big fights stay brisk
+        self._render_events(events, after, stagger_ms=160)
+
+    @profiled
+    def _render_events(self, events: list, done=None, stagger_ms: int = 0):
+        # replay resolved engine events as animations; state is already final
+        charged = CHARGE_KINDS + ("attack",)
+        # one count per charged hit plus one held until every event is dispatched: at instant
+        # speed charge_attack lands its hit synchronously, and finish() must still run only once
+        remaining = [sum(1 for e in events if e.get("apply") in charged) + 1]
+        delay = 0
+
+        def finish():
+            if callable(done):
+                done()
+            elif self.engine.is_over():
+                # defer: we may still be inside the dropped card's mouse handler
+                QTimer.singleShot(0, self.on_battle_end)
+
+        def release():
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                finish()
+
+        for ev in events:
+            if ev.get("apply") in charged:
+                def on_hit(ev=ev):
+                    self._render_effect(ev)
+                    release()
+                attacker = self._items.get(ev["source"])
+                target = self._items.get(ev["target"])
+                if delay and not timing.is_instant():
+                    self.scene.animator.call_later(
+                        delay, lambda a=attacker, t=target, f=on_hit: a.charge_attack(t.pos(), f))
+                else:
+                    attacker.charge_attack(target.pos(), on_hit)
+                delay += stagger_ms
+            else:
+                self._render_effect(ev)
+        release()
+
+    @profiled
+    def _render_effect(self, ev: dict):
+        kind = ev.get("apply")
+        src = self._items.get(ev.get("source"))
+        tgt = self._items.get(ev.get("target"))
+        hit_items = [self._items.get(u) for u in ev.get("targets") or ()]
+        for it in [src, tgt] + hit_items:
+            if it is not None:
+                it.update_bars()
+                # fallen units stay on the field, dimmed
+                it.setOpacity(0.35 if it.is_dead() else 1.0)
+        try:
+            if kind in CHARGE_KINDS + ("attack", "damage_n"):
+                hits = max(1, int(ev.get("hits", 1)))
+                for h in range(hits):
+                    tgt.play_hit_fx()
+                    self.fx.burst(self._center(tgt), 10, delay_ms=h * 90)
+                self.fx.number(self._center(tgt), ev.get("value", 0))
+                if kind == 'lifesteal' and ev.get("value"):
+                    self.fx.number(self._center(src), f"+{ev['value']}", "heal", delay_ms=150)
+            elif kind == 'damage_all':
+                for it, dealt in zip(hit_items, ev.get("dealt") or ()):
+                    if it is not None:
+                        it.play_hit_fx()
+                        self.fx.burst(self._center(it), 6)
+                        self.fx.number(self._center(it), dealt)
+            elif kind == 'heal':
+                src.heartbeat(times=3, duration_ms=800)
+                self.fx.number(self._center(tgt), f"+{ev.get('value', 0)}", "heal")
+            elif kind == 'shield':
+                src.heartbeat(times=3, duration_ms=1000)
+                self.fx.number(self._center(tgt), f"+{ev.get('value', 0)}", "shield")
+            elif kind == 'set_next_damage_taken_multiplier':
+                tgt.wobble(duration_ms=800)
+            elif kind == 'gain_energy':
+                self.update_energy_label()
+            elif kind == 'add_strength':
+                src.heartbeat(times=2, duration_ms=600)
+            elif kind == 'status' and ev.get("hits"):
+                tgt.play_hit_fx()
+                self.fx.burst(self._center(tgt), 6, "status")
+                self.fx.number(self._center(tgt), ev.get("value", 0), "status")
+        except Exception:
+            pass
+        if callable(self.log_fn) and ev.get("log"):
+            try:
+                self.log_fn(ev["log"])
+            except Exception:
+                pass
 
-        attacker.charge_attack(defender.pos(), on_hit)
+    @staticmethod
+    def _center(item: CardItem) -> QPointF:
+        return item.sceneBoundingRect().center()
 
+    @profiled
     def on_battle_end(self):
+        if self._ended:
+            return
+        self._ended = True
+        self._battle_result = self.engine.result
         self.clear_skill_cards()
         if callable(self.on_end):
             try:
                 rewards = {}
                 if self._battle_result == 'win':
                     rewards = {"diamonds": 5}
-                    # persist to data/player.json
-                    try:
-                        ppath = os.path.join(self._project_root, 'data', 'player.json')
-                        import json as _json
-                        data = {}
-                        if os.path.exists(ppath):
-                            with open(ppath, 'r', encoding='utf-8') as f:
-                                data = _json.load(f)
-                        cur = int(data.get('diamonds', 0))
-                        new_val = cur + rewards['diamonds']
-                        data['diamonds'] = new_val
-                        with open(ppath, 'w', encoding='utf-8') as f:
-                            _json.dump(data, f, ensure_ascii=False, indent=2)
-                        rewards['prev_diamonds'] = cur
-                        rewards['new_diamonds'] = new_val
-                    except Exception:
-                        pass
+                    if self.save is not None:
+                        rewards['prev_diamonds'] = self.save.get_diamonds()
+                        rewards['new_diamonds'] = self.save.add_diamonds(rewards['diamonds'])
                 payload = {
                     "result": self._battle_result,
-                    "stats": {
-                        "rounds": self.rounds,
-                        "damage_dealt": self.damage_dealt,
-                        "damage_taken": self.damage_taken,
-                    },
+                    "stats": self.engine.stats(),
                     "rewards": rewards,
+                    # seed + ordered plays; re-simulates headlessly via BattleReplay.simulate
+                    "replay": BattleReplay.from_engine(self.engine, stage=self.stage_id).to_dict(),
                 }
                 self.on_end(payload)
             except Exception:
                 pass
 
     def _draw_slot_backgrounds(self, start_x: float, y: float, w: int, h: int, spacing: int):
+        # slots never move; only rebuild when the layout changes
+        geom = (start_x, y, w, h, spacing)
+        if self._slot_bg_items and self._slot_geom == geom:
+            return
+        self._slot_geom = geom
         # remove old
         for it in list(self._slot_bg_items):
             try:
@@ -300,155 +496,6 @@ class BattleController:
             self.scene.addItem(rect)
             self._slot_bg_items.append(rect)
 
-    # --- data-driven effect engine ---
-    def _load_effect_logic(self) -> dict:
-        try:
-            with open(os.path.join(self._project_root, 'data', 'skillcardLogic.json'), 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {"effects": {}}
-
-    def _compute_formula(self, formula: str, source: CardItem, target: CardItem, params: dict) -> int:
-        # safe eval with restricted namespace
-        safe_globals = {"__builtins__": {}}
-        safe_globals.update({"round": round, "min": min, "max": max})
-        safe_locals = {
-            "source": SimpleNamespace(
-                atk=int(getattr(source, 'atk', 0) + getattr(source, 'strength', 0)),
-                max_hp=int(getattr(source, 'max_hp', 0)),
-                hp=int(getattr(source, 'hp', 0)),
-                shield=int(getattr(source, 'shield', 0)),
-            ),
-            "target": SimpleNamespace(
-                atk=int(getattr(target, 'atk', 0)) if target else 0,
-                max_hp=int(getattr(target, 'max_hp', 0)) if target else 0,
-                hp=int(getattr(target, 'hp', 0)) if target else 0,
-                shield=int(getattr(target, 'shield', 0)) if target else 0,
-            ),
-            "multiplier": float(params.get('multiplier', 1.0)),
-        }
-        try:
-            val = eval(formula, safe_globals, safe_locals)
-            return int(val)
-        except Exception:
-            return 0
-
-    def _execute_effect(self, edef: dict, params: dict, label: str):
-        etarget = edef.get('target', 'enemy')
-        apply_kind = edef.get('apply')
-        formula = edef.get('formula', '0')
-        log_tpl = edef.get('log', '')
-        src = self.player
-        tgt = self.enemy if etarget == 'enemy' else self.player
-
-        # compute value
-        value = self._compute_formula(formula, src, tgt, params)
-
-        if apply_kind == 'damage':
-            # play attack animation then apply hit
-            prev_hp, prev_shield = tgt.hp, tgt.shield
-
-            def on_hit():
-                hp_left = tgt.take_damage(max(0, int(value)))
-                tgt.play_hit_fx()
-                dealt = (prev_hp + prev_shield) - (tgt.hp + tgt.shield)
-                self.damage_dealt += max(0, int(dealt))
-                # log after knowing real dealt
-                if callable(self.log_fn) and log_tpl:
-                    try:
-                        target_name = tgt.name if hasattr(tgt, 'name') else '目标'
-                        txt = log_tpl.format(label=label, value=int(dealt), target_name=target_name)
-                        self.log_fn(txt)
-                    except Exception:
-                        pass
-
-            self.player.charge_attack(tgt.pos(), on_hit)
-            return
-        elif apply_kind == 'damage_n':
-            # multi-hit without repeated charge; apply sequential hits
-            times = int(params.get('times', 2))
-            total_dealt = 0
-            for _ in range(max(1, times)):
-                prev_hp, prev_shield = tgt.hp, tgt.shield
-                hp_left = tgt.take_damage(max(0, int(value)))
-                try:
-                    tgt.play_hit_fx()
-                except Exception:
-                    pass
-                dealt = (prev_hp + prev_shield) - (tgt.hp + tgt.shield)
-                total_dealt += max(0, int(dealt))
-                if hp_left <= 0:
-                    break
-            self.damage_dealt += total_dealt
-            if callable(self.log_fn) and log_tpl:
-                try:
-                    target_name = tgt.name if hasattr(tgt, 'name') else '目标'
-                    txt = log_tpl.format(label=label, value=int(total_dealt), target_name=target_name)
-                    self.log_fn(txt)
-                except Exception:
-                    pass
-        elif apply_kind == 'heal':
-            src.heal(max(0, int(value)))
-            try:
-                src.heartbeat(times=3, duration_ms=800)
-            except Exception:
-                pass
-        elif apply_kind == 'shield':
-            src.add_shield(max(0, int(value)))
-            try:
-                src.heartbeat(times=3, duration_ms=1000)
-            except Exception:
-                pass
-        elif apply_kind == 'lifesteal':
-            # deal damage, then heal same amount actually dealt
-            prev_hp, prev_shield = tgt.hp, tgt.shield
-            def on_hit():
-                hp_left = tgt.take_damage(max(0, int(value)))
-                try:
-                    tgt.play_hit_fx()
-                except Exception:
-                    pass
-                dealt = (prev_hp + prev_shield) - (tgt.hp + tgt.shield)
-                dealt = max(0, int(dealt))
-                self.damage_dealt += dealt
-                if dealt > 0:
-                    src.heal(dealt)
-                if callable(self.log_fn) and log_tpl:
-                    try:
-                        target_name = tgt.name if hasattr(tgt, 'name') else '目标'
-                        txt = log_tpl.format(label=label, value=int(dealt), target_name=target_name)
-                        self.log_fn(txt)
-                    except Exception:
-                        pass
-            self.player.charge_attack(tgt.pos(), on_hit)
-            return
-        elif apply_kind == 'set_next_damage_taken_multiplier':
-            try:
-                tgt.next_damage_taken_multiplier = float(params.get('multiplier', 1.0))
-                tgt.wobble(duration_ms=800)
-            except Exception:
-                pass
-        elif apply_kind == 'gain_energy':
-            val = max(0, int(value))
-            self.energy = min(self.energy_max, self.energy + val)
-            self.update_energy_label()
-        elif apply_kind == 'add_strength':
-            add = max(0, int(value))
-            cur = int(getattr(self.player, 'strength', 0))
-            setattr(self.player, 'strength', cur + add)
-            try:
-                self.player.heartbeat(times=2, duration_ms=600)
-            except Exception:
-                pass
-        # log immediate effects
-        if apply_kind != 'damage' and callable(self.log_fn) and log_tpl:
-            try:
-                target_name = tgt.name if hasattr(tgt, 'name') else '目标'
-                txt = log_tpl.format(label=label, value=int(value), target_name=target_name)
-                self.log_fn(txt)
-            except Exception:
-                pass
-
     # energy helpers and UI
     def set_energy_label(self, lbl: QLabel):
         self._energy_label = lbl
@@ -459,10 +506,8 @@ class BattleController:
             self._energy_label.setText(f"能量 {self.energy}/{self.energy_max}")
 
     def spend_energy(self, cost: int) -> bool:
-        cost = max(0, int(cost))
-        if self.energy < cost:
+        if not self.engine.spend_energy(cost):
             # not enough
             return False
-        self.energy -= cost
         self.update_energy_label()
         return True
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QGraphicsScene
 from PyQt5.QtGui import QBrush, QColor
+from .animator import Animator
 
 
 class BattleScene(QGraphicsScene):
@@ -13,3 +14,6 @@ class BattleScene(QGraphicsScene):
         self.Z_UNIT = 10
         self.Z_FX = 20
         self.Z_UI = 30
+
+        # single clock for every battle tween and delayed call
+        self.animator = Animator(self)
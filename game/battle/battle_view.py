@@ -1,29 +1,161 @@
-from PyQt5.QtWidgets import QGraphicsView
-from PyQt5.QtGui import QTransform
+from PyQt5.QtWidgets import QGraphicsView, QWidget
+from PyQt5.QtGui import QTransform, QOpenGLContext, QColor, QFont
 from PyQt5.QtWidgets import QOpenGLWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from .battle_scene import BattleScene
+from . import render_policy
+from .frame_stats import FrameStats, BUCKETS
+import os
+import time
+
+
+def _opengl_available() -> bool:
+    # probe a context up front; QOpenGLWidget fails silently (black viewport) otherwise
+    try:
+        ctx = QOpenGLContext()
+        return bool(ctx.create())
+    except Exception:
+        return False
 
 
 class BattleView(QGraphicsView):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, use_opengl: bool | None = None):
         super().__init__(parent)
-        try:
-            self.setViewport(QOpenGLWidget())
-        except Exception:
-            pass
+        if use_opengl is None:
+            use_opengl = os.environ.get("GACHA_SLAY_RASTER", "") != "1"
+        self._opengl = False
+        self._gl_checked = False
+        if use_opengl and _opengl_available():
+            try:
+                self.setViewport(QOpenGLWidget())
+                self._opengl = True
+            except Exception:
+                pass
+        render_policy.set_opengl(self._opengl)
         self.setRenderHints(self.renderHints())
         self.setAlignment(Qt.AlignCenter)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setTransformationAnchor(QGraphicsView.NoAnchor)
         self.setResizeAnchor(QGraphicsView.NoAnchor)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
 
         scene = BattleScene(self)
         self.setScene(scene)
         self.setSceneRect(0, 0, 900, 500)
 
+        # update mode follows what is animating: see render_policy.update_mode
+        scene.animator.activityChanged.connect(self._apply_update_mode)
+        self._apply_update_mode(False)
+
+        # frame timing is always collected; the overlay (F3) only draws it
+        self.frame_stats = FrameStats()
+        scene.animator.activityChanged.connect(self.frame_stats.set_active)
+        self.frame_stats.set_active(scene.animator.is_active())
+        self._overlay = False
+        self._overlay_row = None
+        self._overlay_timer = QTimer(self)
+        self._overlay_timer.setInterval(250)
+        self._overlay_timer.timeout.connect(self._refresh_overlay)
+
     @property
     def battle_scene(self) -> BattleScene:
         return self.scene()
+
+    def is_opengl(self) -> bool:
+        return self._opengl
+
+    def _apply_update_mode(self, animating: bool):
+        mode = render_policy.update_mode(self._opengl, animating)
+        if self.viewportUpdateMode() != mode:
+            self.setViewportUpdateMode(mode)
+
+    def set_render_profile(self, name: str):
+        render_policy.set_profile(name)
+        self._apply_update_mode(self.battle_scene.animator.is_active())
+        self._apply_cache_policy()
+
+    def _apply_cache_policy(self):
+        for it in self.battle_scene.items():
+            if getattr(it, "_render_cached", False):
+                render_policy.apply_cache(it)
+
+    def use_raster(self):
+        # software fallback when GL init fails
+        self.setViewport(QWidget())
+        self._opengl = False
+        render_policy.set_opengl(False)
+        self._apply_update_mode(self.battle_scene.animator.is_active())
+        self._apply_cache_policy()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._opengl and not self._gl_checked:
+            self._gl_checked = True
+            # the GL widget initializes on its first show; verify afterwards
+            QTimer.singleShot(0, self._check_opengl)
+
+    def _check_opengl(self):
+        vp = self.viewport()
+        if isinstance(vp, QOpenGLWidget) and not vp.isValid():
+            print("[BattleView] OpenGL viewport failed to initialize; falling back to raster")
+            self.use_raster()
+
+    # --- stats overlay ---
+    def paintEvent(self, event):
+        t0 = time.perf_counter()
+        super().paintEvent(event)
+        self.frame_stats.frame(t0, time.perf_counter())
+
+    def set_overlay_visible(self, on: bool):
+        self._overlay = bool(on)
+        if self._overlay:
+            self._refresh_overlay()
+            self._overlay_timer.start()
+        else:
+            self._overlay_timer.stop()
+        self.viewport().update()
+
+    def overlay_visible(self) -> bool:
+        return self._overlay
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_F3:
+            self.set_overlay_visible(not self._overlay)
+            event.accept()
+            return
+        super().keyPressEvent(event)
+
+    def _refresh_overlay(self):
+        # counting items is O(n); do it a few times per second, not per frame
+        sc = self.battle_scene
+        self._overlay_row = self.frame_stats.snapshot(len(sc.items()), sc.animator.active_count())
+        self.viewport().update()
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        row = self._overlay_row
+        if not self._overlay or row is None:
+            return
+        painter.save()
+        painter.resetTransform()  # draw in viewport pixels
+        painter.setOpacity(0.85)
+        painter.fillRect(8, 8, 230, 128, QColor(0, 0, 0, 170))
+        painter.setPen(QColor(120, 255, 140))
+        painter.setFont(QFont("monospace", 9))
+        lines = [
+            f"FPS {row['fps']:6.1f}   paint {row['paint_ms']:.2f}ms",
+            f"p50 {row['p50_ms']:.1f}  p95 {row['p95_ms']:.1f}  p99 {row['p99_ms']:.1f} ms",
+            f"items {row['items']}   anims {row['animations']}",
+            f"ctl {row['controller_ms_per_s']:.2f}ms/s  max {row['controller_max_ms']:.2f}ms",
+        ]
+        for i, line in enumerate(lines):
+            painter.drawText(16, 26 + i * 16, line)
+        # frame-time histogram
+        hist = [row[f"hist_le_{hi:g}"] for hi in BUCKETS]
+        peak = max(1, max(hist))
+        bw = 40
+        for i, c in enumerate(hist):
+            h = int(36 * c / peak)
+            color = QColor(120, 255, 140) if i < 2 else QColor(255, 200, 80) if i < 3 else QColor(255, 90, 90)
+            painter.fillRect(16 + i * (bw + 4), 126 - h, bw, h, color)
+        painter.restore()
@@ -1,144 +1,134 @@
-from PyQt5.QtCore import QPointF, QEasingCurve, QVariantAnimation, Qt
-from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsRectItem
-from PyQt5.QtGui import QPixmap, QColor, QPen
-import os
+from PyQt5.QtCore import QPointF, QEasingCurve, Qt
+from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsRectItem, QGraphicsSimpleTextItem
+from PyQt5.QtGui import QColor, QPen
+from game.core.combatant import Combatant
+from game.core.content import default_project_root
+from game.core.status import describe
+from game.ui.atlas import AtlasFaceMixin, atlas_frame
+from game.ui.pixmap_cache import get_pixmap
+from . import timing
+from .animator import animator_for
+from . import render_policy
 import math
 
 
-class CardItem(QGraphicsPixmapItem):
-    def __init__(self, image_path: str, name: str, max_hp: int = 100, atk: int = 20):
+def _unit_attr(attr: str):
+    # combat state lives on the headless Combatant; the item only renders it
+    def fget(self):
+        return getattr(self.unit, attr)
+
+    def fset(self, value):
+        setattr(self.unit, attr, value)
+
+    return property(fget, fset)
+
+
+class CardItem(AtlasFaceMixin, QGraphicsPixmapItem):
+    name = _unit_attr("name")
+    max_hp = _unit_attr("max_hp")
+    hp = _unit_attr("hp")
+    atk = _unit_attr("atk")
+    shield = _unit_attr("shield")
+    strength = _unit_attr("strength")
+    next_damage_taken_multiplier = _unit_attr("next_damage_taken_multiplier")
+
+    def __init__(self, image_path: str, name: str, max_hp: int = 100, atk: int = 20,
+                 unit: Combatant | None = None, size: int = 200):
         super().__init__()
-        self.name = name
-        self.max_hp = max_hp
-        self.hp = max_hp
-        self.atk = atk
-        self._anims = []  # keep animation references
-        self.shield = 0
-        self.next_damage_taken_multiplier = 1.0  # debuff like Vulnerable (next hit only)
-
-        # Debug: image loading status
-        print(f"[CardItem] Loading image for {name}: {image_path} exists={os.path.exists(image_path)}")
-        pix = QPixmap()
-        if os.path.exists(image_path):
-            pix = QPixmap(image_path)
-        print(f"[CardItem] QPixmap.isNull for {name}: {pix.isNull()}")
-        if pix.isNull():
-            pix = QPixmap(256, 256)
-            pix.fill(QColor("gray"))
-        self.setPixmap(pix.scaled(200, 200))
+        self.unit = unit if unit is not None else Combatant(name, max_hp=max_hp, atk=atk)
+        self._size = size  # square face size; big encounters lay units out smaller
+
+        frame = atlas_frame(default_project_root(), image_path)
+        if frame is not None:
+            # drawn from the shared atlas texture
+            self.set_atlas_face(frame[0], frame[1], size, size)
+        else:
+            # decoded and scaled once per process; gray placeholder if missing
+            self.setPixmap(get_pixmap(image_path, size, size, fallback=QColor("gray")))
         self.setFlag(QGraphicsItem.ItemIsMovable, False)
         self.setTransformOriginPoint(self.boundingRect().center())
+        # cache policy follows the render profile (see render_policy)
+        self._render_cached = True
+        render_policy.apply_cache(self)
         self._opacity = 1.0
+        self._highlight: QGraphicsRectItem | None = None  # drop-target outline, created on first hover
 
         # Bars
-        self._bar_bg = QGraphicsRectItem(0, 0, 200, 8, self)
+        self._bar_bg = QGraphicsRectItem(0, 0, size, 8, self)
         self._bar_bg.setBrush(QColor(60, 60, 60))
         self._bar_bg.setPen(QColor(20, 20, 20))
-        self._bar_hp = QGraphicsRectItem(0, 0, 200, 8, self)
+        self._bar_hp = QGraphicsRectItem(0, 0, size, 8, self)
         self._bar_hp.setBrush(QColor(200, 60, 60))
         self._bar_hp.setPen(QPen(Qt.NoPen))
         self._bar_shield = QGraphicsRectItem(0, 0, 0, 8, self)
         self._bar_shield.setBrush(QColor(80, 140, 240))
         self._bar_shield.setPen(QPen(Qt.NoPen))
+        # active statuses (力量3 易伤 中毒4) under the bars
+        self._status_text = QGraphicsSimpleTextItem("", self)
+        self._status_text.setBrush(QColor(240, 220, 120))
         # position bars under the card
         self._layout_bars()
         self.update_bars()
 
     def take_damage(self, dmg: int):
-        # consume shield first
-        # apply next-hit multiplier if any
-        if self.next_damage_taken_multiplier != 1.0:
-            dmg = int(math.ceil(dmg * self.next_damage_taken_multiplier))
-            self.next_damage_taken_multiplier = 1.0
-        if self.shield > 0:
-            used = min(self.shield, dmg)
-            self.shield -= used
-            dmg -= used
-        if dmg > 0:
-            self.hp = max(0, self.hp - dmg)
+        hp = self.unit.take_damage(dmg)
         self.update_bars()
-        return self.hp
+        return hp
 
     def is_dead(self) -> bool:
-        return self.hp <= 0
+        return self.unit.is_dead()
 
     def add_shield(self, amount: int):
-        self.shield += max(0, int(amount))
+        self.unit.add_shield(amount)
         self.update_bars()
 
     def heal(self, amount: int):
-        if amount <= 0:
-            return self.hp
-        self.hp = min(self.max_hp, self.hp + int(amount))
+        hp = self.unit.heal(amount)
         self.update_bars()
-        return self.hp
+        return hp
+
+    def set_highlight(self, on: bool):
+        # outline shown while a skill card is dragged over this unit
+        if self._highlight is None:
+            if not on:
+                return
+            self._highlight = QGraphicsRectItem(self.boundingRect().adjusted(-3, -3, 3, 3), self)
+            self._highlight.setPen(QPen(QColor(255, 215, 80), 4))
+            self._highlight.setBrush(Qt.NoBrush)
+        self._highlight.setVisible(on)
 
     def play_hit_fx(self):
-        # simple flash scale with QVariantAnimation
-        anim = QVariantAnimation()
-        anim.setDuration(120)
-        anim.setStartValue(1.0)
-        anim.setEndValue(0.9)
-        anim.setEasingCurve(QEasingCurve.InOutQuad)
+        if timing.is_instant():
+            return
 
+        # simple flash scale on the scene clock
         def on_value(v):
-            try:
-                self.setScale(float(v))
-            except Exception:
-                pass
+            self.setScale(float(v))
 
         def on_finish():
             self.setScale(1.0)
-            if anim in self._anims:
-                self._anims.remove(anim)
+            render_policy.end_scaling(self)
 
-        anim.valueChanged.connect(on_value)
-        anim.finished.connect(on_finish)
-        self._anims.append(anim)
-        anim.start()
+        render_policy.begin_scaling(self)
+        animator_for(self).tween(120, 1.0, 0.9, on_value, on_finish, QEasingCurve.InOutQuad, owner=self)
 
     def charge_attack(self, target_pos: QPointF, on_hit):
-        # move to mid then back using QVariantAnimation
+        if timing.is_instant():
+            # no travel; resolve the hit right away
+            if callable(on_hit):
+                on_hit()
+            return
+        # move to mid then back
         start = self.pos()
         mid = QPointF((start.x() + target_pos.x()) / 2, (start.y() + target_pos.y()) / 2)
-
-        go = QVariantAnimation()
-        go.setDuration(260)
-        go.setStartValue(start)
-        go.setEndValue(mid)
-        go.setEasingCurve(QEasingCurve.OutCubic)
-
-        back = QVariantAnimation()
-        back.setDuration(260)
-        back.setStartValue(mid)
-        back.setEndValue(start)
-        back.setEasingCurve(QEasingCurve.InCubic)
-
-        def go_value(v):
-            self.setPos(v)
-
-        def back_value(v):
-            self.setPos(v)
-
-        def back_finish():
-            if back in self._anims:
-                self._anims.remove(back)
+        animator = animator_for(self)
 
         def go_finish():
             if callable(on_hit):
                 on_hit()
-            back.start()
-            # remove go from refs when finished and back started
-            if go in self._anims:
-                self._anims.remove(go)
+            animator.tween(260, mid, start, self.setPos, None, QEasingCurve.InCubic, owner=self)
 
-        go.valueChanged.connect(go_value)
-        back.valueChanged.connect(back_value)
-        back.finished.connect(back_finish)
-        go.finished.connect(go_finish)
-
-        self._anims.extend([go, back])
-        go.start()
+        animator.tween(260, start, mid, self.setPos, go_finish, QEasingCurve.OutCubic, owner=self)
 
     def _layout_bars(self):
         # bars placed slightly below the card image
@@ -147,23 +137,24 @@ class CardItem(QGraphicsPixmapItem):
         y = img_rect.height() + 4
         for r in (self._bar_bg, self._bar_hp, self._bar_shield):
             r.setPos(x, y)
+        self._status_text.setPos(x, y + 10)
 
     def update_bars(self):
-        # width based on 200px image width
-        total_w = 200
+        # width based on the face width
+        total_w = self._size
         hp_ratio = 0 if self.max_hp <= 0 else max(0.0, min(1.0, self.hp / self.max_hp))
         self._bar_hp.setRect(0, 0, total_w * hp_ratio, 8)
         # shield width clamp; visualize as addition on top of hp bar length
         shield_ratio = 0 if self.max_hp <= 0 else max(0.0, min(1.0, self.shield / self.max_hp))
         self._bar_shield.setRect(0, 0, total_w * shield_ratio, 8)
+        text = describe(self.unit)
+        if text != self._status_text.text():
+            self._status_text.setText(text)
 
     def heartbeat(self, times: int = 3, duration_ms: int = 1000):
+        if timing.is_instant():
+            return
         # scale up/down in a sine wave pattern: 1 + 0.12*sin(2*pi*f*t), f = times over duration
-        anim = QVariantAnimation()
-        anim.setDuration(max(200, duration_ms))
-        anim.setStartValue(0.0)
-        anim.setEndValue(1.0)
-
         base_scale = 1.0
         amplitude = 0.12
 
@@ -173,20 +164,15 @@ class CardItem(QGraphicsPixmapItem):
 
         def on_finish():
             self.setScale(1.0)
-            if anim in self._anims:
-                self._anims.remove(anim)
+            render_policy.end_scaling(self)
 
-        anim.valueChanged.connect(on_val)
-        anim.finished.connect(on_finish)
-        self._anims.append(anim)
-        anim.start()
+        render_policy.begin_scaling(self)
+        animator_for(self).tween(max(200, duration_ms), 0.0, 1.0, on_val, on_finish, owner=self)
 
     def wobble(self, duration_ms: int = 800):
+        if timing.is_instant():
+            return
         # horizontal shake around current position
-        anim = QVariantAnimation()
-        anim.setDuration(max(200, duration_ms))
-        anim.setStartValue(0.0)
-        anim.setEndValue(1.0)
         origin = QPointF(self.pos())
         amplitude = 10.0
         freq = 8  # shakes
@@ -195,12 +181,4 @@ class CardItem(QGraphicsPixmapItem):
             dx = amplitude * math.sin(2 * math.pi * freq * v)
             self.setPos(QPointF(origin.x() + dx, origin.y()))
 
-        def on_finish():
-            self.setPos(origin)
-            if anim in self._anims:
-                self._anims.remove(anim)
-
-        anim.valueChanged.connect(on_val)
-        anim.finished.connect(on_finish)
-        self._anims.append(anim)
-        anim.start()
+        animator_for(self).tween(max(200, duration_ms), 0.0, 1.0, on_val, lambda: self.setPos(origin), owner=self)
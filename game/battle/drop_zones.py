@@ -0,0 +1,69 @@
+from PyQt5.QtCore import QRectF
+
+
+def _box(rect: QRectF) -> tuple:
+    return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+
+class DropZoneIndex:
+    # uniform-grid index of unit hit rects for drag & drop targeting.
+    # zones change only when units are laid out (or removed), so drag queries touch the few
+    # grid cells under the card instead of every unit in the scene.
+    def __init__(self, cell: float = 64.0):
+        self.cell = float(cell)
+        self._zones: dict = {}  # key -> (x1, y1, x2, y2)
+        self._cells: dict = {}  # (cx, cy) -> set of keys
+
+    def _span(self, box: tuple):
+        c = self.cell
+        x1, y1, x2, y2 = box
+        for cx in range(int(x1 // c), int(x2 // c) + 1):
+            for cy in range(int(y1 // c), int(y2 // c) + 1):
+                yield cx, cy
+
+    def set_zone(self, key, rect: QRectF):
+        # add or move one zone; only its own cells are touched
+        self.remove(key)
+        box = _box(rect)
+        self._zones[key] = box
+        for cell in self._span(box):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        box = self._zones.pop(key, None)
+        if box is None:
+            return
+        for cell in self._span(box):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._zones.clear()
+        self._cells.clear()
+
+    def __len__(self):
+        return len(self._zones)
+
+    def query(self, rect: QRectF, accept=None):
+        # key of the zone overlapping `rect` the most (optionally filtered by accept(key)), or None
+        box = _box(rect)
+        seen = set()
+        best, best_area = None, 0.0
+        x1, y1, x2, y2 = box
+        for cell in self._span(box):
+            for key in self._cells.get(cell, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                zx1, zy1, zx2, zy2 = self._zones[key]
+                w = min(x2, zx2) - max(x1, zx1)
+                h = min(y2, zy2) - max(y1, zy1)
+                if w <= 0 or h <= 0:
+                    continue
+                area = w * h
+                if area > best_area and (accept is None or accept(key)):
+                    best, best_area = key, area
+        return best
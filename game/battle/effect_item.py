@@ -0,0 +1,189 @@
+import math
+import random
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPen, QPolygonF
+from PyQt5.QtWidgets import QGraphicsItem
+from . import timing
+from .animator import animator_for
+
+# hit feedback colors by kind
+COLORS = {
+    "damage": QColor(255, 236, 200),
+    "heal": QColor(120, 235, 130),
+    "shield": QColor(120, 170, 255),
+    "status": QColor(200, 120, 240),
+}
+MAX_NUMBERS = 24  # floating numbers alive at once; the oldest is recycled when full
+MAX_PARTICLES = 192  # particle pool size
+SPAWN_PER_FRAME = 64  # new particles accepted per frame; extra bursts are thinned out
+_ALPHA_STEPS = 4  # particles are batched per (color, fade step)
+
+
+class _Number:
+    __slots__ = ("x", "y", "text", "color", "age", "life", "active")
+
+    def __init__(self):
+        self.x = self.y = 0.0
+        self.text = ""
+        self.color = COLORS["damage"]
+        self.age = 0.0
+        self.life = 1.0
+        self.active = False
+
+
+class EffectItem(QGraphicsItem):
+    # every floating number and particle of the battle, drawn by this one item in a single paint().
+    # state lives in fixed pools; one tween on the scene animator advances them, so effects follow
+    # battle speed and pause like every other animation.
+    def __init__(self, rect: QRectF, seed: int | None = None):
+        super().__init__()
+        self._rect = QRectF(rect)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setCacheMode(QGraphicsItem.NoCache)  # redrawn every frame while active
+        self._rng = random.Random(seed)
+        self._font = QFont()
+        self._font.setBold(True)
+        self._font.setPointSize(16)
+        self._numbers = [_Number() for _ in range(MAX_NUMBERS)]
+        self._next_number = 0
+        # particles as parallel lists; _free holds unused pool slots
+        n = MAX_PARTICLES
+        self._px = [0.0] * n
+        self._py = [0.0] * n
+        self._vx = [0.0] * n
+        self._vy = [0.0] * n
+        self._age = [0.0] * n
+        self._life = [1.0] * n
+        self._kind = ["damage"] * n
+        self._live: list[int] = []
+        self._free = list(range(n - 1, -1, -1))
+        self._spawn_budget = SPAWN_PER_FRAME
+        self._clock = None  # running tween
+        self._last = 0.0
+        self._dirty = QRectF()
+
+    # --- api ---
+    def number(self, pos: QPointF, value, kind: str = "damage", delay_ms: int = 0):
+        if timing.is_instant():
+            return
+        if delay_ms > 0:
+            animator_for(self).call_later(delay_ms, lambda: self.number(pos, value, kind))
+            return
+        slot = self._numbers[self._next_number]
+        self._next_number = (self._next_number + 1) % MAX_NUMBERS
+        slot.x = pos.x() + self._rng.uniform(-10, 10)
+        slot.y = pos.y()
+        slot.text = str(value)
+        slot.color = COLORS.get(kind, COLORS["damage"])
+        slot.age = 0.0
+        slot.life = 900.0
+        slot.active = True
+        self._start()
+
+    def burst(self, pos: QPointF, count: int = 10, kind: str = "damage", delay_ms: int = 0):
+        if timing.is_instant():
+            return
+        if delay_ms > 0:
+            animator_for(self).call_later(delay_ms, lambda: self.burst(pos, count, kind))
+            return
+        count = min(count, self._spawn_budget, len(self._free))
+        if count <= 0:
+            return
+        self._spawn_budget -= count
+        kind = kind if kind in COLORS else "damage"
+        rng = self._rng
+        for _ in range(count):
+            i = self._free.pop()
+            ang = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(0.08, 0.25)  # px per ms
+            self._px[i] = pos.x()
+            self._py[i] = pos.y()
+            self._vx[i] = math.cos(ang) * speed
+            self._vy[i] = math.sin(ang) * speed - 0.08
+            self._age[i] = 0.0
+            self._life[i] = rng.uniform(280, 520)
+            self._kind[i] = kind
+            self._live.append(i)
+        self._start()
+
+    def clear(self):
+        for n in self._numbers:
+            n.active = False
+        self._free.extend(self._live)
+        self._live.clear()
+        self.update(self._dirty)
+
+    def live_count(self) -> tuple:
+        return sum(1 for n in self._numbers if n.active), len(self._live)
+
+    # --- clock ---
+    def _start(self):
+        if self._clock is not None and not self._clock.done:
+            return
+        self._last = 0.0
+        self._clock = animator_for(self).tween(1000, 0.0, 1000.0, self._advance, self._clock_done, owner=self)
+
+    def _clock_done(self):
+        self._clock = None
+        if self._live or any(n.active for n in self._numbers):
+            self._start()
+
+    def _advance(self, t: float):
+        dt, self._last = t - self._last, t
+        self._spawn_budget = SPAWN_PER_FRAME
+        x1 = y1 = math.inf
+        x2 = y2 = -math.inf
+        for n in self._numbers:
+            if not n.active:
+                continue
+            n.age += dt
+            if n.age >= n.life:
+                n.active = False
+                continue
+            n.y -= 0.05 * dt
+            x1, y1, x2, y2 = min(x1, n.x - 20), min(y1, n.y - 30), max(x2, n.x + 80), max(y2, n.y + 10)
+        px, py, vx, vy, age, life = self._px, self._py, self._vx, self._vy, self._age, self._life
+        keep = []
+        for i in self._live:
+            age[i] += dt
+            if age[i] >= life[i]:
+                self._free.append(i)
+                continue
+            vy[i] += 0.0006 * dt  # gravity
+            px[i] += vx[i] * dt
+            py[i] += vy[i] * dt
+            keep.append(i)
+            x1, y1, x2, y2 = min(x1, px[i]), min(y1, py[i]), max(x2, px[i]), max(y2, py[i])
+        self._live = keep
+        # repaint the area covered last frame and this one
+        dirty = QRectF(x1 - 4, y1 - 4, x2 - x1 + 8, y2 - y1 + 8) if x1 <= x2 else QRectF()
+        self.update(self._dirty.united(dirty))
+        self._dirty = dirty
+
+    # --- QGraphicsItem ---
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        if self._live:
+            # one drawPoints call per color and fade step
+            groups: dict = {}
+            px, py, age, life, kinds = self._px, self._py, self._age, self._life, self._kind
+            for i in self._live:
+                step = min(_ALPHA_STEPS - 1, int(age[i] / life[i] * _ALPHA_STEPS))
+                groups.setdefault((kinds[i], step), []).append(QPointF(px[i], py[i]))
+            for (kind, step), points in groups.items():
+                c = QColor(COLORS[kind])
+                c.setAlphaF(1.0 - step / _ALPHA_STEPS)
+                painter.setPen(QPen(c, 4, Qt.SolidLine, Qt.RoundCap))
+                painter.drawPoints(QPolygonF(points))
+        painter.setFont(self._font)
+        for n in self._numbers:
+            if not n.active:
+                continue
+            painter.setOpacity(max(0.0, 1.0 - (n.age / n.life) ** 2))
+            painter.setPen(QColor(0, 0, 0))
+            painter.drawText(QPointF(n.x + 2, n.y + 2), n.text)
+            painter.setPen(n.color)
+            painter.drawText(QPointF(n.x, n.y), n.text)
+        painter.setOpacity(1.0)
@@ -0,0 +1,117 @@
+import csv
+import functools
+import time
+from collections import deque
+
+# frame-time histogram buckets (upper bounds, ms)
+BUCKETS = (8.3, 16.7, 33.3, 50.0, float("inf"))
+
+
+def _pct(sorted_vals, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class FrameStats:
+    def __init__(self, window: int = 600, history: int = 14400):
+        self.frames = deque(maxlen=window)  # frame intervals, ms
+        self.paint_ms = deque(maxlen=window)  # time spent inside paintEvent, ms
+        self.samples = deque(maxlen=history)  # periodic snapshots for export
+        self._last_frame = None
+        self.active = False  # frame intervals are only measured while the animator runs
+        # python time in BattleController callbacks
+        self.callback_ms_total = 0.0
+        self._callback_ms_window = 0.0
+        self._callback_max_ms = 0.0
+        self._depth = 0
+        self._window_start = time.perf_counter()
+
+    def set_active(self, on: bool):
+        # the gap until the next animation is idle time, not a frame
+        self.active = bool(on)
+        if not self.active:
+            self._last_frame = None
+
+    def frame(self, started: float, finished: float):
+        self.paint_ms.append((finished - started) * 1000.0)
+        if not self.active:
+            return  # idle repaints (hover, overlay refresh) are not frames
+        if self._last_frame is not None:
+            self.frames.append((finished - self._last_frame) * 1000.0)
+        self._last_frame = finished
+
+    def add_callback(self, seconds: float):
+        ms = seconds * 1000.0
+        self.callback_ms_total += ms
+        self._callback_ms_window += ms
+        self._callback_max_ms = max(self._callback_max_ms, ms)
+
+    def percentiles(self) -> dict:
+        vals = sorted(self.frames)
+        return {"p50": _pct(vals, 0.50), "p95": _pct(vals, 0.95), "p99": _pct(vals, 0.99)}
+
+    def histogram(self) -> list:
+        counts = [0] * len(BUCKETS)
+        for v in self.frames:
+            for i, hi in enumerate(BUCKETS):
+                if v <= hi:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def snapshot(self, items: int, animations: int) -> dict:
+        # one row of overlay numbers; also resets the per-window callback counters
+        now = time.perf_counter()
+        span = max(1e-6, now - self._window_start)
+        vals = list(self.frames)
+        recent = vals[-120:]
+        mean = sum(recent) / len(recent) if recent else 0.0
+        pct = self.percentiles()
+        row = {
+            "t": round(time.time(), 3),
+            "fps": round(1000.0 / mean, 1) if mean > 0 else 0.0,
+            "p50_ms": round(pct["p50"], 2),
+            "p95_ms": round(pct["p95"], 2),
+            "p99_ms": round(pct["p99"], 2),
+            "paint_ms": round(sum(self.paint_ms) / len(self.paint_ms), 2) if self.paint_ms else 0.0,
+            "items": int(items),
+            "animations": int(animations),
+            "controller_ms_per_s": round(self._callback_ms_window / span, 2),
+            "controller_max_ms": round(self._callback_max_ms, 2),
+        }
+        for hi, c in zip(BUCKETS, self.histogram()):
+            row[f"hist_le_{hi:g}"] = c
+        self.samples.append(row)
+        self._callback_ms_window = 0.0
+        self._callback_max_ms = 0.0
+        self._window_start = now
+        return row
+
+    def export_csv(self, path: str) -> int:
+        rows = list(self.samples)
+        if not rows:
+            return 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            w.writeheader()
+            w.writerows(rows)
+        return len(rows)
+
+
+def profiled(fn):
+    # time a BattleController callback into self.frame_stats; nested calls count once
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        stats = getattr(self, "frame_stats", None)
+        if stats is None:
+            return fn(self, *args, **kwargs)
+        stats._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            stats._depth -= 1
+            if stats._depth == 0:
+                stats.add_callback(time.perf_counter() - t0)
+    return wrapper
@@ -0,0 +1,61 @@
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsItem
+
+# rendering-quality/performance setting for the battle view
+PROFILES = [("画质", "quality"), ("均衡", "balanced"), ("性能", "performance")]
+
+_profile = "balanced"
+_opengl = False  # battle view renders through QOpenGLWidget
+
+
+def set_profile(name: str):
+    global _profile
+    if name in {p for _, p in PROFILES}:
+        _profile = name
+
+
+def profile() -> str:
+    return _profile
+
+
+def set_opengl(on: bool):
+    global _opengl
+    _opengl = bool(on)
+
+
+def update_mode(opengl: bool, animating: bool):
+    # QOpenGLWidget always recomposes the whole viewport, so partial modes only cost
+    # bookkeeping there; on the raster path repaint just what changed.
+    if opengl:
+        return QGraphicsView.FullViewportUpdate
+    if _profile == "quality":
+        return QGraphicsView.FullViewportUpdate if animating else QGraphicsView.SmartViewportUpdate
+    if _profile == "performance":
+        return QGraphicsView.BoundingRectViewportUpdate if animating else QGraphicsView.MinimalViewportUpdate
+    return QGraphicsView.SmartViewportUpdate if animating else QGraphicsView.MinimalViewportUpdate
+
+
+def cache_mode(scaling: bool = False, atlas: bool = False):
+    # DeviceCoordinateCache is re-rendered on every scale change; translation stays cheap.
+    # on GL an atlas face is one quad from the shared texture; a cache pixmap per item would
+    # be uploaded as a texture of its own, so atlas-faced items are never cached there
+    if _profile == "quality" or scaling or (atlas and _opengl):
+        return QGraphicsItem.NoCache
+    return QGraphicsItem.DeviceCoordinateCache
+
+
+def apply_cache(item: QGraphicsItem):
+    item.setCacheMode(cache_mode(scaling=getattr(item, "_scaling_anims", 0) > 0,
+                                 atlas=getattr(item, "_atlas_face", None) is not None))
+
+
+def begin_scaling(item: QGraphicsItem):
+    # called when a scale tween starts on the item; nests with overlapping tweens
+    item._scaling_anims = getattr(item, "_scaling_anims", 0) + 1
+    if item._scaling_anims == 1:
+        apply_cache(item)
+
+
+def end_scaling(item: QGraphicsItem):
+    item._scaling_anims = max(0, getattr(item, "_scaling_anims", 0) - 1)
+    if item._scaling_anims == 0:
+        apply_cache(item)
@@ -1,61 +1,110 @@
-from PyQt5.QtCore import Qt, QPointF, QVariantAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QPointF, QEasingCurve
 from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QGraphicsSimpleTextItem
 from PyQt5.QtGui import QPixmap, QColor
+from game.core.content import default_project_root
+from game.ui.atlas import AtlasFaceMixin, atlas_frame
+from game.ui.pixmap_cache import get_pixmap
+from . import timing
+from .animator import animator_for
+from . import render_policy
 
 
-class SkillCardItem(QGraphicsPixmapItem):
-    def __init__(self, width: int, height: int, label: str, origin_pos: QPointF,
-                 apply_fn, is_valid_target_fn, image_path: str = ""):
+class SkillCardItem(AtlasFaceMixin, QGraphicsPixmapItem):
+    def __init__(self, width: int, height: int, label: str = "", origin_pos: QPointF = QPointF(),
+                 apply_fn=None, is_valid_target_fn=None, image_path: str = "", hover_fn=None):
         super().__init__()
         self._w = width
         self._h = height
         self.origin_pos = QPointF(origin_pos)
         self.apply_fn = apply_fn
         self.is_valid_target_fn = is_valid_target_fn
+        self.hover_fn = hover_fn  # called on every drag move (hover highlight); None when released
         self.dragging = False
-        self._anims = []
-        # load image or use colored placeholder
-        pix = QPixmap()
-        if image_path:
-            pix = QPixmap(image_path)
-        if pix.isNull():
-            pix = QPixmap(width, height)
-            pix.fill(QColor(60, 120, 200))
-        self.setPixmap(pix.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self._image_path = None
+        # per-binding data read by the controller's shared handlers
+        self.slot = -1
+        self.required_target = 'enemy'
+        self.drop_target = None  # team index under the card, set by is_valid_target_fn
         self.setFlag(QGraphicsItem.ItemIsMovable, False)
         self.setAcceptedMouseButtons(Qt.LeftButton)
-        self.setTransformOriginPoint(self.boundingRect().center())
         self.setZValue(50)
+        self._render_cached = True
+        render_policy.apply_cache(self)
 
         # label (below image)
-        self.text_item = QGraphicsSimpleTextItem(label, self)
+        self.text_item = QGraphicsSimpleTextItem("", self)
         self.text_item.setBrush(QColor("white"))
+
+        self._set_image(image_path)
+        self._set_label(label)
+        self.setPos(self.origin_pos)
+
+    def _face(self, image_path: str) -> QPixmap:
+        # shared app-wide cache; colored placeholder if the image is missing
+        return get_pixmap(image_path, self._w, self._h, Qt.KeepAspectRatio, Qt.SmoothTransformation,
+                          fallback=QColor(60, 120, 200))
+
+    def _set_image(self, image_path: str):
+        if image_path == self._image_path:
+            return
+        self._image_path = image_path
+        frame = atlas_frame(default_project_root(), image_path)
+        if frame is not None:
+            self.set_atlas_face(frame[0], frame[1], self._w, self._h, keep_aspect=True, smooth=True)
+        else:
+            self.clear_atlas_face()
+            self.setPixmap(self._face(image_path))
+        self.setTransformOriginPoint(self.boundingRect().center())
+        if self._render_cached:
+            render_policy.apply_cache(self)  # atlas faces are not cached on GL
+
+    def _set_label(self, label: str):
+        if label == self.text_item.text():
+            return
+        self.text_item.setText(label)
         br = self.text_item.boundingRect()
-        self.text_item.setPos((width - br.width())/2, height + 6)
+        self.text_item.setPos((self._w - br.width())/2, self._h + 6)
 
+    def bind(self, slot: int, label: str, image_path: str, origin_pos: QPointF, required_target: str = 'enemy'):
+        # reuse this item for a new hand card; no new pixmap or child items
+        self._stop_anims()
+        self.slot = slot
+        self.required_target = required_target
+        self.drop_target = None
+        self._set_image(image_path)
+        self._set_label(label)
+        self.origin_pos = QPointF(origin_pos)
+        self.dragging = False
+        self.setScale(1.0)
+        self.setZValue(50)
+        self.setOpacity(1.0)
         self.setPos(self.origin_pos)
+        self.setVisible(True)
+
+    def release(self):
+        # back to the pool: hidden until the next bind
+        self._stop_anims()
+        self.dragging = False
+        self.slot = -1
+        self.drop_target = None
+        self.setVisible(False)
+
+    def _stop_anims(self):
+        animator_for(self).cancel(self)
 
     def appear(self, duration_ms: int = 250):
+        if timing.is_instant():
+            self.setOpacity(1.0)
+            return
         try:
             self.setOpacity(0.0)
         except Exception:
             return
-        anim = QVariantAnimation()
-        anim.setDuration(max(60, duration_ms))
-        anim.setStartValue(0.0)
-        anim.setEndValue(1.0)
-        anim.setEasingCurve(QEasingCurve.OutCubic)
 
         def on_val(v):
-            try:
-                self.setOpacity(float(v))
-            except Exception:
-                pass
+            self.setOpacity(float(v))
 
-        anim.valueChanged.connect(on_val)
-        # keep a ref on self to avoid GC
-        self._appear_anim = anim
-        anim.start()
+        animator_for(self).tween(max(60, duration_ms), 0.0, 1.0, on_val, None, QEasingCurve.OutCubic, owner=self)
 
     def mousePressEvent(self, event):
         self.dragging = True
@@ -69,11 +118,15 @@ class SkillCardItem(QGraphicsPixmapItem):
             scene_pos = self.mapToScene(event.pos())
             new_pos = scene_pos - self._press_offset
             self.setPos(new_pos)
+            if callable(self.hover_fn):
+                self.hover_fn(self)
         event.accept()
 
     def mouseReleaseEvent(self, event):
         self.dragging = False
         self.setZValue(50)
+        if callable(self.hover_fn):
+            self.hover_fn(None)
         # check valid target
         success = False
         if callable(self.is_valid_target_fn) and callable(self.apply_fn):
@@ -84,26 +137,16 @@ class SkillCardItem(QGraphicsPixmapItem):
                 except Exception:
                     success = False
         if success:
-            # remove/hide on use
-            self.scene().removeItem(self)
+            # hide on use; the item stays in the scene for the next turn
+            self.release()
         else:
             self.animate_back()
         event.accept()
 
     def animate_back(self):
-        pos_anim = QVariantAnimation()
-        pos_anim.setDuration(200)
-        pos_anim.setStartValue(self.pos())
-        pos_anim.setEndValue(self.origin_pos)
-        pos_anim.setEasingCurve(QEasingCurve.OutCubic)
-
-        def on_val(v):
-            self.setPos(v)
-        def on_finish():
+        if timing.is_instant():
+            self.setPos(self.origin_pos)
             self.setScale(1.0)
-            if pos_anim in self._anims:
-                self._anims.remove(pos_anim)
-        pos_anim.valueChanged.connect(on_val)
-        pos_anim.finished.connect(on_finish)
-        self._anims.append(pos_anim)
-        pos_anim.start()
+            return
+        animator_for(self).tween(200, QPointF(self.pos()), QPointF(self.origin_pos), self.setPos,
+                                 lambda: self.setScale(1.0), QEasingCurve.OutCubic, owner=self)
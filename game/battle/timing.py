@@ -0,0 +1,19 @@
+# global battle speed; the scene Animator advances its clock by it
+SPEEDS = [("1x", 1.0), ("2x", 2.0), ("4x", 4.0), ("即时", 0.0)]  # 0.0 = instant
+
+_speed = 1.0
+
+
+def set_speed(speed: float):
+    global _speed
+    _speed = max(0.0, float(speed))
+
+
+def speed() -> float:
+    return _speed
+
+
+def is_instant() -> bool:
+    # instant: effects resolve synchronously and only the final state is drawn
+    return _speed <= 0.0
+
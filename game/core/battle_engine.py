@@ -0,0 +1,426 @@
+import copy
+import heapq
+import random
+from .combatant import Combatant
+from .formula import compile_logic
+from .effects import CompiledCard
+from .status import ROUND_START, ROUND_END
+
+
+# apply kinds that the renderer plays as a charge towards the target
+CHARGE_KINDS = ("damage", "lifesteal")
+# marker in BattleEngine.plays between player turns
+END_TURN = -1
+# enemy plan tokens, one per acting enemy: "a<i>" attack player unit i, "h<i>" heavy blow
+# (double damage, then the unit rests a turn), "g" guard, "r" rally
+GUARD_SHIELD = 1.0  # shield gained per point of atk
+RALLY_STRENGTH = 3
+HEAVY_MULTIPLIER = 2
+
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(1 << 32)
+
+
+def first_affordable(engine: "BattleEngine"):
+    # default headless policy: play hand cards left to right while energy allows
+    for i, card in enumerate(engine.hand):
+        if card is not None and int(card.get("cost", 0)) <= engine.energy:
+            return i
+    return None
+
+
+def _team(units) -> list:
+    return list(units) if isinstance(units, (list, tuple)) else [units]
+
+
+class BattleEngine:
+    HAND_SIZE = 5
+
+    def __init__(self, player, enemy, cards=None, logic=None, deck=None,
+                 energy_max: int = 5, seed: int | None = None, compiled: dict | None = None):
+        # a side is one Combatant or a list of them; index 0 is the front
+        self.player_team: list[Combatant] = _team(player)
+        self.enemy_team: list[Combatant] = _team(enemy)
+        self.energy_max = energy_max
+        self.energy = energy_max
+        # every random draw in a battle comes from this stream, so seed + plays reproduce it
+        self.seed = new_seed() if seed is None else int(seed)
+        self.rng = random.Random(self.seed)
+        self.plays: list = []  # (hand index, target index) per play, END_TURN between turns
+        self.enemy_plans: list[list[str]] = []  # plan tokens per enemy turn (empty = plain attacks)
+        self.cards: list[dict] = []
+        self.logic: dict = compile_logic({"effects": {}})
+        self.deck: list[str] = []
+        self._cards_src = None  # list passed to set_content, kept to detect unchanged content
+        self._compiled: dict = {}  # card id -> CompiledCard
+        self._pool = None
+        self.set_content(cards, logic, deck, compiled)
+        self.turn = 0  # even: player, odd: enemy
+        self.hand: list[dict | None] = []
+        self.result = None  # 'win' or 'lose'
+        # status schedule: heap of (round, phase, order, serial, side, index, name); order 0 runs
+        # a trigger, 1 expires. only entries due this round/phase are touched
+        self._status_queue: list = []
+        self._status_serial = 0
+        self.status_events: list = []  # round-start status events of the last start_player_turn
+        # stats
+        self.rounds = 0
+        self.damage_dealt = 0
+        self.damage_taken = 0
+
+    def set_content(self, cards=None, logic=None, deck=None, compiled: dict | None = None):
+        # called every turn with the registry's shared objects: unchanged content is a no-op.
+        # compiled: card id -> CompiledCard built from these cards and logic (ContentRegistry)
+        changed = False
+        if cards is not None and cards is not self._cards_src:
+            self._cards_src = cards
+            self.cards = list(cards)
+            changed = True
+        if logic is not None:
+            logic = compile_logic(logic)
+            if logic is not self.logic:
+                self.logic = logic
+                changed = True
+        if deck is not None and list(deck) != self.deck:
+            self.deck = list(deck)
+            self._pool = None
+        if compiled is not None:
+            self._compiled = compiled
+        elif changed:
+            # every card compiled once: a play walks its bound actions, nothing is looked up
+            self._compiled = {c.get("id"): CompiledCard(c, self.logic) for c in self.cards}
+        if changed or self._pool is None:
+            # build pool from deck (fallback to all defs)
+            defs_by_id = {c.get("id"): c for c in self.cards if c.get("id")}
+            self._pool = [defs_by_id[i] for i in self.deck if i in defs_by_id] or list(self.cards)
+
+    # --- turn loop ---
+    def start(self, seed: int | None = None):
+        if seed is not None:
+            self.seed = int(seed)
+        self.rng.seed(self.seed)
+        self.plays = []
+        self.enemy_plans = []
+        self.turn = 0
+        self.rounds = 0
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.result = None
+        self.hand = []
+        self._status_queue = []
+        self.status_events = []
+
+    def is_over(self) -> bool:
+        return self.result is not None
+
+    # --- teams ---
+    @property
+    def player(self) -> Combatant:
+        # the leader: first living unit of the player team; it casts the hand cards
+        return self.front('self') or self.player_team[0]
+
+    @property
+    def enemy(self) -> Combatant:
+        return self.front('enemy') or self.enemy_team[0]
+
+    def team(self, side: str) -> list:
+        return self.enemy_team if side == 'enemy' else self.player_team
+
+    def front_index(self, side: str) -> int | None:
+        for i, u in enumerate(self.team(side)):
+            if not u.is_dead():
+                return i
+        return None
+
+    def front(self, side: str) -> Combatant | None:
+        i = self.front_index(side)
+        return None if i is None else self.team(side)[i]
+
+    def is_valid_target(self, side: str, index: int) -> bool:
+        team = self.team(side)
+        return 0 <= index < len(team) and not team[index].is_dead()
+
+    def turn_order(self) -> list:
+        # everyone but the leader acts after the player's turn: faster first, allies before enemies on ties
+        leader = self.player
+        units = [u for u in self.player_team if u is not leader] + self.enemy_team
+        return sorted((u for u in units if not u.is_dead()), key=lambda u: -u.spd)
+
+    def _check_result(self):
+        if all(u.is_dead() for u in self.player_team):
+            self.result = 'lose'
+        elif all(u.is_dead() for u in self.enemy_team):
+            self.result = 'win'
+        return self.result
+
+    def start_player_turn(self) -> list:
+        if self._check_result():
+            return []
+        self.turn = 0
+        self.rounds += 1
+        self.status_events = self._tick_statuses(ROUND_START)
+        if self._check_result():
+            self.hand = []
+            return []
+        # refill energy at start of player's turn
+        self.energy = self.energy_max
+        self.draw_hand()
+        return self.hand
+
+    def draw_hand(self):
+        pool = self._pool
+        chosen = []
+        if len(pool) > 0:
+            chosen = self.rng.sample(pool, min(self.HAND_SIZE, len(pool)))
+        self.hand = list(chosen)
+
+    def end_player_turn(self):
+        if not self.is_over():
+            self.plays.append(END_TURN)
+        self.hand = []
+        self.turn = 1
+
+    def compiled(self, card: dict) -> CompiledCard:
+        cc = self._compiled.get(card.get("id"))
+        if cc is None or cc.card is not card:
+            # a dict that is not part of the loaded content
+            cc = CompiledCard(card, self.logic)
+        return cc
+
+    def required_target(self, card: dict) -> str:
+        return self.compiled(card).required_target
+
+    def play_card(self, index: int, target: int | None = None):
+        # target indexes the team on the card's required side (front unit if None).
+        # returns the resolved effect events, or None if the card cannot be played
+        if self.is_over() or index < 0 or index >= len(self.hand):
+            return None
+        card = self.hand[index]
+        if card is None:
+            return None
+        cc = self.compiled(card)
+        side = cc.required_target
+        if target is None:
+            target = self.front_index(side)
+        if target is None or not self.is_valid_target(side, target):
+            return None
+        if not self.spend_energy(cc.cost):
+            return None
+        self.hand[index] = None
+        self.plays.append((index, target))
+        label = card.get("label", "")
+        events = []
+        for act in cc.actions:
+            eside = act.side
+            tgt = self.team(side)[target] if eside == side else self.front(eside)
+            if tgt is None or (tgt.is_dead() and self.front(eside) is not None):
+                # chosen unit already fell to an earlier effect of this card
+                tgt = self.front(eside) or self.team(eside)[0]
+            events.append(self._execute_effect(act, label, tgt))
+        self._check_result()
+        return events
+
+    def enemy_order(self) -> list:
+        # enemies in the order they act this auto phase; a plan lists one token per entry
+        ids = {id(u) for u in self.enemy_team}
+        return [u for u in self.turn_order() if id(u) in ids]
+
+    def enemy_actions(self) -> list:
+        # tokens any enemy may use right now
+        alive = [i for i, u in enumerate(self.player_team) if not u.is_dead()]
+        return [f"a{i}" for i in alive] + [f"h{i}" for i in alive] + ["g", "r"]
+
+    def enemy_turn(self, plan: list | None = None) -> list:
+        # auto phase: every unit in turn_order() acts once. allies attack the enemy front;
+        # enemies follow `plan` (see enemy_order) and attack the player front by default
+        self.turn = 1
+        if self._check_result():
+            return []
+        order = self.turn_order()
+        enemy_ids = {id(u) for u in self.enemy_team}
+        plan = list(plan or [])
+        self.enemy_plans.append(plan)
+        tokens = dict(zip((id(u) for u in order if id(u) in enemy_ids), plan))
+        events = []
+        for actor in order:
+            if actor.is_dead():
+                continue
+            ally = id(actor) not in enemy_ids
+            token = "a" if ally else tokens.get(id(actor), "a")
+            if actor.exhausted:
+                actor.exhausted = False
+                events.append({"apply": "rest", "source": actor, "target": actor, "value": 0, "hits": 0,
+                               "log": f"{actor.name} 正在喘息"})
+                continue
+            if token == "g":
+                value = max(0, int(actor.atk * GUARD_SHIELD))
+                actor.add_shield(value)
+                events.append({"apply": "shield", "source": actor, "target": actor, "value": value, "hits": 0,
+                               "log": f"{actor.name} 进入防御，获得 {value} 点护盾"})
+                continue
+            if token == "r":
+                self.apply_status(actor, "strength", RALLY_STRENGTH)
+                events.append({"apply": "add_strength", "source": actor, "target": actor,
+                               "value": RALLY_STRENGTH, "hits": 0,
+                               "log": f"{actor.name} 怒吼，力量提升 {RALLY_STRENGTH}"})
+                continue
+            defender = None
+            if not ally and token[1:].isdigit():
+                i = int(token[1:])
+                if self.is_valid_target('self', i):
+                    defender = self.player_team[i]
+            if defender is None:
+                defender = self.front('enemy' if ally else 'self')
+            if defender is None:
+                break
+            dmg = actor.atk + actor.strength
+            if token[:1] == "h":
+                dmg *= HEAVY_MULTIPLIER
+                actor.exhausted = True
+            prev_hp, prev_shield = defender.hp, defender.shield
+            defender.take_damage(dmg)
+            dealt = max(0, int((prev_hp + prev_shield) - (defender.hp + defender.shield)))
+            if ally:
+                self.damage_dealt += dealt
+            else:
+                self.damage_taken += dealt
+            events.append({
+                "apply": "attack",
+                "source": actor,
+                "target": defender,
+                "value": dealt,
+                "hits": 1,
+                "log": f"{actor.name} 攻击了 {defender.name}，造成了 {dealt} 点伤害",
+            })
+            if self._check_result():
+                break
+        if not self.is_over():
+            events += self._tick_statuses(ROUND_END)
+            self._check_result()
+        return events
+
+    # --- statuses ---
+    def apply_status(self, unit: Combatant, name: str, stacks: int = 1, value: float | None = None,
+                     duration: int | None = None):
+        # duration in rounds, counting the current one; None lasts until used up
+        new = name not in unit.statuses
+        expires = None if duration is None else self.rounds + max(1, int(duration)) - 1
+        st = unit.add_status(name, stacks, value, expires)
+        if st is None:
+            return None
+        side = 'enemy' if any(u is unit for u in self.enemy_team) else 'self'
+        index = next(i for i, u in enumerate(self.team(side)) if u is unit)
+        if new:
+            self._status_serial += 1
+            st.serial = self._status_serial
+            if st.sdef.on_round_start is not None:
+                self._schedule(self.rounds + 1, ROUND_START, 0, st, side, index)
+            if st.sdef.on_round_end is not None:
+                self._schedule(self.rounds, ROUND_END, 0, st, side, index)
+        if st.expires is not None and (new or st.expires == expires):
+            self._schedule(st.expires, ROUND_END, 1, st, side, index)
+        return st
+
+    def _schedule(self, rnd: int, phase: int, order: int, st, side: str, index: int):
+        heapq.heappush(self._status_queue, (rnd, phase, order, st.serial, side, index, st.name))
+
+    def _tick_statuses(self, phase: int) -> list:
+        q = self._status_queue
+        events = []
+        while q and (q[0][0], q[0][1]) <= (self.rounds, phase):
+            rnd, ph, order, serial, side, index, name = heapq.heappop(q)
+            unit = self.team(side)[index]
+            st = unit.statuses.get(name)
+            if st is None or st.serial != serial or unit.is_dead():
+                continue  # used up, re-applied or its unit fell since it was scheduled
+            if order == 1:
+                if st.expires == rnd:
+                    unit.remove_status(name)
+                    events.append({"apply": "status", "source": unit, "target": unit, "targets": [unit],
+                                   "value": 0, "hits": 0, "log": f"{unit.name} 的{st.sdef.label}消退了"})
+                continue
+            ev = st.sdef.hook(ph)(self, unit, st)
+            if ev is not None:
+                events.append(ev)
+            if unit.statuses.get(name) is st:
+                self._schedule(rnd + 1, ph, 0, st, side, index)
+        return events
+
+    def credit_damage(self, unit: Combatant, dealt: int):
+        # damage not caused by a play or an attack (e.g. poison) still counts in the stats
+        if any(u is unit for u in self.enemy_team):
+            self.damage_dealt += dealt
+        else:
+            self.damage_taken += dealt
+
+    def spend_energy(self, cost: int) -> bool:
+        cost = max(0, int(cost))
+        if self.energy < cost:
+            return False
+        self.energy -= cost
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+        }
+
+    def run(self, policy=None, max_rounds: int = 200, enemy=None) -> dict:
+        # play a whole battle without any rendering; enemy(engine) -> plan, plain attacks if None
+        policy = policy or first_affordable
+        self.start()
+        while not self.is_over() and self.rounds < max_rounds:
+            self.start_player_turn()
+            while not self.is_over():
+                idx = policy(self)
+                if idx is None or self.play_card(idx) is None:
+                    break
+            if self.is_over():
+                break
+            self.end_player_turn()
+            self.enemy_turn(enemy(self) if enemy is not None else None)
+        return {"result": self.result, "stats": self.stats()}
+
+    def clone(self, rng: random.Random | None = None) -> "BattleEngine":
+        # independent copy for look-ahead search: units are copied, content is shared.
+        # the copy draws from `rng` so searching never advances the real battle's stream
+        e = BattleEngine.__new__(BattleEngine)
+        e.__dict__.update(self.__dict__)
+        e.player_team = [copy.copy(u) for u in self.player_team]
+        e.enemy_team = [copy.copy(u) for u in self.enemy_team]
+        e.hand = list(self.hand)
+        e.plays = list(self.plays)
+        e.enemy_plans = list(self.enemy_plans)
+        e._status_queue = list(self._status_queue)
+        e.rng = rng if rng is not None else random.Random(self.seed)
+        return e
+
+    # --- data-driven effect resolution (handlers live in effects.EFFECTS) ---
+    def _execute_effect(self, act, label: str, tgt: Combatant) -> dict:
+        src = self.player
+        try:
+            value = int(act.fn(src, tgt, act.multiplier))
+        except Exception:
+            value = 0
+        value, hits, per_unit = act.handler(self, act, src, tgt, value)
+
+        log = ''
+        if act.log:
+            try:
+                log = act.log.format(label=label, value=int(value), target_name=tgt.name)
+            except Exception:
+                log = ''
+        return {
+            "apply": act.apply,
+            "source": src,
+            "target": tgt,
+            "targets": [u for u, _ in per_unit] if per_unit is not None else [tgt],
+            "value": int(value),
+            # damage per entry of targets, for area effects
+            "dealt": [int(d) for _, d in per_unit] if per_unit is not None else [int(value)],
+            "hits": hits,
+            "log": log,
+        }
@@ -0,0 +1,74 @@
+from .status import STATUSES, Status
+
+
+class Combatant:
+    def __init__(self, name: str, max_hp: int = 100, atk: int = 20, spd: int = 0):
+        self.name = name
+        self.max_hp = max_hp
+        self.hp = max_hp
+        self.atk = atk
+        self.spd = spd  # higher acts earlier in the auto phase
+        self.shield = 0
+        self.statuses: dict[str, Status] = {}  # buffs/debuffs by name (see status.STATUSES)
+        # mirrors of the "strength" and "vulnerable" statuses; change them through add_status
+        self.strength = 0
+        self.next_damage_taken_multiplier = 1.0
+        self.exhausted = False  # skips its next auto-phase action (after a heavy blow)
+
+    def __copy__(self):
+        c = self.__class__.__new__(self.__class__)
+        c.__dict__.update(self.__dict__)
+        c.statuses = {n: st.copy() for n, st in self.statuses.items()}
+        return c
+
+    # --- statuses ---
+    def add_status(self, name: str, stacks: int = 1, value: float | None = None,
+                   expires: int | None = None) -> Status | None:
+        # returns the live status, or None if it ran out of stacks.
+        # durations only extend: a permanent application (expires=None) stays permanent
+        sdef = STATUSES[name]
+        st = self.statuses.get(name)
+        if st is None:
+            st = self.statuses[name] = Status(sdef, 0, 0.0, expires)
+        elif st.expires is not None:
+            st.expires = None if expires is None else max(st.expires, expires)
+        st.stacks = st.stacks + int(stacks) if sdef.stacking == "add" else int(stacks)
+        if value is not None:
+            st.value = float(value)
+        if st.stacks <= 0:
+            self.remove_status(name)
+            return None
+        if sdef.attr:
+            setattr(self, sdef.attr, sdef.mirror(st))
+        return st
+
+    def remove_status(self, name: str):
+        st = self.statuses.pop(name, None)
+        if st is not None and st.sdef.attr:
+            setattr(self, st.sdef.attr, st.sdef.neutral)
+
+    def take_damage(self, dmg: int) -> int:
+        # on-hit statuses first (e.g. vulnerable), then consume shield
+        if self.statuses:
+            for st in list(self.statuses.values()):
+                if st.sdef.on_hit is not None:
+                    dmg = st.sdef.on_hit(self, st, dmg)
+        if self.shield > 0:
+            used = min(self.shield, dmg)
+            self.shield -= used
+            dmg -= used
+        if dmg > 0:
+            self.hp = max(0, self.hp - dmg)
+        return self.hp
+
+    def is_dead(self) -> bool:
+        return self.hp <= 0
+
+    def add_shield(self, amount: int):
+        self.shield += max(0, int(amount))
+
+    def heal(self, amount: int) -> int:
+        if amount <= 0:
+            return self.hp
+        self.hp = min(self.max_hp, self.hp + int(amount))
+        return self.hp
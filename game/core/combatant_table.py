@@ -0,0 +1,224 @@
+from .combatant import Combatant
+
+try:
+    import numpy as np
+except ImportError:  # optional: only batch simulation needs it
+    np = None
+
+PLAYER, ENEMY = 0, 1
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("CombatantTable needs numpy (pip install numpy)")
+
+
+class CombatantTable:
+    # combat state of `size` units in `batch` parallel battles as (batch, size) arrays.
+    # columns are units (player team first, then enemies), rows are independent battles.
+    # every effect takes a boolean target mask, so an area hit or a step of many battles
+    # is one array op instead of a python loop per unit.
+    def __init__(self, batch: int, size: int):
+        _require_numpy()
+        shape = (batch, size)
+        self.batch = batch
+        self.size = size
+        self.hp = np.zeros(shape, dtype=np.int64)
+        self.max_hp = np.zeros(shape, dtype=np.int64)
+        self.shield = np.zeros(shape, dtype=np.int64)
+        self.atk = np.zeros(shape, dtype=np.int64)
+        self.strength = np.zeros(shape, dtype=np.int64)
+        self.spd = np.zeros(shape, dtype=np.int64)
+        self.vuln = np.ones(shape, dtype=np.float64)  # next_damage_taken_multiplier
+        self.side = np.zeros(size, dtype=np.int8)  # PLAYER / ENEMY per column
+        self.names: list[str] = [""] * size
+        self._base = None
+
+    @classmethod
+    def from_combatants(cls, players: list, enemies: list, batch: int = 1) -> "CombatantTable":
+        units = list(players) + list(enemies)
+        t = cls(batch, len(units))
+        for i, u in enumerate(units):
+            t.names[i] = u.name
+            t.hp[:, i] = u.hp
+            t.max_hp[:, i] = u.max_hp
+            t.shield[:, i] = u.shield
+            t.atk[:, i] = u.atk
+            t.strength[:, i] = u.strength
+            t.spd[:, i] = getattr(u, "spd", 0)
+            t.vuln[:, i] = u.next_damage_taken_multiplier
+        t.side[len(players):] = ENEMY
+        t._base = {k: getattr(t, k).copy() for k in ("hp", "max_hp", "shield", "atk", "strength", "spd", "vuln")}
+        return t
+
+    def reset(self, rows=None):
+        # restore the starting state of the given battles (all if None)
+        rows = slice(None) if rows is None else rows
+        for k, v in self._base.items():
+            getattr(self, k)[rows] = v[rows]
+
+    # --- masks ---
+    def alive(self):
+        return self.hp > 0
+
+    def side_mask(self, side: int):
+        return np.broadcast_to(self.side == side, (self.batch, self.size))
+
+    def one_hot(self, cols):
+        # one target column per battle (-1 = none) -> (batch, size) mask
+        cols = np.asarray(cols)
+        mask = np.zeros((self.batch, self.size), dtype=bool)
+        rows = np.nonzero(cols >= 0)[0]
+        mask[rows, cols[rows]] = True
+        return mask
+
+    def front(self, side: int):
+        # column of the first living unit of `side` in every battle, -1 if the side is wiped
+        m = self.alive() & self.side_mask(side)
+        cols = m.argmax(axis=1)
+        return np.where(m.any(axis=1), cols, -1)
+
+    def wiped(self, side: int):
+        return ~(self.alive() & self.side_mask(side)).any(axis=1)
+
+    def _targets(self, targets):
+        return self.alive() if targets is None else (targets & self.alive())
+
+    # --- effects; amount broadcasts against (batch, size) ---
+    def damage(self, amount, targets=None):
+        # same rules as Combatant.take_damage: multiplier (ceil, consumed), shield first
+        m = self._targets(targets)
+        dmg = np.broadcast_to(np.maximum(0, np.asarray(amount, dtype=np.int64)), m.shape)
+        vuln = self.vuln
+        dmg = np.where(m & (vuln != 1.0), np.ceil(dmg * vuln), dmg).astype(np.int64)
+        dmg = np.where(m, dmg, 0)
+        vuln[m] = 1.0
+        used = np.minimum(self.shield, dmg)
+        self.shield -= used
+        hp_loss = np.minimum(self.hp, dmg - used)
+        self.hp -= hp_loss
+        return used + hp_loss
+
+    def heal(self, amount, targets=None):
+        m = self._targets(targets)
+        gain = np.where(m, np.maximum(0, amount), 0)
+        before = self.hp.copy()
+        np.minimum(self.hp + gain, self.max_hp, out=self.hp)
+        return self.hp - before
+
+    def add_shield(self, amount, targets=None):
+        m = self._targets(targets)
+        self.shield += np.where(m, np.maximum(0, amount), 0).astype(np.int64)
+
+    def add_strength(self, amount, targets=None):
+        m = self._targets(targets)
+        self.strength += np.where(m, np.maximum(0, amount), 0).astype(np.int64)
+
+    def set_vulnerable(self, multiplier, targets=None):
+        m = self._targets(targets)
+        self.vuln[m] = np.broadcast_to(np.asarray(multiplier, dtype=np.float64), m.shape)[m]
+
+    # --- per-cell variants: one (row, col) target per listed battle, no full-size masks ---
+    def damage_at(self, rows, cols, amount):
+        hp = self.hp[rows, cols]
+        live = hp > 0
+        vuln = self.vuln[rows, cols]
+        dmg = np.broadcast_to(np.maximum(0, np.asarray(amount, dtype=np.int64)), hp.shape)
+        dmg = np.where(live & (vuln != 1.0), np.ceil(dmg * vuln), dmg).astype(np.int64)
+        dmg = np.where(live, dmg, 0)
+        self.vuln[rows, cols] = np.where(live, 1.0, vuln)
+        shield = self.shield[rows, cols]
+        used = np.minimum(shield, dmg)
+        self.shield[rows, cols] = shield - used
+        hp_loss = np.minimum(hp, dmg - used)
+        self.hp[rows, cols] = hp - hp_loss
+        return used + hp_loss
+
+    def heal_at(self, rows, cols, amount):
+        hp = self.hp[rows, cols]
+        gain = np.where(hp > 0, np.maximum(0, amount), 0)
+        new = np.minimum(hp + gain, self.max_hp[rows, cols])
+        self.hp[rows, cols] = new
+        return new - hp
+
+    def add_shield_at(self, rows, cols, amount):
+        self.shield[rows, cols] += np.where(self.hp[rows, cols] > 0, np.maximum(0, amount), 0)
+
+    def add_strength_at(self, rows, cols, amount):
+        self.strength[rows, cols] += np.where(self.hp[rows, cols] > 0, np.maximum(0, amount), 0)
+
+    # --- interop with the object engine ---
+    def units(self, row: int = 0) -> list:
+        return [TableCombatant(self, row, i) for i in range(self.size)]
+
+    def teams(self, row: int = 0) -> tuple:
+        units = self.units(row)
+        return ([u for u in units if self.side[u.col] == PLAYER],
+                [u for u in units if self.side[u.col] == ENEMY])
+
+
+def _column(name: str, cast):
+    def fget(self):
+        return cast(getattr(self.table, name)[self.row, self.col])
+
+    def fset(self, value):
+        getattr(self.table, name)[self.row, self.col] = value
+
+    return property(fget, fset)
+
+
+class TableCombatant(Combatant):
+    # a Combatant whose state is one cell of a CombatantTable; BattleEngine runs on it unchanged
+    hp = _column("hp", int)
+    max_hp = _column("max_hp", int)
+    shield = _column("shield", int)
+    atk = _column("atk", int)
+    strength = _column("strength", int)
+    spd = _column("spd", int)
+    next_damage_taken_multiplier = _column("vuln", float)
+    exhausted = False  # per-view flag; only the object engine's enemy plans set it
+
+    def __init__(self, table: CombatantTable, row: int, col: int):
+        self.table = table
+        self.row = row
+        self.col = col
+        self.statuses = {}
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.col]
+
+    def __copy__(self):
+        # detached snapshot for BattleEngine.clone: a view copy would share the table cell
+        c = Combatant(self.name, self.max_hp, self.atk, self.spd)
+        c.hp = self.hp
+        c.shield = self.shield
+        c.strength = self.strength
+        c.next_damage_taken_multiplier = self.next_damage_taken_multiplier
+        c.exhausted = self.exhausted
+        c.statuses = {n: st.copy() for n, st in self.statuses.items()}
+        return c
+
+
+def area_damage(units: list, amount: int) -> list:
+    # hit every living unit in `units`; one array op when they are cells of one table row
+    live = [u for u in units if not u.is_dead()]
+    if not live:
+        return []
+    first = live[0]
+    # (on-hit statuses live outside the table, so units carrying any take the per-unit path)
+    if isinstance(first, TableCombatant) and all(
+            isinstance(u, TableCombatant) and u.table is first.table and u.row == first.row
+            and not u.statuses for u in live):
+        t = first.table
+        mask = np.zeros((t.batch, t.size), dtype=bool)
+        mask[first.row, [u.col for u in live]] = True
+        dealt = t.damage(int(amount), mask)
+        return [(u, int(dealt[u.row, u.col])) for u in live]
+    out = []
+    for u in live:
+        before = u.hp + u.shield
+        u.take_damage(max(0, int(amount)))
+        out.append((u, max(0, before - (u.hp + u.shield))))
+    return out
+
@@ -0,0 +1,178 @@
+import os
+import json
+from .combatant import Combatant
+from .battle_engine import BattleEngine
+from .formula import compile_logic
+from .effects import CompiledCard
+
+
+def default_project_root() -> str:
+    # .../game/core/content.py -> project root
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+class ContentRegistry:
+    # one parsed copy of each data file per process; re-read only when mtime/size change.
+    # returned objects are shared: callers must copy before mutating.
+
+    def __init__(self, project_root: str):
+        self.project_root = project_root
+        self._files: dict[str, dict] = {}  # rel -> {"stamp", "data", "derived"}
+
+    def _path(self, rel: str) -> str:
+        if os.path.isabs(rel):
+            return rel
+        return os.path.join(self.project_root, rel.replace("/", os.sep))
+
+    def _entry(self, rel: str) -> dict:
+        path = self._path(rel)
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        entry = self._files.get(rel)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry
+        data = None
+        if stamp is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                data = None
+        entry = {"stamp": stamp, "data": data, "derived": {}}
+        self._files[rel] = entry
+        return entry
+
+    def get(self, rel: str, default=None):
+        data = self._entry(rel)["data"]
+        return default if data is None else data
+
+    def exists(self, rel: str) -> bool:
+        return self._entry(rel)["data"] is not None
+
+    def derived(self, rel: str, key: str, build):
+        # value computed from a file once per file version (indexes, compiled logic...)
+        entry = self._entry(rel)
+        if key not in entry["derived"]:
+            entry["derived"][key] = build(entry["data"])
+        return entry["derived"][key]
+
+    def invalidate(self, rel: str | None = None):
+        if rel is None:
+            self._files.clear()
+        else:
+            self._files.pop(rel, None)
+
+    # --- typed accessors ---
+    def skill_cards(self) -> list:
+        return self.derived("data/skillscard.json", "cards", lambda d: list((d or {}).get("cards", [])))
+
+    def skill_cards_by_id(self) -> dict:
+        return self.derived("data/skillscard.json", "by_id",
+                            lambda d: {c.get("id"): c for c in (d or {}).get("cards", []) if c.get("id")})
+
+    def skill_card(self, card_id: str) -> dict | None:
+        return self.skill_cards_by_id().get(card_id)
+
+    def effect_logic(self) -> dict:
+        # compiled once per file version; raises FormulaError on a bad formula
+        return self.derived("data/skillcardLogic.json", "compiled",
+                            lambda d: compile_logic(d if d is not None else {"effects": {}}))
+
+    def compiled_cards(self) -> dict:
+        # card id -> CompiledCard, rebuilt only when skillscard.json or skillcardLogic.json change
+        logic = self.effect_logic()
+        key = ("compiled", self._entry("data/skillcardLogic.json")["stamp"])
+        return self.derived("data/skillscard.json", key,
+                            lambda d: {c.get("id"): CompiledCard(c, logic) for c in self.skill_cards() if c.get("id")})
+
+    def stages(self) -> list:
+        return self.derived("data/stages.json", "stages", lambda d: list((d or {}).get("stages", [])))
+
+    def stage(self, stage_id) -> dict | None:
+        by_id = self.derived("data/stages.json", "by_id",
+                             lambda d: {s.get("id"): s for s in (d or {}).get("stages", [])})
+        return by_id.get(stage_id)
+
+    def deck(self) -> list:
+        # default deck; the player's own deck lives in the profile (SaveManager.get_deck)
+        return list(self.get("data/deck.json", {}).get("deck", []))
+
+    def energy_max(self, hero_name: str = "Hero") -> int:
+        for c in self.get("data/cards.json", {}).get("cards", []):
+            if c.get("name") == hero_name and "energy_max" in c:
+                try:
+                    return int(c["energy_max"]) or 5
+                except Exception:
+                    break
+        return 5
+
+
+_registries: dict[str, ContentRegistry] = {}
+
+
+def get_registry(project_root: str | None = None) -> ContentRegistry:
+    root = os.path.abspath(project_root or default_project_root())
+    reg = _registries.get(root)
+    if reg is None:
+        reg = _registries[root] = ContentRegistry(root)
+    return reg
+
+
+def load_json(project_root: str, rel: str, default=None):
+    return get_registry(project_root).get(rel, default)
+
+
+def load_skill_cards(project_root: str) -> list:
+    return get_registry(project_root).skill_cards()
+
+
+def load_effect_logic(project_root: str) -> dict:
+    return get_registry(project_root).effect_logic()
+
+
+def load_stages(project_root: str) -> list:
+    return get_registry(project_root).stages()
+
+
+def load_deck(project_root: str) -> list:
+    return get_registry(project_root).deck()
+
+
+def load_energy_max(project_root: str, hero_name: str = "Hero") -> int:
+    return get_registry(project_root).energy_max(hero_name)
+
+
+def make_combatant(entry: dict) -> Combatant:
+    return Combatant(entry.get("name", "?"), max_hp=int(entry.get("hp", 100)), atk=int(entry.get("atk", 20)),
+                     spd=int(entry.get("spd", 0)))
+
+
+def stage_teams(stage: dict) -> tuple:
+    # (player entries, enemy entries) of a stages.json entry, demo units if a side is missing
+    players = list(stage.get("player_team") or [{"name": "Hero", "hp": 120, "atk": 25}])
+    enemies = list(stage.get("enemy_team") or [{"name": "Slime", "hp": 100, "atk": 18}])
+    return players, enemies
+
+
+def build_engine(project_root: str, stage: dict, deck: list | None = None, seed: int | None = None,
+                 cards: list | None = None, logic: dict | None = None,
+                 energy_max: int | None = None, compiled: dict | None = None) -> BattleEngine:
+    # headless encounter from a stages.json entry
+    players, enemies = stage_teams(stage)
+    team = [make_combatant(e) for e in players]
+    hero = team[0]
+    if compiled is None and cards is None and logic is None:
+        compiled = get_registry(project_root).compiled_cards()
+    return BattleEngine(
+        team,
+        [make_combatant(e) for e in enemies],
+        cards=cards if cards is not None else load_skill_cards(project_root),
+        logic=logic if logic is not None else load_effect_logic(project_root),
+        deck=deck if deck is not None else load_deck(project_root),
+        energy_max=energy_max if energy_max is not None else load_energy_max(project_root, hero.name),
+        seed=seed,
+        compiled=compiled,
+    )
@@ -0,0 +1,139 @@
+from .formula import compile_formula
+from .combatant_table import area_damage
+
+# apply kind -> handler(engine, action, source, target, value) -> (value, hits, per_unit | None),
+# per_unit listing (unit, dealt) for effects that hit more than the chosen target.
+# handlers are bound to a card's actions when the card is compiled, so register new kinds
+# before content is loaded into an engine
+EFFECTS: dict = {}
+
+
+def register_effect(kind: str, fn=None):
+    # register a handler for an "apply" kind of data/skillcardLogic.json; usable as a decorator
+    if fn is None:
+        return lambda f: register_effect(kind, f)
+    EFFECTS[kind] = fn
+    return fn
+
+
+def _noop(engine, act, src, tgt, value):
+    # unknown kinds still log and report their value
+    return value, 0, None
+
+
+class Action:
+    # one effect of a card with its logic entry, formula and handler resolved up front
+    __slots__ = ("name", "apply", "side", "fn", "handler", "params", "multiplier", "log", "status", "duration")
+
+    def __init__(self, name: str, edef: dict, params: dict):
+        self.name = name
+        self.apply = edef.get("apply")
+        self.side = edef.get("target", "enemy")
+        self.fn = edef.get("compiled") or compile_formula(edef.get("formula", "0"))
+        self.handler = EFFECTS.get(self.apply, _noop)
+        self.params = dict(params)
+        self.multiplier = float(params.get("multiplier", 1.0))
+        self.log = edef.get("log", "")
+        # apply_status: which status, and for how many rounds (card params override the logic entry)
+        self.status = params.get("status", edef.get("status"))
+        duration = params.get("duration", edef.get("duration"))
+        self.duration = None if duration is None else int(duration)
+
+
+class CompiledCard:
+    __slots__ = ("card", "actions", "required_target", "cost")
+
+    def __init__(self, card: dict, logic: dict):
+        effects = logic.get("effects", {})
+        self.card = card
+        self.actions = [Action(e.get("name"), effects.get(e.get("name"), {}), e) for e in card.get("effects", [])]
+        # if any effect targets enemy -> enemy, else self
+        self.required_target = "enemy" if any(a.side == "enemy" for a in self.actions) else "self"
+        self.cost = int(card.get("cost", 0))
+
+
+def _ally(act: Action, src, tgt):
+    # self-side effects land on the chosen ally (the leader itself in a 1v1)
+    return tgt if act.side != "enemy" else src
+
+
+def _hit(tgt, value) -> int:
+    prev = tgt.hp + tgt.shield
+    tgt.take_damage(max(0, int(value)))
+    return max(0, int(prev - (tgt.hp + tgt.shield)))
+
+
+@register_effect("damage")
+def _damage(engine, act, src, tgt, value):
+    value = _hit(tgt, value)
+    engine.damage_dealt += value
+    return value, 1, None
+
+
+@register_effect("lifesteal")
+def _lifesteal(engine, act, src, tgt, value):
+    value, hits, _ = _damage(engine, act, src, tgt, value)
+    if value > 0:
+        src.heal(value)
+    return value, hits, None
+
+
+@register_effect("damage_n")
+def _damage_n(engine, act, src, tgt, value):
+    # multi-hit without repeated charge; apply sequential hits
+    total, hits = 0, 0
+    for _ in range(max(1, int(act.params.get("times", 2)))):
+        total += _hit(tgt, value)
+        hits += 1
+        if tgt.hp <= 0:
+            break
+    engine.damage_dealt += total
+    return total, hits, None
+
+
+@register_effect("damage_all")
+def _damage_all(engine, act, src, tgt, value):
+    # every living unit on the target's side; vectorized for table-backed teams
+    side = "enemy" if tgt in engine.enemy_team else "self"
+    dealt = area_damage(engine.team(side), value)
+    value = sum(d for _, d in dealt)
+    engine.damage_dealt += value
+    return value, 1 if dealt else 0, dealt
+
+
+@register_effect("heal")
+def _heal(engine, act, src, tgt, value):
+    _ally(act, src, tgt).heal(max(0, int(value)))
+    return value, 0, None
+
+
+@register_effect("shield")
+def _shield(engine, act, src, tgt, value):
+    _ally(act, src, tgt).add_shield(max(0, int(value)))
+    return value, 0, None
+
+
+@register_effect("set_next_damage_taken_multiplier")
+def _vulnerable(engine, act, src, tgt, value):
+    engine.apply_status(tgt, "vulnerable", 1, act.multiplier, act.duration)
+    return value, 0, None
+
+
+@register_effect("apply_status")
+def _apply_status(engine, act, src, tgt, value):
+    # formula value = stacks, multiplier = status value, on the chosen unit of the effect's side
+    if act.status is not None and value > 0:
+        engine.apply_status(tgt, act.status, value, act.multiplier, act.duration)
+    return value, 0, None
+
+
+@register_effect("gain_energy")
+def _gain_energy(engine, act, src, tgt, value):
+    engine.energy = min(engine.energy_max, engine.energy + max(0, int(value)))
+    return value, 0, None
+
+
+@register_effect("add_strength")
+def _add_strength(engine, act, src, tgt, value):
+    engine.apply_status(_ally(act, src, tgt), "strength", max(0, int(value)), duration=act.duration)
+    return value, 0, None
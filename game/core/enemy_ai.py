@@ -0,0 +1,149 @@
+import random
+import time
+from collections import OrderedDict
+from .battle_engine import BattleEngine, first_affordable
+
+# finite so that, in a lost race, enemies still prefer the line that costs the player most
+WIN_SCORE = 1000.0
+
+
+def difficulty(floor) -> dict:
+    # floor 1 mostly plays plain attacks; search budget, chance samples and
+    # look-ahead grow with the floor (stage id)
+    try:
+        f = max(1, int(floor))
+    except (TypeError, ValueError):
+        f = 1
+    return {
+        "budget_ms": min(150, 20 + 10 * f),
+        "samples": min(16, 2 + 2 * f),
+        "depth": 1 if f < 3 else 2,
+        "epsilon": max(0.0, 0.5 - 0.1 * (f - 1)),  # chance to skip the search and attack the front
+    }
+
+
+def evaluate(engine: BattleEngine) -> float:
+    # from the enemy side: bigger is better for the enemies
+    score = 5.0 * engine.rounds
+    if engine.result == 'lose':
+        score += WIN_SCORE
+    elif engine.result == 'win':
+        score -= WIN_SCORE
+    for u in engine.enemy_team:
+        if not u.is_dead():
+            score += u.hp + 0.5 * u.shield + 2.0 * u.strength + 40.0
+    for u in engine.player_team:
+        if not u.is_dead():
+            score -= u.hp + 0.5 * u.shield + 2.0 * u.strength + 40.0
+    return score
+
+
+def state_key(engine: BattleEngine) -> tuple:
+    return tuple((u.hp, u.shield, u.exhausted, tuple(st.key() for st in u.statuses.values()))
+                 for u in engine.player_team + engine.enemy_team) + (engine.rounds,)
+
+
+class EnemyPlanner:
+    # expectimax over the headless rules: for each acting enemy (coordinate descent over
+    # the joint plan) try every action, then average the player's reply over sampled hands.
+    # hard wall-clock budget; the best plan found so far is returned when it runs out.
+    # plan() only reads a clone, so it is safe to call from a worker thread.
+    def __init__(self, budget_ms: int = 50, samples: int = 8, depth: int = 1, epsilon: float = 0.0,
+                 seed: int | None = None, policy=None, tt_size: int = 50_000, margin: float = 1.0):
+        self.budget_ms = budget_ms
+        self.margin = margin  # a deviation must beat the current plan by this much (sampling noise)
+        self.samples = max(1, samples)
+        self.depth = max(1, depth)
+        self.epsilon = epsilon
+        self.policy = policy or first_affordable
+        self.rng = random.Random(seed)
+        self.tt_size = tt_size
+        # state after a complete enemy turn -> expected value; shared across turns of one battle
+        self._tt: OrderedDict = OrderedDict()
+        self.tt_hits = 0
+        self.evaluations = 0
+        self.last_ms = 0.0
+
+    @classmethod
+    def for_floor(cls, floor, seed: int | None = None) -> "EnemyPlanner":
+        return cls(seed=seed, **difficulty(floor))
+
+    def reset(self):
+        self._tt.clear()
+        self.tt_hits = 0
+        self.evaluations = 0
+
+    def plan(self, engine: BattleEngine) -> list:
+        t0 = time.perf_counter()
+        deadline = t0 + self.budget_ms / 1000.0
+        try:
+            return self._search(engine.clone(), deadline)
+        finally:
+            self.last_ms = (time.perf_counter() - t0) * 1000.0
+
+    # --- search ---
+    def _search(self, root: BattleEngine, deadline: float) -> list:
+        actors = root.enemy_order()
+        if not actors or root.is_over():
+            return []
+        plan = ["a"] * len(actors)
+        if self.rng.random() < self.epsilon:
+            return plan
+        # common random numbers: every candidate is scored against the same sampled hands
+        seeds = [self.rng.randrange(1 << 30) for _ in range(self.samples)]
+        best = self._value(root, plan, seeds, deadline)
+        if best is None:
+            return plan
+        actions = root.enemy_actions()
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(actors)):
+                for act in actions:
+                    if act == plan[i]:
+                        continue
+                    cand = plan[:i] + [act] + plan[i + 1:]
+                    v = self._value(root, cand, seeds, deadline)
+                    if v is None:
+                        return plan  # out of time: best so far
+                    if v > best + self.margin:
+                        best, plan, improved = v, cand, True
+        return plan
+
+    def _value(self, root: BattleEngine, plan: list, seeds: list, deadline: float):
+        sim = root.clone()
+        sim.enemy_turn(plan)
+        key = state_key(sim)
+        hit = self._tt.get(key)
+        if hit is not None:
+            self._tt.move_to_end(key)
+            self.tt_hits += 1
+            return hit
+        total = 0.0
+        for s in seeds:
+            if time.perf_counter() >= deadline:
+                return None
+            total += self._rollout(sim, s)
+        value = total / len(seeds)
+        self._tt[key] = value
+        if len(self._tt) > self.tt_size:
+            self._tt.popitem(last=False)
+        self.evaluations += 1
+        return value
+
+    def _rollout(self, sim: BattleEngine, seed: int) -> float:
+        # chance node: the player's next hand; then `depth` rounds of player reply + plain enemy turn
+        e = sim.clone(random.Random(seed))
+        for d in range(self.depth):
+            if e.is_over():
+                break
+            e.start_player_turn()
+            while not e.is_over():
+                idx = self.policy(e)
+                if idx is None or e.play_card(idx) is None:
+                    break
+            if e.is_over() or d == self.depth - 1:
+                break
+            e.end_player_turn()
+            e.enemy_turn()
+        return evaluate(e)
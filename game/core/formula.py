@@ -0,0 +1,146 @@
+import ast
+import operator
+from functools import lru_cache, reduce
+
+
+class FormulaError(ValueError):
+    pass
+
+
+# names a formula may read; source.atk already includes strength
+FIELDS = ("atk", "max_hp", "hp", "shield")
+FUNCS = {"round": round, "min": min, "max": max}
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _source_field(attr: str):
+    if attr == "atk":
+        return lambda s, t, m: int(s.atk + s.strength)
+    return lambda s, t, m: int(getattr(s, attr))
+
+
+def _target_field(attr: str):
+    return lambda s, t, m: int(getattr(t, attr)) if t is not None else 0
+
+
+# batch variant: source/target are dicts of numpy arrays (one entry per battle)
+def _source_column(attr: str):
+    if attr == "atk":
+        return lambda s, t, m: s["atk"] + s["strength"]
+    return lambda s, t, m: s[attr]
+
+
+def _target_column(attr: str):
+    return lambda s, t, m: t[attr]
+
+
+def _vec_funcs() -> dict:
+    import numpy as np
+    return {"round": np.round, "min": np.minimum, "max": np.maximum}
+
+
+def _build(node, src: str, vec: bool = False):
+    # turn a whitelisted AST node into a closure fn(source, target, multiplier)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        v = node.value
+        return (lambda s, t, m: v), True
+    if isinstance(node, ast.Name):
+        if node.id == "multiplier":
+            return (lambda s, t, m: m), False
+        raise FormulaError(f"unknown name '{node.id}' in formula {src!r}")
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        if node.attr not in FIELDS:
+            raise FormulaError(f"unknown field '{node.value.id}.{node.attr}' in formula {src!r}")
+        if node.value.id == "source":
+            return (_source_column if vec else _source_field)(node.attr), False
+        if node.value.id == "target":
+            return (_target_column if vec else _target_field)(node.attr), False
+        raise FormulaError(f"unknown name '{node.value.id}' in formula {src!r}")
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        op = _BIN_OPS[type(node.op)]
+        (lf, lc), (rf, rc) = _build(node.left, src, vec), _build(node.right, src, vec)
+        fn = lambda s, t, m: op(lf(s, t, m), rf(s, t, m))
+        return _fold(fn, lc and rc)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        of, oc = _build(node.operand, src, vec)
+        return _fold(lambda s, t, m: op(of(s, t, m)), oc)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        func = (_vec_funcs() if vec else FUNCS).get(node.func.id)
+        if func is None:
+            raise FormulaError(f"function '{node.func.id}' is not allowed in formula {src!r}")
+        if node.keywords or not node.args:
+            raise FormulaError(f"bad call to '{node.func.id}' in formula {src!r}")
+        built = [_build(a, src, vec) for a in node.args]
+        args = [f for f, _ in built]
+        const = all(c for _, c in built)
+        if len(args) == 1:
+            a0 = args[0]
+            return _fold(lambda s, t, m: func(a0(s, t, m)), const)
+        if len(args) == 2:
+            a0, a1 = args
+            return _fold(lambda s, t, m: func(a0(s, t, m), a1(s, t, m)), const)
+        if vec:
+            # numpy ufuncs are binary; fold longer min/max calls pairwise
+            return _fold(lambda s, t, m: reduce(func, [a(s, t, m) for a in args]), const)
+        return _fold(lambda s, t, m: func(*[a(s, t, m) for a in args]), const)
+    raise FormulaError(f"unsupported expression '{type(node).__name__}' in formula {src!r}")
+
+
+def _fold(fn, const: bool):
+    # precompute subtrees that don't read any combatant or multiplier
+    if not const:
+        return fn, False
+    try:
+        v = fn(None, None, 1.0)
+    except Exception as e:
+        raise FormulaError(f"constant expression fails: {e}") from e
+    return (lambda s, t, m: v), True
+
+
+@lru_cache(maxsize=None)
+def compile_formula(src: str):
+    try:
+        tree = ast.parse(str(src).strip(), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"syntax error in formula {src!r}: {e.msg}") from e
+    fn, _ = _build(tree.body, src)
+    return fn
+
+
+@lru_cache(maxsize=None)
+def compile_formula_vec(src: str):
+    # same whitelist, evaluated on arrays: fn(source_cols, target_cols, multiplier) -> array
+    try:
+        tree = ast.parse(str(src).strip(), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"syntax error in formula {src!r}: {e.msg}") from e
+    fn, _ = _build(tree.body, src, vec=True)
+    return fn
+
+
+def compile_logic(raw: dict) -> dict:
+    # validate and compile every effect formula once; raises FormulaError on the first bad one
+    if raw.get("compiled"):
+        return raw
+    effects = {}
+    for name, edef in (raw.get("effects") or {}).items():
+        try:
+            fn = compile_formula(edef.get("formula", "0"))
+        except FormulaError as e:
+            raise FormulaError(f"effect '{name}': {e}") from e
+        effects[name] = dict(edef, compiled=fn)
+    return dict(raw, effects=effects, compiled=True)
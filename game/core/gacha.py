@@ -0,0 +1,32 @@
+import random
+
+
+def pull_rng(seed: int, pull_index: int) -> random.Random:
+    # one independent stream per pull: (profile seed, pull number) -> same result every time
+    return random.Random(f"{int(seed)}:{int(pull_index)}")
+
+
+def roll_once(rng: random.Random, all_cards: list) -> dict:
+    # probabilities:
+    # 50% +1 diamond, 20% +1 card, 5% +3 diamonds, 3% +8 diamonds, 2% +3 cards, else 20% no reward
+    def rand_card() -> str:
+        if not all_cards:
+            return ""
+        return rng.choice(all_cards)
+
+    x = rng.random()
+    if x < 0.50:
+        return {"diamonds": 1}
+    x -= 0.50
+    if x < 0.20:
+        return {"cards": [rand_card()]}
+    x -= 0.20
+    if x < 0.05:
+        return {"diamonds": 3}
+    x -= 0.05
+    if x < 0.03:
+        return {"diamonds": 8}
+    x -= 0.03
+    if x < 0.02:
+        return {"cards": [rand_card(), rand_card(), rand_card()]}
+    return {"none": True}
@@ -0,0 +1,115 @@
+import json
+from .battle_engine import BattleEngine, END_TURN
+
+REPLAY_VERSION = 2
+# v1 replays (1v1, no target tokens) decode unchanged
+_READABLE = (1, 2)
+_TARGETS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def encode_plays(plays: list) -> str:
+    # one char per hand index, '@' + base36 target when not the first unit,
+    # '|' ends a player turn: e.g. "03@21|20|4"
+    out = []
+    for p in plays:
+        if p == END_TURN:
+            out.append("|")
+            continue
+        index, target = p
+        out.append(str(int(index)))
+        if target:
+            if not 0 <= target < len(_TARGETS):
+                raise ReplayError(f"target {target} cannot be encoded")
+            out.append("@" + _TARGETS[target])
+    return "".join(out)
+
+
+def decode_plays(text: str) -> list:
+    out = []
+    chars = iter(text or "")
+    for ch in chars:
+        if ch == "|":
+            out.append(END_TURN)
+        elif ch.isdigit():
+            out.append((int(ch), 0))
+        elif ch == "@" and out and out[-1] != END_TURN:
+            t = _TARGETS.find(next(chars, ""))
+            if t < 0:
+                raise ReplayError("bad target token after '@'")
+            out[-1] = (out[-1][0], t)
+        else:
+            raise ReplayError(f"bad play token {ch!r}")
+    return out
+
+
+class BattleReplay:
+    def __init__(self, seed: int, plays: list, stage=None, deck=None, result=None, stats=None, enemy=None):
+        self.seed = int(seed)
+        self.plays = list(plays)
+        self.enemy = [list(p) for p in enemy or []]  # enemy plan tokens per enemy turn
+        self.stage = stage
+        self.deck = list(deck) if deck is not None else None
+        self.result = result
+        self.stats = dict(stats or {})
+
+    @classmethod
+    def from_engine(cls, engine: BattleEngine, stage=None) -> "BattleReplay":
+        return cls(engine.seed, engine.plays, stage=stage, deck=engine.deck,
+                   result=engine.result, stats=engine.stats(), enemy=engine.enemy_plans)
+
+    def to_dict(self) -> dict:
+        return {
+            "v": REPLAY_VERSION,
+            "seed": self.seed,
+            "stage": self.stage,
+            "deck": self.deck,
+            "plays": encode_plays(self.plays),
+            "enemy": [",".join(p) for p in self.enemy],
+            "result": self.result,
+            "stats": self.stats,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BattleReplay":
+        if int(d.get("v", 0)) not in _READABLE:
+            raise ReplayError(f"unsupported replay version {d.get('v')!r}")
+        return cls(d["seed"], decode_plays(d.get("plays", "")), stage=d.get("stage"), deck=d.get("deck"),
+                   result=d.get("result"), stats=d.get("stats"),
+                   enemy=[[t for t in p.split(",") if t] for p in d.get("enemy") or []])
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "BattleReplay":
+        return cls.from_dict(json.loads(text))
+
+    def simulate(self, engine: BattleEngine) -> dict:
+        # engine must be freshly built for the same stage and content
+        if self.deck is not None:
+            engine.set_content(deck=self.deck)
+        engine.start(seed=self.seed)
+        engine.start_player_turn()
+        turns = 0
+        for i, p in enumerate(self.plays):
+            if p == END_TURN:
+                engine.end_player_turn()
+                engine.enemy_turn(self.enemy[turns] if turns < len(self.enemy) else None)
+                turns += 1
+                if i + 1 < len(self.plays):
+                    engine.start_player_turn()
+            elif engine.play_card(*p) is None:
+                raise ReplayError(f"play #{i} (hand index {p[0]}, target {p[1]}) is not legal in round {engine.rounds}")
+        if (self.plays and self.plays[-1] == END_TURN and not engine.is_over()
+                and engine.rounds < int((self.stats or {}).get("rounds", 0))):
+            # the battle ended at the start of the next round (e.g. poison)
+            engine.start_player_turn()
+        return {"result": engine.result, "stats": engine.stats()}
+
+    def verify(self, engine: BattleEngine) -> bool:
+        res = self.simulate(engine)
+        return res["result"] == self.result and res["stats"] == self.stats
@@ -0,0 +1,95 @@
+import math
+
+# points of a round at which the engine drains due status entries
+ROUND_START, ROUND_END = 0, 1
+
+# name -> StatusDef; a Combatant holds at most one Status per name
+STATUSES: dict = {}
+
+
+class StatusDef:
+    # stacking: "add" sums stacks (removed at 0), "replace" overwrites them.
+    # attr: Combatant field mirroring the status (mirror(status), `neutral` when removed), so
+    # formulas, the AI and table-backed units keep reading plain columns.
+    # hooks: on_round_start/on_round_end(engine, unit, status) -> event | None,
+    # on_hit(unit, status, dmg) -> dmg, run for every hit the unit takes
+    __slots__ = ("name", "label", "stacking", "attr", "mirror", "neutral",
+                 "on_round_start", "on_round_end", "on_hit")
+
+    def __init__(self, name: str, label: str, stacking: str = "add", attr: str | None = None,
+                 mirror=None, neutral=0, on_round_start=None, on_round_end=None, on_hit=None):
+        self.name = name
+        self.label = label
+        self.stacking = stacking
+        self.attr = attr
+        self.mirror = mirror or (lambda st: st.stacks)
+        self.neutral = neutral
+        self.on_round_start = on_round_start
+        self.on_round_end = on_round_end
+        self.on_hit = on_hit
+
+    def hook(self, phase: int):
+        return self.on_round_start if phase == ROUND_START else self.on_round_end
+
+
+def register_status(name: str, label: str, **kwargs) -> StatusDef:
+    sdef = StatusDef(name, label, **kwargs)
+    STATUSES[name] = sdef
+    return sdef
+
+
+class Status:
+    # expires: last round the status is active (dropped at that round's end), None = until used up.
+    # serial identifies this application in the engine's schedule; copies keep it
+    __slots__ = ("sdef", "stacks", "value", "expires", "serial")
+
+    def __init__(self, sdef: StatusDef, stacks: int = 0, value: float = 0.0, expires: int | None = None):
+        self.sdef = sdef
+        self.stacks = stacks
+        self.value = value
+        self.expires = expires
+        self.serial = 0
+
+    @property
+    def name(self) -> str:
+        return self.sdef.name
+
+    def copy(self) -> "Status":
+        st = Status(self.sdef, self.stacks, self.value, self.expires)
+        st.serial = self.serial
+        return st
+
+    def key(self) -> tuple:
+        return self.sdef.name, self.stacks, self.value, self.expires
+
+
+def describe(unit) -> str:
+    # short badge text for the renderer, e.g. "力量3 易伤 中毒4"
+    parts = []
+    for st in unit.statuses.values():
+        show = st.stacks if st.sdef.stacking == "add" else None
+        parts.append(f"{st.sdef.label}{show}" if show else st.sdef.label)
+    return " ".join(parts)
+
+
+# --- built-in statuses ---
+def _vulnerable_hit(unit, st, dmg):
+    # next hit only
+    unit.remove_status("vulnerable")
+    return int(math.ceil(dmg * st.value))
+
+
+def _poison_tick(engine, unit, st):
+    # loses `stacks` hp through shield, then one stack wears off
+    dealt = min(unit.hp, st.stacks)
+    unit.hp -= dealt
+    engine.credit_damage(unit, dealt)
+    unit.add_status("poison", -1)
+    return {"apply": "status", "source": unit, "target": unit, "targets": [unit], "value": dealt,
+            "hits": 1, "log": f"{unit.name} 受到 {dealt} 点中毒伤害"}
+
+
+register_status("strength", "力量", attr="strength")
+register_status("vulnerable", "易伤", stacking="replace", attr="next_damage_taken_multiplier",
+                mirror=lambda st: st.value, neutral=1.0, on_hit=_vulnerable_hit)
+register_status("poison", "中毒", on_round_start=_poison_tick)
@@ -0,0 +1,311 @@
+from .battle_engine import BattleEngine
+from .combatant_table import CombatantTable, PLAYER, ENEMY, np, _require_numpy
+from .formula import compile_formula_vec
+
+END_TURN = -1
+_SIDES = {"enemy": ENEMY, "self": PLAYER}
+
+
+# statuses the table can hold (no durations): strength and vuln columns, poison array
+_STATUS_KINDS = {"add_strength": "strength", "set_next_damage_taken_multiplier": "vulnerable"}
+_TABLE_STATUSES = ("strength", "vulnerable", "poison")
+
+
+class _Effect:
+    __slots__ = ("apply", "side", "fn", "multiplier", "times", "status")
+
+    def __init__(self, act, edef: dict):
+        status = act.status if act.apply == "apply_status" else _STATUS_KINDS.get(act.apply)
+        if status is not None and (status not in _TABLE_STATUSES or act.duration is not None):
+            raise ValueError(f"effect '{act.name}': VecBattleEnv does not support status "
+                             f"{status!r}{' with a duration' if act.duration is not None else ''}")
+        self.status = status
+        self.apply = act.apply
+        self.side = _SIDES.get(act.side, ENEMY)
+        self.fn = compile_formula_vec(edef.get("formula", "0"))
+        self.multiplier = act.multiplier
+        self.times = max(1, int(act.params.get("times", 2)))
+
+
+class VecBattleEnv:
+    # K independent copies of one encounter stepped in lock-step on a CombatantTable.
+    # same rules as BattleEngine (leader casts, auto phase in spd order, shield/vulnerable,
+    # poison ticking at round start, enemies on the plain-attack plan);
+    # hands are drawn from one numpy Generator, so seed + actions reproduce every battle.
+    #
+    # step(cards, targets): cards[k] is a hand slot (0..4) or END_TURN, targets[k] is a unit
+    # index on the card's required side (-1 = front). finished battles reset automatically.
+    HAND_SIZE = BattleEngine.HAND_SIZE
+
+    def __init__(self, players: list, enemies: list, cards: list, logic: dict, deck: list,
+                 k: int, energy_max: int = 5, seed: int = 0, max_rounds: int = 200):
+        _require_numpy()
+        self.k = k
+        self.energy_max = energy_max
+        self.max_rounds = max_rounds
+        self.table = CombatantTable.from_combatants(players, enemies, batch=k)
+        self.n_players = len(players)
+        self.n_units = self.table.size
+        # same pool rule as BattleEngine.set_content
+        engine = BattleEngine(list(players), list(enemies), cards=cards, logic=logic, deck=deck)
+        self.card_defs: list[dict] = list(engine._pool)
+        self.card_ids: list[str] = [c.get("id", "") for c in self.card_defs]
+        self._cost = np.array([int(c.get("cost", 0)) for c in self.card_defs], dtype=np.int64)
+        compiled = [engine.compiled(c) for c in self.card_defs]
+        self._side = np.array([_SIDES[cc.required_target] for cc in compiled], dtype=np.int8)
+        effects = engine.logic.get("effects", {})
+        self._effects = [[_Effect(a, effects.get(a.name, {})) for a in cc.actions] for cc in compiled]
+        # auto-phase order: static because spd never changes; the leader is skipped per battle
+        spd = self.table.spd[0]
+        self._order = sorted(range(self.n_units), key=lambda c: -spd[c])
+        self._rows = np.arange(k)
+        self.rng = np.random.default_rng(seed)
+        self.energy = np.zeros(k, dtype=np.int64)
+        self.rounds = np.zeros(k, dtype=np.int64)
+        self.hand = np.full((k, self.HAND_SIZE), -1, dtype=np.int64)
+        self.damage_dealt = np.zeros(k, dtype=np.int64)
+        self.damage_taken = np.zeros(k, dtype=np.int64)
+        self.poison = np.zeros((k, self.n_units), dtype=np.int64)  # stacks, ticked at round start
+        self.episodes = 0
+        self.reset()
+
+    @classmethod
+    def from_project(cls, project_root: str, stage_id, k: int, deck: list | None = None,
+                     seed: int = 0, max_rounds: int = 200) -> "VecBattleEnv":
+        from .content import get_registry
+        stage = get_registry(project_root).stage(stage_id)
+        if stage is None:
+            raise ValueError(f"stage {stage_id!r} not found in data/stages.json")
+        return cls.from_stage(project_root, stage, k, deck=deck, seed=seed, max_rounds=max_rounds)
+
+    @classmethod
+    def from_stage(cls, project_root: str, stage: dict, k: int, deck: list | None = None,
+                   seed: int = 0, max_rounds: int = 200) -> "VecBattleEnv":
+        # any stages.json-shaped entry, e.g. the encounters in scripts/bench_stages.json
+        from .content import get_registry, make_combatant, stage_teams
+        reg = get_registry(project_root)
+        players, enemies = stage_teams(stage)
+        team = [make_combatant(e) for e in players]
+        return cls(team, [make_combatant(e) for e in enemies], reg.skill_cards(), reg.effect_logic(),
+                   deck if deck is not None else reg.deck(), k, energy_max=reg.energy_max(team[0].name),
+                   seed=seed, max_rounds=max_rounds)
+
+    # --- api ---
+    def reset(self, rows=None) -> dict:
+        rows = self._rows if rows is None else np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.nonzero(rows)[0]
+        self.table.reset(rows)
+        self.poison[rows] = 0
+        self.rounds[rows] = 0
+        self.damage_dealt[rows] = 0
+        self.damage_taken[rows] = 0
+        self.episodes += len(rows)
+        self._start_turn(rows)
+        return self.observe()
+
+    def observe(self) -> dict:
+        t = self.table
+        return {
+            "hp": t.hp.copy(),
+            "shield": t.shield.copy(),
+            "strength": t.strength.copy(),
+            "vulnerable": t.vuln.copy(),
+            "poison": self.poison.copy(),
+            "energy": self.energy.copy(),
+            "hand": self.hand.copy(),  # index into card_defs, -1 = empty slot
+            "round": self.rounds.copy(),
+        }
+
+    def action_mask(self):
+        # (k, HAND_SIZE): slots holding a card the leader can afford this turn
+        held = self.hand >= 0
+        cost = self._cost[np.where(held, self.hand, 0)]
+        return held & (cost <= self.energy[:, None])
+
+    def step(self, cards, targets=None):
+        # returns obs, reward (+1 win / -1 lose on the finishing step), done, info
+        cards = np.asarray(cards, dtype=np.int64)
+        targets = np.full(self.k, -1, dtype=np.int64) if targets is None else np.asarray(targets, dtype=np.int64)
+        before_dealt = self.damage_dealt.copy()
+        before_taken = self.damage_taken.copy()
+        played = self._play(cards, targets)
+        end = cards == END_TURN
+        if end.any():
+            self._auto_phase(end & ~self._finished())
+        over = self._finished()
+        truncated = ~over & (self.rounds >= self.max_rounds) & end
+        # start the next player turn where one ended and the battle goes on;
+        # round-start poison can still end it on this step
+        cont = end & ~over & ~truncated
+        if cont.any():
+            self._start_turn(np.nonzero(cont)[0])
+        result = self._result()
+        done = (result != 0) | truncated
+        info = {
+            "played": played,
+            "result": result,
+            "truncated": truncated,
+            "rounds": self.rounds.copy(),
+            "dealt": self.damage_dealt - before_dealt,
+            "taken": self.damage_taken - before_taken,
+        }
+        if done.any():
+            self.reset(np.nonzero(done)[0])
+        return self.observe(), result.astype(np.float64), done, info
+
+    # --- rules ---
+    def _finished(self):
+        return self.table.wiped(PLAYER) | self.table.wiped(ENEMY)
+
+    def _result(self):
+        # 1 win, -1 lose, 0 running; a wiped player side loses first, as in BattleEngine
+        lose = self.table.wiped(PLAYER)
+        win = self.table.wiped(ENEMY) & ~lose
+        return np.where(lose, -1, np.where(win, 1, 0)).astype(np.int8)
+
+    def _start_turn(self, rows):
+        if len(rows) == 0:
+            return
+        self.rounds[rows] += 1
+        p = self.poison[rows]
+        if p.any():
+            # through shield, then one stack wears off (status.poison)
+            t = self.table
+            dealt = np.minimum(t.hp[rows], p)
+            t.hp[rows] -= dealt
+            self.poison[rows] = np.maximum(0, p - 1)
+            self.damage_dealt[rows] += dealt[:, self.n_players:].sum(axis=1)
+            self.damage_taken[rows] += dealt[:, :self.n_players].sum(axis=1)
+        self.energy[rows] = self.energy_max
+        pool = len(self.card_defs)
+        self.hand[rows] = -1
+        if pool:
+            # a random permutation per row; first HAND_SIZE columns are the hand (no repeats)
+            n = min(self.HAND_SIZE, pool)
+            keys = self.rng.random((len(rows), pool))
+            self.hand[rows, :n] = np.argsort(keys, axis=1)[:, :n]
+
+    def _cols(self, rows, cols):
+        t = self.table
+        return {
+            "atk": t.atk[rows, cols], "strength": t.strength[rows, cols], "hp": t.hp[rows, cols],
+            "max_hp": t.max_hp[rows, cols], "shield": t.shield[rows, cols],
+        }
+
+    def _play(self, cards, targets):
+        t = self.table
+        active = (cards >= 0) & (cards < self.HAND_SIZE) & (self._result() == 0)
+        slot = np.where(active, cards, 0)
+        card = np.where(active, self.hand[self._rows, slot], -1)
+        active &= card >= 0
+        cost = self._cost[np.where(active, card, 0)]
+        active &= cost <= self.energy
+        side = self._side[np.where(active, card, 0)]
+        # explicit target -> column of that side; invalid or -1 -> front of the side
+        offset = np.where(side == ENEMY, self.n_players, 0)
+        width = np.where(side == ENEMY, self.n_units - self.n_players, self.n_players)
+        col = np.where((targets >= 0) & (targets < width), targets + offset, -1)
+        ok = col >= 0
+        ok[ok] = t.alive()[np.nonzero(ok)[0], col[ok]]
+        col = np.where(ok, col, np.where(side == ENEMY, t.front(ENEMY), t.front(PLAYER)))
+        active &= col >= 0
+        self.energy -= np.where(active, cost, 0)
+        self.hand[self._rows[active], slot[active]] = -1
+        leader = t.front(PLAYER)
+        for c in np.unique(card[active]):
+            rows = np.nonzero(active & (card == c))[0]
+            self._apply_card(int(c), rows, leader[rows], col[rows], ENEMY if self._side[c] == ENEMY else PLAYER)
+        return active
+
+    def _apply_card(self, c: int, rows, leader, chosen, side):
+        t = self.table
+        for eff in self._effects[c]:
+            if eff.side == side:
+                tgt = chosen
+                # chosen unit fell to an earlier effect of this card: retarget to the front
+                fallen = ~t.alive()[rows, tgt]
+                if fallen.any():
+                    front = t.front(side)[rows]
+                    tgt = np.where(fallen & (front >= 0), front, tgt)
+            else:
+                front = t.front(eff.side)[rows]
+                tgt = np.where(front >= 0, front, 0 if eff.side == PLAYER else self.n_players)
+            ally = tgt if eff.side == PLAYER else leader
+            val = eff.fn(self._cols(rows, leader), self._cols(rows, tgt), eff.multiplier)
+            val = np.broadcast_to(np.asarray(val, dtype=np.float64), rows.shape)
+            val = np.trunc(np.where(np.isfinite(val), val, 0)).astype(np.int64)
+            self._apply(eff, rows, leader, tgt, ally, val)
+
+    def _apply(self, eff: _Effect, rows, leader, tgt, ally, val):
+        t = self.table
+        kind = eff.apply
+        if kind in ("damage", "lifesteal"):
+            dealt = t.damage_at(rows, tgt, val)
+            self.damage_dealt[rows] += dealt
+            if kind == "lifesteal":
+                t.heal_at(rows, leader, dealt)
+        elif kind == "damage_n":
+            total = np.zeros(len(rows), dtype=np.int64)
+            for _ in range(eff.times):
+                total += t.damage_at(rows, tgt, val)
+            self.damage_dealt[rows] += total
+        elif kind == "damage_all":
+            side = np.zeros((self.k, self.n_units), dtype=bool)
+            side[rows] = t.side_mask(eff.side)[rows]
+            amount = np.zeros((self.k, self.n_units), dtype=np.int64)
+            amount[rows] = np.maximum(0, val)[:, None]
+            self.damage_dealt += t.damage(amount, side).sum(axis=1)
+        elif kind == "heal":
+            t.heal_at(rows, ally, val)
+        elif kind == "shield":
+            t.add_shield_at(rows, ally, val)
+        elif kind == "set_next_damage_taken_multiplier":
+            t.vuln[rows, tgt] = np.where(t.hp[rows, tgt] > 0, eff.multiplier, t.vuln[rows, tgt])
+        elif kind == "gain_energy":
+            self.energy[rows] = np.minimum(self.energy_max, self.energy[rows] + np.maximum(0, val))
+        elif kind == "add_strength":
+            t.add_strength_at(rows, ally, val)
+        elif kind == "apply_status":
+            # stacks = val on the chosen unit, as effects._apply_status
+            live = (val > 0) & (t.hp[rows, tgt] > 0)
+            if eff.status == "poison":
+                self.poison[rows, tgt] += np.where(live, val, 0)
+            elif eff.status == "strength":
+                t.add_strength_at(rows, tgt, np.where(live, val, 0))
+            else:
+                t.vuln[rows, tgt] = np.where(live, eff.multiplier, t.vuln[rows, tgt])
+
+    def _front(self, alive, side: int):
+        # first living column of `side` for each row of `alive`, -1 if none
+        lo, hi = (0, self.n_players) if side == PLAYER else (self.n_players, self.n_units)
+        seg = alive[:, lo:hi]
+        return np.where(seg.any(axis=1), seg.argmax(axis=1) + lo, -1)
+
+    def _auto_phase(self, rows_mask):
+        # every living non-leader unit attacks the front of the other side, in spd order.
+        # fronts are only recomputed for battles where the defender just fell.
+        t = self.table
+        alive = t.alive()
+        front = {PLAYER: self._front(alive, PLAYER), ENEMY: self._front(alive, ENEMY)}
+        leader = front[PLAYER].copy()
+        going = rows_mask & (front[PLAYER] >= 0) & (front[ENEMY] >= 0)
+        for c in self._order:
+            rows = np.nonzero(going & alive[:, c] & (leader != c))[0]
+            if len(rows) == 0:
+                continue
+            ally = c < self.n_players
+            fside = ENEMY if ally else PLAYER
+            cols = front[fside][rows]
+            dealt = t.damage_at(rows, cols, t.atk[rows, c] + t.strength[rows, c])
+            if ally:
+                self.damage_dealt[rows] += dealt
+            else:
+                self.damage_taken[rows] += dealt
+            fell = t.hp[rows, cols] <= 0
+            if fell.any():
+                fr = rows[fell]
+                alive[fr, cols[fell]] = False
+                nf = self._front(alive[fr], fside)
+                front[fside][fr] = nf
+                going[fr[nf < 0]] = False
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+
+# profile operations recorded by SaveManager; journaled backends persist these instead of the
+# whole state. path is a list of keys into the state dict.
+#   ["add", path, n]       add n to an int
+#   ["set", path, value]   replace a value
+#   ["cards", [], ids]     add ids to owned_cards (kept sorted, no duplicates)
+#   ["pull", [], [i, r]]   append gacha pull i with result r to gacha_history
+def apply_op(state: Dict[str, Any], op: list):
+    kind, path, value = op
+    if kind == "cards":
+        owned = set(state.get("owned_cards", []))
+        owned.update(i for i in value if i)
+        state["owned_cards"] = sorted(owned)
+        return
+    if kind == "pull":
+        state.setdefault("gacha_history", []).append(list(value))
+        return
+    node = state
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    if kind == "add":
+        node[path[-1]] = int(node.get(path[-1], 0)) + int(value)
+    elif kind == "set":
+        node[path[-1]] = value
+
+
+def write_atomic(path: str, data: str | bytes, fsync: bool = True):
+    # temp file + rename: readers see the old or the new file, never a torn one
+    tmp = path + ".tmp"
+    with (open(tmp, "wb") if isinstance(data, bytes) else open(tmp, "w", encoding="utf-8")) as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class SaveBackend:
+    # storage of one user profile. SaveManager calls commit() from its writer thread with the
+    # operations since the last commit, plus the serialized state when needs_state() asked for it
+    name = ""
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        # the stored profile, None if there is none; raises ValueError if it is unreadable.
+        # keys in lazy_keys() are left out and fetched with load_key() on first use
+        raise NotImplementedError
+
+    def lazy_keys(self) -> set:
+        return set()
+
+    def load_key(self, key: str):
+        raise KeyError(key)
+
+    def needs_state(self, n_ops: int) -> bool:
+        return True
+
+    def commit(self, ops: List[list], state_json: Optional[str]):
+        raise NotImplementedError
+
+    def reset(self, state_json: str):
+        # replace everything stored with this state
+        self.commit([], state_json)
+
+    def files(self) -> List[str]:
+        return []
+
+    def quarantine(self) -> List[str]:
+        # move unreadable files aside instead of overwriting them with a fresh profile
+        moved = []
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        for path in self.files():
+            if os.path.exists(path):
+                dest = f"{path}.corrupt-{stamp}"
+                os.replace(path, dest)
+                moved.append(dest)
+        return moved
+
+    def close(self):
+        pass
+
+
+class JsonFileBackend(SaveBackend):
+    # saves/<user>.json rewritten as a whole on every commit
+    name = "json"
+
+    def __init__(self, saves_dir: str, username: str):
+        self.path = os.path.join(saves_dir, f"{username}.json")
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"unreadable save {self.path}: {e}") from e
+
+    def files(self):
+        return [self.path]
+
+    def commit(self, ops, state_json):
+        if state_json is not None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, state_json, fsync=False)
@@ -0,0 +1,143 @@
+import os
+import json
+import zlib
+from typing import List, Optional
+from .backends import SaveBackend, apply_op, write_atomic
+
+
+def _encode(seq: int, op: list) -> bytes:
+    body = json.dumps([seq] + list(op), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x " % zlib.crc32(body) + body + b"\n"
+
+
+def _decode(line: bytes):
+    # (seq, op) or None for a torn / corrupted record
+    if len(line) < 10 or line[8:9] != b" " or not line.endswith(b"\n"):
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        rec = json.loads(body.decode("utf-8"))
+        return int(rec[0]), rec[1:]
+    except ValueError:
+        return None
+
+
+class JournalBackend(SaveBackend):
+    # <user>.snapshot.json: {"seq": n, "state": {...}}, replaced atomically on compaction.
+    # <user>.journal: one checksummed record per operation with seq > the snapshot's, appended
+    # and fsynced once per commit (SaveManager's write-behind batches many operations per commit).
+    # recovery = snapshot + replay of the journal tail; a torn last record is cut off.
+    name = "journal"
+
+    def __init__(self, saves_dir: str, username: str, compact_ops: int = 500,
+                 compact_bytes: int = 256 * 1024, fsync: bool = True):
+        self.saves_dir = saves_dir
+        self.snapshot_path = os.path.join(saves_dir, f"{username}.snapshot.json")
+        self.journal_path = os.path.join(saves_dir, f"{username}.journal")
+        self.legacy_path = os.path.join(saves_dir, f"{username}.json")
+        self.compact_ops = compact_ops
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self.seq = 0  # last record written
+        self._journal_ops = 0  # records since the last compaction
+        self._journal_bytes = 0
+        self._file = None
+        self._migrate = False
+
+    def load(self):
+        os.makedirs(self.saves_dir, exist_ok=True)
+        state, base = None, 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snap = json.load(f)
+                state, base = snap["state"], int(snap.get("seq", 0))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"unreadable snapshot {self.snapshot_path}: {e}") from e
+        elif os.path.exists(self.legacy_path):
+            # first start after the json format: import it, the first commit compacts.
+            # a journal without a snapshot belongs to nothing and is not replayed
+            self._migrate = True
+            try:
+                with open(self.legacy_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"unreadable save {self.legacy_path}: {e}") from e
+            return state
+        self.seq = base
+        self._journal_ops = self._replay(state, base) if state is not None else 0
+        return state
+
+    def _replay(self, state: dict, base: int) -> int:
+        if not os.path.exists(self.journal_path):
+            return 0
+        good, n = 0, 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                rec = _decode(line)
+                if rec is None:
+                    break  # torn tail from a crash mid-append
+                good += len(line)
+                seq, op = rec
+                if seq > base:
+                    apply_op(state, op)
+                    self.seq = seq
+                    n += 1
+        if good != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
+        self._journal_bytes = good
+        return n
+
+    def files(self):
+        return [self.snapshot_path, self.journal_path] + ([self.legacy_path] if self._migrate else [])
+
+    def needs_state(self, n_ops: int) -> bool:
+        return (self._migrate or self._journal_ops + n_ops >= self.compact_ops
+                or self._journal_bytes >= self.compact_bytes)
+
+    def commit(self, ops: List[list], state_json: Optional[str]):
+        if ops:
+            if self._file is None:
+                self._file = open(self.journal_path, "ab")
+            buf = b"".join(_encode(self.seq + 1 + i, op) for i, op in enumerate(ops))
+            start = self._file.tell()
+            try:
+                self._file.write(buf)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except OSError:
+                # cut a partial append so the retried records follow whole ones
+                self._file.close()
+                self._file = None
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(start)
+                raise
+            self.seq += len(ops)
+            self._journal_ops += len(ops)
+            self._journal_bytes += len(buf)
+        if state_json is not None and self.needs_state(0):
+            self._compact(state_json)
+
+    def reset(self, state_json: str):
+        self._compact(state_json)
+
+    def _compact(self, state_json: str):
+        # the snapshot covers every record up to self.seq, so a crash before the journal is
+        # truncated only leaves records that replay skips
+        os.makedirs(self.saves_dir, exist_ok=True)
+        write_atomic(self.snapshot_path, '{"seq":%d,"state":%s}' % (self.seq, state_json), self.fsync)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, "wb")
+        self._journal_ops = 0
+        self._journal_bytes = 0
+        self._migrate = False
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
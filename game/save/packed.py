@@ -0,0 +1,162 @@
+import os
+import json
+import zlib
+import struct
+import threading
+from typing import Any, Dict, List, Optional
+from .backends import SaveBackend, apply_op, write_atomic
+from .journal import JournalBackend
+
+MAGIC = b"GSAV"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH")  # magic, version, section count
+_ENTRY = struct.Struct("<8sIII")  # name, offset, size, crc32 of the stored bytes
+
+# section -> the state key it holds; "wallet" holds every other key (diamonds, deck, gacha
+# counters...) and is the only section read at startup
+WALLET = "wallet"
+SECTIONS = {"collect": "owned_cards", "history": "gacha_history", "progress": "progress"}
+_SECTION_OF = {key: name for name, key in SECTIONS.items()}
+
+
+def _encode(value) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _op_key(op: list) -> str:
+    kind, path, _ = op
+    if kind == "cards":
+        return "owned_cards"
+    if kind == "pull":
+        return "gacha_history"
+    return path[0]
+
+
+class PackedBackend(SaveBackend):
+    # <user>.sav: header + offset table, then one zlib-compressed json blob per section.
+    # load() reads only the header and the wallet; other sections are read, crc-checked and
+    # decoded on first load_key() (a damaged one raises ValueError there).
+    # a commit re-encodes the wallet and the sections its operations touched, copies the stored
+    # bytes of the rest and replaces the file atomically.
+    name = "packed"
+
+    def __init__(self, saves_dir: str, username: str, fsync: bool = True):
+        self.saves_dir = saves_dir
+        self.username = username
+        self.path = os.path.join(saves_dir, f"{username}.sav")
+        self.fsync = fsync
+        self._table: Dict[str, tuple] = {}  # section -> (offset, size, crc) in the current file
+        self._raw: Dict[str, bytes] = {}  # stored bytes of sections read so far
+        self._state: Dict[str, Any] = {}  # wallet keys + lazy keys decoded by commits
+        self._lazy: set = set()  # lazy keys this backend has not decoded yet
+        self._mu = threading.Lock()  # load_key (GUI thread) vs. commit (save writer)
+
+    # --- read ---
+    def load(self):
+        if not os.path.exists(self.path):
+            return self._import_files()
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"not a version {VERSION} save")
+                table = f.read(_ENTRY.size * count)
+                for i in range(count):
+                    name, offset, size, crc = _ENTRY.unpack_from(table, i * _ENTRY.size)
+                    self._table[name.rstrip(b"\0").decode("ascii")] = (offset, size, crc)
+                wallet = self._decode(WALLET, self._read(f, WALLET))
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            raise ValueError(f"unreadable save {self.path}: {e}") from e
+        self._state = dict(wallet)
+        self._lazy = {SECTIONS[name] for name in self._table if name in SECTIONS}
+        return wallet
+
+    def _read(self, f, name: str) -> bytes:
+        offset, size, crc = self._table[name]
+        f.seek(offset)
+        data = f.read(size)
+        if len(data) != size or zlib.crc32(data) != crc:
+            raise ValueError(f"section {name!r} is damaged")
+        self._raw[name] = data
+        return data
+
+    def _raw_section(self, name: str) -> bytes:
+        data = self._raw.get(name)
+        if data is None:
+            with open(self.path, "rb") as f:
+                data = self._read(f, name)
+        return data
+
+    @staticmethod
+    def _decode(name: str, data: bytes):
+        try:
+            return json.loads(zlib.decompress(data).decode("utf-8"))
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"section {name!r} is damaged: {e}") from e
+
+    def lazy_keys(self):
+        return set(self._lazy)
+
+    def load_key(self, key: str):
+        # a fresh copy for SaveManager; the backend keeps its own for applying operations
+        name = _SECTION_OF[key]
+        with self._mu:
+            try:
+                return self._decode(name, self._raw_section(name))
+            except OSError as e:
+                raise ValueError(f"unreadable save {self.path}: {e}") from e
+
+    def _import_files(self) -> Optional[Dict[str, Any]]:
+        # first start after the json / journal formats
+        state = JournalBackend(self.saves_dir, self.username, fsync=False).load()
+        if state is not None:
+            self.reset(json.dumps(state, ensure_ascii=False))
+        return state
+
+    def files(self):
+        return [self.path]
+
+    # --- write ---
+    def needs_state(self, n_ops: int) -> bool:
+        return False
+
+    def commit(self, ops: List[list], state_json: Optional[str]):
+        if not ops:
+            return
+        with self._mu:
+            touched = set()
+            for op in ops:
+                key = _op_key(op)
+                if key in self._lazy:
+                    self._state[key] = self._decode(_SECTION_OF[key], self._raw_section(_SECTION_OF[key]))
+                    self._lazy.discard(key)
+                apply_op(self._state, op)
+                touched.add(key)
+            self._write(touched)
+
+    def reset(self, state_json: str):
+        with self._mu:
+            self._state = json.loads(state_json)
+            self._lazy = set()
+            self._table = {}
+            self._raw = {}
+            self._write(set(self._state))
+
+    def _write(self, touched: set):
+        sections = {WALLET: _encode({k: v for k, v in self._state.items() if k not in _SECTION_OF})}
+        for name, key in SECTIONS.items():
+            if key in touched and key in self._state:
+                sections[name] = _encode(self._state[key])
+            elif name in self._table:
+                sections[name] = self._raw_section(name)
+        offset = _HEADER.size + _ENTRY.size * len(sections)
+        head = [_HEADER.pack(MAGIC, VERSION, len(sections))]
+        table = {}
+        for name, data in sections.items():
+            table[name] = (offset, len(data), zlib.crc32(data))
+            head.append(_ENTRY.pack(name.encode("ascii"), *table[name]))
+            offset += len(data)
+        os.makedirs(self.saves_dir, exist_ok=True)
+        write_atomic(self.path, b"".join(head + list(sections.values())), self.fsync)
+        self._table = table
+        self._raw = sections
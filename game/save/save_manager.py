@@ -1,18 +1,66 @@
 import os
 import json
+import time
+import logging
+import atexit
+import random
+import threading
 from typing import List, Dict, Any
+from .backends import SaveBackend, JsonFileBackend
+from .journal import JournalBackend
+from .sqlite_backend import SqliteBackend
+from .packed import PackedBackend
+
+log = logging.getLogger(__name__)
+
+BACKENDS = {"json": JsonFileBackend, "journal": JournalBackend, "sqlite": SqliteBackend,
+            "packed": PackedBackend}
 
 
 class SaveManager:
-    def __init__(self, project_root: str, username: str):
+    # write_behind: mutators only mark the state dirty; a background thread writes it once no
+    # mutation arrived for `debounce_ms` (at most `max_delay_ms` after the first), on checkpoint()
+    # and on close(). with write_behind=False every mutation is written before returning.
+    # backend: "journal" (append-only operation log + snapshot), "json" (whole file per write),
+    # "sqlite" (rows in data/saves/saves.db), "packed" (compressed sections, collection and
+    # history loaded on first use) or a SaveBackend instance.
+    # the in-memory state is the one source of truth for pages and battles: they read it through
+    # the getters and subscribe() to the top-level keys they show. export_snapshot additionally
+    # mirrors it to data/player.json on every write for external tools.
+    RETRY_MIN_S = 1.0  # writer backoff after a failed write
+    RETRY_MAX_S = 30.0
+
+    def __init__(self, project_root: str, username: str, write_behind: bool = True,
+                 debounce_ms: int = 500, max_delay_ms: int = 3000, backend="journal",
+                 export_snapshot: bool = False):
         self.project_root = project_root
         self.username = (username or 'player').strip() or 'player'
         self.saves_dir = os.path.join(project_root, 'data', 'saves')
-        self.user_path = os.path.join(self.saves_dir, f'{self.username}.json')
-        # snapshot for legacy readers (inventory/battle)
+        self.backend: SaveBackend = backend if isinstance(backend, SaveBackend) \
+            else BACKENDS[backend](self.saves_dir, self.username)
         self.snapshot_path = os.path.join(project_root, 'data', 'player.json')
+        self.export_snapshot = export_snapshot
         self.state: Dict[str, Any] = {}
+        self.write_behind = write_behind
+        self.debounce_s = max(0, debounce_ms) / 1000.0
+        self.max_delay_s = max(debounce_ms, max_delay_ms) / 1000.0
+        # _lock guards state (mutators vs. serialization); _io_lock keeps writes in serialization order.
+        # when both are needed _io_lock is taken first
+        self._lock = threading.RLock()
+        self._io_lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._pending: list = []  # operations not yet committed to the backend
+        self._dirty = False
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        self.writes = 0  # completed commits
+        self.quarantined: List[str] = []  # unreadable save files moved aside on load
+        self._listeners: Dict[str, list] = {}  # state key ('*' = any) -> callbacks
+        self._lazy: set = set()  # state keys the backend has not loaded yet
         self._ensure_loaded()
+        atexit.register(self.close)
 
     def _default_state(self) -> Dict[str, Any]:
         return {
@@ -44,85 +92,287 @@ class SaveManager:
 
     def _ensure_loaded(self):
         os.makedirs(self.saves_dir, exist_ok=True)
-        if not os.path.exists(self.user_path):
+        try:
+            state = self.backend.load()
+        except ValueError:
+            # keep the broken files for inspection instead of silently overwriting them
+            self.quarantined = self.backend.quarantine()
+            state = None
+        if state is None:
             self.state = self._default_state()
-            self._flush()
+            data = json.dumps(self.state, ensure_ascii=False, separators=(',', ':'))
+            self.backend.reset(data)
+            self._export(data)
         else:
+            self.state = state
+            self._lazy = self.backend.lazy_keys()
+
+    def _need(self, key: str):
+        # load a lazily stored key (collection, history...) on first access
+        if key not in self._lazy:
+            return
+        with self._io_lock, self._lock:
+            if key not in self._lazy:
+                return
             try:
-                with open(self.user_path, 'r', encoding='utf-8') as f:
-                    self.state = json.load(f)
-            except Exception:
-                self.state = self._default_state()
-                self._flush()
+                self.state[key] = self.backend.load_key(key)
+                self._lazy.discard(key)
+            except ValueError:
+                self._recover(key)
+
+    def _recover(self, damaged: str):
+        # a lazily loaded part of the save is unreadable: keep everything that still reads,
+        # move the files aside and store the profile again with that part reset to its default.
+        # called holding _io_lock and _lock, so no commit runs meanwhile
+        default = self._default_state()
+        for key in [damaged] + [k for k in self._lazy if k != damaged]:
+            try:
+                if key == damaged:
+                    raise ValueError(key)
+                self.state[key] = self.backend.load_key(key)
+            except ValueError:
+                if key in default:
+                    self.state[key] = default[key]
+                else:
+                    self.state.pop(key, None)
+        self._lazy.clear()
+        self.quarantined += self.backend.quarantine()
+        data = json.dumps(self.state, ensure_ascii=False, separators=(',', ':'))
+        self.backend.reset(data)
+        self._pending = []  # included in the stored state
+        self._export(data)
+
+    def _record(self, kind: str, path: list, value):
+        # called by mutators holding _lock, next to their change of self.state
+        self._pending.append([kind, path, value])
 
     def _flush(self):
-        # write user profile
-        os.makedirs(self.saves_dir, exist_ok=True)
-        with open(self.user_path, 'w', encoding='utf-8') as f:
-            json.dump(self.state, f, ensure_ascii=False, indent=2)
-        # write snapshot for legacy readers
-        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
-        with open(self.snapshot_path, 'w', encoding='utf-8') as f:
-            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        # serialize under the state lock, write outside it; commits happen in serialization order
+        with self._io_lock:
+            with self._lock:
+                if self.export_snapshot:
+                    for key in list(self._lazy):
+                        self._need(key)
+                self._dirty = False
+                ops, self._pending = self._pending, []
+                full = self.export_snapshot or self.backend.needs_state(len(ops))
+                data = json.dumps(self.state, ensure_ascii=False, separators=(',', ':')) if full else None
+            try:
+                self.backend.commit(ops, data)
+            except BaseException:
+                # keep the operations for the next attempt, ahead of any recorded meanwhile
+                with self._lock:
+                    self._pending[:0] = ops
+                    self._dirty = True
+                raise
+            self._export(data)
+            self.writes += 1
+
+    def _export(self, data: str | None):
+        if self.export_snapshot and data is not None:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(self.snapshot_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+
+    def subscribe(self, key: str, fn):
+        # fn(key) runs on the mutating thread after every change of state[key]; '*' = any key
+        self._listeners.setdefault(key, []).append(fn)
+        return fn
+
+    def unsubscribe(self, key: str, fn):
+        fns = self._listeners.get(key)
+        if fns and fn in fns:
+            fns.remove(fn)
+
+    def _notify(self, key: str):
+        for fn in self._listeners.get(key, []) + self._listeners.get('*', []):
+            fn(key)
+
+    def _changed(self, key: str):
+        # called by every mutator after its change (outside _lock: _flush takes _io_lock first)
+        self._schedule_write()
+        self._notify(key)
+
+    def _schedule_write(self):
+        if not self.write_behind or self._closed:
+            self._flush()
+            return
+        with self._wake:
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._first_change = now
+            self._last_change = now
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name='save-writer', daemon=True)
+                self._writer.start()
+            self._wake.notify()
+
+    def _write_loop(self):
+        retry_s = 0.0
+        while True:
+            with self._wake:
+                while not self._dirty and not self._closed:
+                    self._wake.wait()
+                if not self._dirty:
+                    return
+                if retry_s:
+                    retry_at = time.monotonic() + retry_s
+                    while not self._closed and time.monotonic() < retry_at:
+                        self._wake.wait(retry_at - time.monotonic())
+                # debounce: wait for a quiet period, bounded by max_delay after the first change
+                while not self._closed:
+                    due = min(self._last_change + self.debounce_s, self._first_change + self.max_delay_s)
+                    left = due - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._wake.wait(left)
+            try:
+                self._flush()
+                retry_s = 0.0
+            except Exception:
+                # the operations stay pending; close() makes the last attempt
+                log.exception("saving profile %r failed", self.username)
+                if self._closed:
+                    return
+                retry_s = min(self.RETRY_MAX_S, max(self.RETRY_MIN_S, retry_s * 2))
+
+    def is_dirty(self) -> bool:
+        return self._dirty
+
+    def checkpoint(self):
+        # write pending changes now (e.g. after a battle)
+        if self._dirty:
+            self._flush()
+
+    def close(self):
+        # flush and stop the writer; later mutations are written synchronously
+        with self._wake:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+        if self._writer is not None:
+            self._writer.join(timeout=5.0)
+        self.checkpoint()
+        self.backend.close()
 
     # currency
     def get_diamonds(self) -> int:
         return int(self.state.get('diamonds', 0))
 
     def add_diamonds(self, amount: int) -> int:
-        cur = self.get_diamonds()
-        cur += int(amount)
-        if cur < 0:
-            cur = 0
-        self.state['diamonds'] = cur
-        self._flush()
+        with self._lock:
+            old = self.get_diamonds()
+            cur = max(0, old + int(amount))
+            self.state['diamonds'] = cur
+            self._record('add', ['diamonds'], cur - old)
+        self._changed('diamonds')
         return cur
 
     def spend_diamonds(self, amount: int) -> bool:
-        cur = self.get_diamonds()
-        if cur < amount:
-            return False
-        self.state['diamonds'] = cur - amount
-        self._flush()
+        with self._lock:
+            cur = self.get_diamonds()
+            if cur < amount:
+                return False
+            self.state['diamonds'] = cur - amount
+            self._record('add', ['diamonds'], -amount)
+        self._changed('diamonds')
         return True
 
     # cards
     def get_owned(self) -> List[str]:
+        self._need('owned_cards')
         return list(self.state.get('owned_cards', []))
 
     def add_cards(self, ids: List[str]):
-        owned = set(self.state.get('owned_cards', []))
-        for i in ids:
-            if i:
-                owned.add(i)
-        self.state['owned_cards'] = sorted(list(owned))
-        self._flush()
+        self._need('owned_cards')
+        with self._lock:
+            owned = set(self.state.get('owned_cards', []))
+            new = sorted({i for i in ids if i} - owned)
+            if not new:
+                return
+            owned.update(new)
+            self.state['owned_cards'] = sorted(owned)
+            self._record('cards', [], new)
+        self._changed('owned_cards')
 
     # deck
     def get_deck(self) -> List[str]:
         return list(self.state.get('deck', []))
 
     def set_deck(self, ids: List[str]):
-        self.state['deck'] = list(ids)
-        self._flush()
+        with self._lock:
+            self.state['deck'] = list(ids)
+            self._record('set', ['deck'], list(ids))
+        self._changed('deck')
 
     # gacha stats
     def inc_gacha_single(self, n: int = 1):
-        g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
-        g['single'] = int(g.get('single', 0)) + n
-        self._flush()
+        with self._lock:
+            g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
+            g['single'] = int(g.get('single', 0)) + n
+            self._record('add', ['gacha', 'single'], n)
+        self._changed('gacha')
 
     def inc_gacha_ten(self, n: int = 1):
-        g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
-        g['ten'] = int(g.get('ten', 0)) + n
-        self._flush()
+        with self._lock:
+            g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
+            g['ten'] = int(g.get('ten', 0)) + n
+            self._record('add', ['gacha', 'ten'], n)
+        self._changed('gacha')
+
+    def gacha_seed(self) -> int:
+        with self._lock:
+            g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
+            created = 'seed' not in g
+            if created:
+                g['seed'] = random.SystemRandom().randrange(1 << 32)
+                self._record('set', ['gacha', 'seed'], g['seed'])
+            seed = int(g['seed'])
+        if created:
+            self._changed('gacha')
+        return seed
+
+    def reserve_pulls(self, n: int) -> int:
+        # returns the index of the first of n consecutive pulls
+        with self._lock:
+            g = self.state.setdefault('gacha', {"single": 0, "ten": 0})
+            first = int(g.get('pulls', 0))
+            g['pulls'] = first + int(n)
+            self._record('add', ['gacha', 'pulls'], int(n))
+        self._changed('gacha')
+        return first
+
+    def record_pull(self, pull_index: int, result: dict):
+        self._need('gacha_history')
+        with self._lock:
+            entry = [int(pull_index), dict(result)]
+            self.state.setdefault('gacha_history', []).append(entry)
+            self._record('pull', [], entry)
+        self._changed('gacha_history')
+
+    def get_pull_history(self) -> List[list]:
+        self._need('gacha_history')
+        with self._lock:
+            return [list(e) for e in self.state.get('gacha_history', [])]
 
     # time/progress
     def add_playtime(self, seconds: int):
-        self.state['playtime_seconds'] = int(self.state.get('playtime_seconds', 0)) + int(seconds)
-        self._flush()
+        with self._lock:
+            self.state['playtime_seconds'] = int(self.state.get('playtime_seconds', 0)) + int(seconds)
+            self._record('add', ['playtime_seconds'], int(seconds))
+        self._changed('playtime_seconds')
+
+    def get_stage_progress(self) -> Dict[str, str]:
+        self._need('progress')
+        with self._lock:
+            return dict(self.state.get('progress', {}).get('stages', {}))
 
     def set_stage_progress(self, stage_id: str, status: str):
-        prog = self.state.setdefault('progress', {}).setdefault('stages', {})
-        prog[str(stage_id)] = status
-        self._flush()
+        self._need('progress')
+        with self._lock:
+            prog = self.state.setdefault('progress', {}).setdefault('stages', {})
+            prog[str(stage_id)] = status
+            self._record('set', ['progress', 'stages', str(stage_id)], status)
+        self._changed('progress')
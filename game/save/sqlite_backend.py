@@ -0,0 +1,213 @@
+import os
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from .backends import SaveBackend
+from .journal import JournalBackend
+
+SCHEMA_VERSION = 1
+DB_NAME = "saves.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS profile (
+    user TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (user, key)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS owned_cards (
+    user TEXT NOT NULL, card_id TEXT NOT NULL,
+    PRIMARY KEY (user, card_id)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS decks (
+    user TEXT NOT NULL, position INTEGER NOT NULL, card_id TEXT NOT NULL,
+    PRIMARY KEY (user, position)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gacha_history (
+    user TEXT NOT NULL, pull INTEGER NOT NULL, result TEXT NOT NULL,
+    PRIMARY KEY (user, pull)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stage_progress (
+    user TEXT NOT NULL, stage_id TEXT NOT NULL, status TEXT NOT NULL,
+    PRIMARY KEY (user, stage_id)) WITHOUT ROWID;
+"""
+
+# statements are constant strings, so sqlite3's statement cache prepares each one once
+_UPSERT_PROFILE = ("INSERT INTO profile (user, key, value) VALUES (?, ?, ?) "
+                   "ON CONFLICT (user, key) DO UPDATE SET value = excluded.value")
+_ADD_PROFILE = ("INSERT INTO profile (user, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (user, key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + ? AS TEXT)")
+_ADD_CARD = "INSERT OR IGNORE INTO owned_cards (user, card_id) VALUES (?, ?)"
+_CLEAR_DECK = "DELETE FROM decks WHERE user = ?"
+_ADD_DECK = "INSERT INTO decks (user, position, card_id) VALUES (?, ?, ?)"
+_ADD_PULL = "INSERT OR REPLACE INTO gacha_history (user, pull, result) VALUES (?, ?, ?)"
+_SET_STAGE = ("INSERT INTO stage_progress (user, stage_id, status) VALUES (?, ?, ?) "
+              "ON CONFLICT (user, stage_id) DO UPDATE SET status = excluded.status")
+_TABLES = ("profile", "owned_cards", "decks", "gacha_history", "stage_progress")
+
+# state keys with their own table; everything else is a profile row keyed by its dotted path
+_COLLECTIONS = ("owned_cards", "deck", "gacha_history")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # one connection per backend, used from the GUI thread on load and the save writer after;
+    # SaveManager serializes those calls
+    con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(_SCHEMA)
+    con.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+    return con
+
+
+def _flatten(node: dict, prefix: str = ""):
+    for k, v in node.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict) and v and key != "progress.stages":
+            yield from _flatten(v, key + ".")
+        elif key not in _COLLECTIONS and key != "progress.stages":
+            yield key, v
+
+
+class SqliteBackend(SaveBackend):
+    # every profile in data/saves/saves.db (one save slot per user). operations map to row
+    # updates in indexed tables, so adding a card or a pull never rewrites the collection
+    name = "sqlite"
+
+    def __init__(self, saves_dir: str, username: str, db_path: str | None = None):
+        self.saves_dir = saves_dir
+        self.user = username
+        self.path = db_path or os.path.join(saves_dir, DB_NAME)
+        self.con = connect(self.path)
+
+    # --- load ---
+    def load(self):
+        if self.con.execute("SELECT 1 FROM profile WHERE user = ? LIMIT 1", (self.user,)).fetchone() is None:
+            return self._import_files()
+        return self.read_state()
+
+    def read_state(self) -> Dict[str, Any]:
+        u = (self.user,)
+        state: Dict[str, Any] = {}
+        try:
+            for key, value in self.con.execute("SELECT key, value FROM profile WHERE user = ?", u):
+                node = state
+                parts = key.split(".")
+                for p in parts[:-1]:
+                    node = node.setdefault(p, {})
+                node[parts[-1]] = json.loads(value)
+        except ValueError as e:
+            raise ValueError(f"unreadable profile row for {self.user!r} in {self.path}: {e}") from e
+        state["owned_cards"] = [r[0] for r in self.con.execute(
+            "SELECT card_id FROM owned_cards WHERE user = ? ORDER BY card_id", u)]
+        state["deck"] = [r[0] for r in self.con.execute(
+            "SELECT card_id FROM decks WHERE user = ? ORDER BY position", u)]
+        stages = {r[0]: r[1] for r in self.con.execute(
+            "SELECT stage_id, status FROM stage_progress WHERE user = ?", u)}
+        state.setdefault("progress", {})["stages"] = stages
+        history = [[r[0], json.loads(r[1])] for r in self.con.execute(
+            "SELECT pull, result FROM gacha_history WHERE user = ? ORDER BY pull", u)]
+        if history:
+            state["gacha_history"] = history
+        return state
+
+    def _import_files(self) -> Optional[Dict[str, Any]]:
+        # migration: a profile saved by the journal or json backend moves into the database once
+        old = JournalBackend(self.saves_dir, self.user, fsync=False)
+        state = old.load()
+        if state is not None:
+            self.reset(json.dumps(state, ensure_ascii=False))
+        return state
+
+    # --- write ---
+    def needs_state(self, n_ops: int) -> bool:
+        return False
+
+    def commit(self, ops: List[list], state_json: Optional[str]):
+        if not ops:
+            return
+        u = self.user
+        con = self.con
+        con.execute("BEGIN")
+        try:
+            for kind, path, value in ops:
+                if kind == "cards":
+                    con.executemany(_ADD_CARD, [(u, c) for c in value])
+                elif kind == "pull":
+                    con.execute(_ADD_PULL, (u, int(value[0]), json.dumps(value[1], ensure_ascii=False)))
+                elif path == ["deck"]:
+                    con.execute(_CLEAR_DECK, (u,))
+                    con.executemany(_ADD_DECK, [(u, i, c) for i, c in enumerate(value)])
+                elif path[:2] == ["progress", "stages"] and len(path) == 3:
+                    con.execute(_SET_STAGE, (u, path[2], value))
+                elif kind == "add":
+                    con.execute(_ADD_PROFILE, (u, ".".join(path), json.dumps(int(value)), int(value)))
+                else:
+                    con.execute(_UPSERT_PROFILE, (u, ".".join(path), json.dumps(value, ensure_ascii=False)))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def reset(self, state_json: str):
+        state = json.loads(state_json)
+        u = self.user
+        con = self.con
+        con.execute("BEGIN")
+        try:
+            for table in _TABLES:
+                con.execute(f"DELETE FROM {table} WHERE user = ?", (u,))
+            con.executemany(_UPSERT_PROFILE, [(u, k, json.dumps(v, ensure_ascii=False))
+                                              for k, v in _flatten(state)])
+            con.executemany(_ADD_CARD, [(u, c) for c in state.get("owned_cards", []) if c])
+            con.executemany(_ADD_DECK, [(u, i, c) for i, c in enumerate(state.get("deck", []))])
+            stages = (state.get("progress") or {}).get("stages") or {}
+            con.executemany(_SET_STAGE, [(u, str(k), v) for k, v in stages.items()])
+            con.executemany(_ADD_PULL, [(u, int(p), json.dumps(r, ensure_ascii=False))
+                                        for p, r in state.get("gacha_history", [])])
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def quarantine(self):
+        # the file holds other users too: copy this user's rows into quarantine_<stamp>_<table>
+        # tables before the fresh profile replaces them
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        moved = []
+        con = self.con
+        con.execute("BEGIN")
+        try:
+            for table in _TABLES:
+                dest = f"quarantine_{stamp}_{table}"
+                con.execute(f'CREATE TABLE IF NOT EXISTS "{dest}" AS SELECT * FROM {table} WHERE 0')
+                n = con.execute(f'INSERT INTO "{dest}" SELECT * FROM {table} WHERE user = ?', (self.user,)).rowcount
+                if n:
+                    moved.append(f"{self.path}:{dest}")
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        return moved
+
+    def close(self):
+        if self.con is not None:
+            self.con.close()
+            self.con = None
+
+
+def migrate_json_saves(saves_dir: str, db_path: str | None = None) -> List[str]:
+    # import every data/saves/<user>.json (or journal snapshot) not yet in the database
+    users = set()
+    for name in os.listdir(saves_dir) if os.path.isdir(saves_dir) else ():
+        if name.endswith(".snapshot.json"):
+            users.add(name[:-len(".snapshot.json")])
+        elif name.endswith(".json"):
+            users.add(name[:-len(".json")])
+    imported = []
+    for user in sorted(users):
+        backend = SqliteBackend(saves_dir, user, db_path)
+        try:
+            if backend.con.execute("SELECT 1 FROM profile WHERE user = ? LIMIT 1", (user,)).fetchone() is None:
+                if backend.load() is not None:
+                    imported.append(user)
+        finally:
+            backend.close()
+    return imported
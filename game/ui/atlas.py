@@ -0,0 +1,74 @@
+import os
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPixmap, QPainter, QPainterPath
+from game.core.content import get_registry
+from .pixmap_cache import pixmap_cache
+
+# written by scripts/pack_atlas.py; items fall back to standalone files when absent
+ATLAS_INDEX = "assets/atlas/cards.json"
+
+
+def atlas_frame(project_root: str, image_path: str):
+    # (atlas pixmap, source rect) for an image packed into the atlas, else None
+    if not image_path:
+        return None
+    index = get_registry(project_root).get(ATLAS_INDEX)
+    if not index:
+        return None
+    rel = image_path
+    if os.path.isabs(rel):
+        rel = os.path.relpath(rel, project_root)
+    fr = index.get("frames", {}).get(rel.replace(os.sep, "/"))
+    if fr is None:
+        return None
+    atlas_path = os.path.join(os.path.dirname(os.path.join(project_root, ATLAS_INDEX)), index.get("image", ""))
+    pix = pixmap_cache().source(atlas_path)
+    if pix.isNull():
+        return None
+    return pix, QRectF(fr["x"], fr["y"], fr["w"], fr["h"])
+
+
+def fit_size(sw: float, sh: float, w: float, h: float, keep_aspect: bool):
+    # same result as QPixmap.scaled(w, h, KeepAspectRatio) for the drawn size
+    if not keep_aspect or sw <= 0 or sh <= 0:
+        return w, h
+    k = min(w / sw, h / sh)
+    return round(sw * k), round(sh * k)
+
+
+class AtlasFaceMixin:
+    # for QGraphicsPixmapItem subclasses: draw the face as a sub-rect of the shared atlas
+    # texture so every card on screen samples the same GL texture.
+    _atlas_face = None  # (atlas pixmap, source rect, target rect, smooth)
+
+    def set_atlas_face(self, atlas: QPixmap, src: QRectF, w: float, h: float,
+                       keep_aspect: bool = False, smooth: bool = False):
+        dw, dh = fit_size(src.width(), src.height(), w, h, keep_aspect)
+        self.prepareGeometryChange()
+        self._atlas_face = (atlas, QRectF(src), QRectF(0, 0, dw, dh), smooth)
+        self.setPixmap(QPixmap())
+        self.update()
+
+    def clear_atlas_face(self):
+        if self._atlas_face is not None:
+            self.prepareGeometryChange()
+            self._atlas_face = None
+
+    def boundingRect(self):
+        if self._atlas_face is not None:
+            return QRectF(self._atlas_face[2])
+        return super().boundingRect()
+
+    def shape(self):
+        if self._atlas_face is not None:
+            path = QPainterPath()
+            path.addRect(self._atlas_face[2])
+            return path
+        return super().shape()
+
+    def paint(self, painter, option, widget=None):
+        if self._atlas_face is None:
+            return super().paint(painter, option, widget)
+        atlas, src, dst, smooth = self._atlas_face
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, smooth)
+        painter.drawPixmap(dst, atlas, src)
@@ -1,7 +1,7 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QStackedWidget, QMessageBox, QTextEdit, QDialog, QInputDialog
+    QStackedWidget, QMessageBox, QTextEdit, QDialog, QInputDialog, QComboBox, QFileDialog
 )
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtGui import QSurfaceFormat
@@ -10,6 +10,7 @@ from PyQt5.QtCore import QTimer
 
 from game.battle.battle_view import BattleView
 from game.battle.battle_controller import BattleController
+from game.battle import timing, render_policy
 from .pages.menu_page import MenuPage
 from .pages.gacha_page import GachaPage
 from ..save.save_manager import SaveManager
@@ -38,7 +39,7 @@ class MainWindow(QMainWindow):
         # Pages
         self.menu_page = MenuPage(self._on_nav)
         self.gacha_page = GachaPage(self.save, on_back=self._back_to_menu)
-        self.inventory_page = InventoryPage(self._project_root(), on_back=self._back_to_menu)
+        self.inventory_page = InventoryPage(self._project_root(), self.save, on_back=self._back_to_menu)
         # Deck/Stage pages will be created below
 
         self.stack.addWidget(self.menu_page)      # index 0
@@ -60,6 +61,31 @@ class MainWindow(QMainWindow):
         top_row.setContentsMargins(8, 8, 8, 0)
         battle_layout.addLayout(top_row)
         top_row.addStretch(1)
+        # battle speed: scales every battle animation; 即时 resolves turns synchronously
+        self.cmb_speed = QComboBox()
+        for text, value in timing.SPEEDS:
+            self.cmb_speed.addItem(text, value)
+        self.cmb_speed.setFixedWidth(80)
+        self.cmb_speed.currentIndexChanged.connect(
+            lambda i: timing.set_speed(self.cmb_speed.itemData(i))
+        )
+        top_row.addWidget(QLabel("速度"))
+        top_row.addWidget(self.cmb_speed)
+        # render profile: viewport update mode and item cache policy
+        self.cmb_render = QComboBox()
+        for text, value in render_policy.PROFILES:
+            self.cmb_render.addItem(text, value)
+        self.cmb_render.setCurrentIndex(self.cmb_render.findData(render_policy.profile()))
+        self.cmb_render.setFixedWidth(80)
+        top_row.addWidget(self.cmb_render)
+        # frame-time overlay (also F3 on the battle view) and csv export
+        self.btn_stats = QPushButton("FPS")
+        self.btn_stats.setCheckable(True)
+        self.btn_stats.setFixedWidth(50)
+        top_row.addWidget(self.btn_stats)
+        self.btn_stats_export = QPushButton("导出统计")
+        self.btn_stats_export.setFixedWidth(80)
+        top_row.addWidget(self.btn_stats_export)
         self.btn_pause = QPushButton("暂停")
         self.btn_pause.setFixedWidth(80)
         top_row.addWidget(self.btn_pause)
@@ -73,6 +99,11 @@ class MainWindow(QMainWindow):
 
         self.view = BattleView(self)
         battle_layout.addWidget(self.view)
+        self.cmb_render.currentIndexChanged.connect(
+            lambda i: self.view.set_render_profile(self.cmb_render.itemData(i))
+        )
+        self.btn_stats.toggled.connect(self.view.set_overlay_visible)
+        self.btn_stats_export.clicked.connect(self._export_frame_stats)
 
         # Bottom controls (only visible on battle page)
         btn_row = QHBoxLayout()
@@ -100,6 +131,13 @@ class MainWindow(QMainWindow):
         # Initially show menu
         self.stack.setCurrentIndex(0)
 
+    def closeEvent(self, event):
+        # flush the write-behind profile before the process goes away
+        try:
+            self.save.close()
+        finally:
+            super().closeEvent(event)
+
     def _project_root(self) -> str:
         # .../game/ui/main_window.py -> project root
         return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -109,10 +147,8 @@ class MainWindow(QMainWindow):
         username, ok = QInputDialog.getText(self, "选择存档", "请输入用户名：", text="player")
         if not ok:
             username = "player"
-        sm = SaveManager(root, username)
-        # ensure snapshot written
-        # SaveManager already flushes on load
-        return sm
+        # pages and the battle controller read this store and subscribe to its changes
+        return SaveManager(root, username)
 
     def _on_nav(self, key: str):
         if key == "gacha":
@@ -133,7 +169,7 @@ class MainWindow(QMainWindow):
         if self.deck_page is not None:
             return
         from .pages.deck_page import DeckPage
-        self.deck_page = DeckPage(self._project_root(), on_back=self._back_to_menu)
+        self.deck_page = DeckPage(self._project_root(), self.save, on_back=self._back_to_menu)
         self.stack.addWidget(self.deck_page)
 
     def _ensure_stage_page(self):
@@ -147,10 +183,7 @@ class MainWindow(QMainWindow):
         # init controller lazily
         if self.controller is None:
             self.controller = BattleController(self.view)
-            try:
-                self.controller.load_demo_stage()
-            except Exception as e:
-                QMessageBox.critical(self, "Load Error", str(e))
+            self.controller.set_save(self.save)
             self.btn_end_turn.clicked.connect(self.controller.end_player_turn)
             self.controller.set_energy_label(self.lbl_energy)
             # battle end handler
@@ -168,6 +201,8 @@ class MainWindow(QMainWindow):
                         QMessageBox.warning(self, "失败", "战斗失败…")
                 # back to stage list
                 self.stack.setCurrentIndex(self.stack.indexOf(self.stage_page))
+                # natural save point: write pending profile changes now
+                self.save.checkpoint()
             self.controller.on_end = on_end
             # log wiring
             self.controller.log_fn = self._append_log
@@ -175,10 +210,24 @@ class MainWindow(QMainWindow):
             # pause button
             self.btn_pause.clicked.connect(self._show_pause_dialog)
 
+        # fresh units for every pick; stage layout comes from data/stages.json
+        try:
+            self.controller.load_stage(stage_id)
+        except Exception as e:
+            QMessageBox.critical(self, "Load Error", str(e))
+            return
         self.stack.setCurrentIndex(self.stack.indexOf(self.battle_container))
         self.txt_log.clear()
         QTimer.singleShot(50, self.controller.start_battle)
 
+    def _export_frame_stats(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出帧统计", "frame_stats.csv", "CSV (*.csv)")
+        if not path:
+            return
+        n = self.view.frame_stats.export_csv(path)
+        if n == 0:
+            QMessageBox.information(self, "提示", "暂无统计数据（请先开启 FPS 叠加层）")
+
     def _back_to_menu(self):
         self.stack.setCurrentIndex(self.stack.indexOf(self.menu_page))
 
@@ -202,4 +251,10 @@ class MainWindow(QMainWindow):
         btn_exit.clicked.connect(_exit)
         lay.addWidget(btn_cont)
         lay.addWidget(btn_exit)
-        dlg.exec_()
+        # freeze every battle tween and pending delay while the dialog is open
+        animator = self.view.battle_scene.animator
+        animator.pause()
+        try:
+            dlg.exec_()
+        finally:
+            animator.resume()
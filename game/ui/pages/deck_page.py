@@ -1,10 +1,13 @@
 from PyQt5.QtCore import Qt, QSize, QMimeData
-from PyQt5.QtGui import QIcon, QPixmap, QDrag
+from PyQt5.QtGui import QIcon, QPixmap, QDrag, QColor
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
     QHBoxLayout, QPushButton, QFrame
 )
-import os, json
+import os
+from ...core.content import get_registry
+from ..pixmap_cache import get_pixmap
+from ...save.save_manager import SaveManager
 
 
 class DropSlot(QLabel):
@@ -55,9 +58,10 @@ class DropSlot(QLabel):
 
 
 class DeckPage(QWidget):
-    def __init__(self, project_root: str, on_back=None):
+    def __init__(self, project_root: str, save: SaveManager, on_back=None):
         super().__init__()
         self.project_root = project_root
+        self.save = save
         self.on_back = on_back
         root = QVBoxLayout(self)
         root.setContentsMargins(16, 16, 16, 16)
@@ -105,6 +109,7 @@ class DeckPage(QWidget):
 
         self.reload_cards()
         self.load_deck()
+        save.subscribe('deck', self.load_deck)
 
         # enable dragging from list
         self.list.mouseMoveEvent = self._list_mouse_move
@@ -116,32 +121,21 @@ class DeckPage(QWidget):
 
     def reload_cards(self):
         self.list.clear()
-        try:
-            with open(self._resolve('data/skillscard.json'), 'r', encoding='utf-8') as f:
-                cards = json.load(f).get('cards', [])
-        except Exception:
-            cards = []
-        for c in cards:
+        for c in get_registry(self.project_root).skill_cards():
             img = self._resolve(c.get('image', ''))
-            pix = QPixmap(img)
-            if pix.isNull():
-                pix = QPixmap(84, 108)
-                pix.fill(Qt.gray)
+            # scaled once to the icon size and shared with the battle page
+            pix = get_pixmap(img, 84, 108, Qt.KeepAspectRatio, Qt.SmoothTransformation, fallback=QColor(Qt.gray))
             it = QListWidgetItem(QIcon(pix), f"{c.get('label','')}\nCost {c.get('cost',0)}")
             it.setData(Qt.UserRole, c.get('id'))
             self.list.addItem(it)
 
-    def load_deck(self):
-        # place existing deck into slots
+    def load_deck(self, key=None):
+        # place the profile's deck into slots
         for s in self.slots:
             s.card_id = None
             s.setPixmap(QPixmap())
             s.setText("空")
-        try:
-            with open(self._resolve('data/deck.json'), 'r', encoding='utf-8') as f:
-                ids = json.load(f).get('deck', [])
-        except Exception:
-            ids = []
+        ids = self.save.get_deck()
         # build icon lookup
         icon_map = {}
         for i in range(self.list.count()):
@@ -167,6 +161,4 @@ class DeckPage(QWidget):
         drag.exec_(Qt.MoveAction)
 
     def save_deck(self):
-        deck_ids = [s.card_id for s in self.slots if s.card_id]
-        with open(self._resolve('data/deck.json'), 'w', encoding='utf-8') as f:
-            json.dump({"deck": deck_ids}, f, ensure_ascii=False, indent=2)
+        self.save.set_deck([s.card_id for s in self.slots if s.card_id])
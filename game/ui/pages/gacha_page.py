@@ -1,8 +1,8 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem, QMessageBox
 import os
-import json
-import random
+from ...core.content import get_registry
+from ...core.gacha import pull_rng, roll_once
 from ...save.save_manager import SaveManager
 
 
@@ -50,17 +50,14 @@ class GachaPage(QWidget):
 
         self._load_pool()
         self._refresh()
+        save.subscribe('diamonds', self._refresh)
 
-    def _refresh(self):
+    def _refresh(self, key=None):
         self.lbl_diamond.setText(f"钻石 {self.save.get_diamonds()}")
 
     def _load_pool(self):
         # load all card ids from skillscard.json
-        try:
-            with open(os.path.join(self.project_root, 'data', 'skillscard.json'), 'r', encoding='utf-8') as f:
-                self.all_cards = [c.get('id') for c in json.load(f).get('cards', []) if c.get('id')]
-        except Exception:
-            self.all_cards = []
+        self.all_cards = list(get_registry(self.project_root).skill_cards_by_id())
         # initial deck should only have base five; pool includes新加入的四张及基础五张也可被抽取
 
     def _do_single(self):
@@ -68,19 +65,19 @@ class GachaPage(QWidget):
             QMessageBox.warning(self, "提示", "钻石不足")
             return
         self.save.inc_gacha_single(1)
-        results = self._roll_once()
+        results = self._roll_once(self.save.reserve_pulls(1))
         self._apply_results(results)
         self._show_results(results)
-        self._refresh()
 
     def _do_ten(self):
         if not self.save.spend_diamonds(100):
             QMessageBox.warning(self, "提示", "钻石不足")
             return
         self.save.inc_gacha_ten(1)
+        first = self.save.reserve_pulls(10)
         all_results = []
-        for _ in range(10):
-            all_results.append(self._roll_once())
+        for i in range(10):
+            all_results.append(self._roll_once(first + i))
         # apply aggregate
         for r in all_results:
             self._apply_results(r)
@@ -88,32 +85,12 @@ class GachaPage(QWidget):
         self.list.clear()
         for r in all_results:
             self._append_result_item(r)
-        self._refresh()
 
-    def _roll_once(self):
-        # probabilities:
-        # 50% +1 diamond, 20% +1 card, 5% +3 diamonds, 3% +8 diamonds, 2% +3 cards, else 20% no reward
-        x = random.random()
-        if x < 0.50:
-            return {"diamonds": 1}
-        x -= 0.50
-        if x < 0.20:
-            return {"cards": [self._rand_card()]}
-        x -= 0.20
-        if x < 0.05:
-            return {"diamonds": 3}
-        x -= 0.05
-        if x < 0.03:
-            return {"diamonds": 8}
-        x -= 0.03
-        if x < 0.02:
-            return {"cards": [self._rand_card(), self._rand_card(), self._rand_card()]}
-        return {"none": True}
-
-    def _rand_card(self) -> str:
-        if not self.all_cards:
-            return ""
-        return random.choice(self.all_cards)
+    def _roll_once(self, pull_index: int):
+        # seeded per (profile, pull number) so every pull can be reproduced
+        r = roll_once(pull_rng(self.save.gacha_seed(), pull_index), self.all_cards)
+        self.save.record_pull(pull_index, r)
+        return r
 
     def _apply_results(self, r: dict):
         if 'diamonds' in r:
@@ -1,13 +1,17 @@
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QHBoxLayout, QPushButton
-from PyQt5.QtGui import QIcon, QPixmap
-import os, json
+from PyQt5.QtGui import QIcon, QColor
+import os
+from ...core.content import get_registry
+from ..pixmap_cache import get_pixmap
+from ...save.save_manager import SaveManager
 
 
 class InventoryPage(QWidget):
-    def __init__(self, project_root: str, on_back=None):
+    def __init__(self, project_root: str, save: SaveManager, on_back=None):
         super().__init__()
         self.project_root = project_root
+        self.save = save
         self.on_back = on_back
         root = QVBoxLayout(self)
         root.setContentsMargins(16, 16, 16, 16)
@@ -39,36 +43,25 @@ class InventoryPage(QWidget):
         root.addWidget(self.list)
 
         self.reload()
+        save.subscribe('diamonds', self._refresh_diamonds)
 
     def _resolve(self, rel):
         if os.path.isabs(rel):
             return rel
         return os.path.join(self.project_root, rel)
 
+    def _refresh_diamonds(self, key=None):
+        self.lbl_diamond.setText(f"钻石 {self.save.get_diamonds()}")
+
     def reload(self):
-        # update diamonds
-        try:
-            with open(self._resolve('data/player.json'), 'r', encoding='utf-8') as f:
-                import json as _json
-                d = _json.load(f)
-                v = int(d.get('diamonds', 0))
-        except Exception:
-            v = 0
-        self.lbl_diamond.setText(f"钻石 {v}")
+        reg = get_registry(self.project_root)
+        self._refresh_diamonds()
 
         self.list.clear()
-        cfg_path = os.path.join(self.project_root, 'data', 'skillscard.json')
-        try:
-            with open(cfg_path, 'r', encoding='utf-8') as f:
-                cards = json.load(f).get('cards', [])
-        except Exception:
-            cards = []
-        for c in cards:
+        for c in reg.skill_cards():
             img = self._resolve(c.get('image', ''))
-            pix = QPixmap(img)
-            if pix.isNull():
-                pix = QPixmap(84, 108)
-                pix.fill(Qt.gray)
+            # scaled once to the icon size and shared with the battle page
+            pix = get_pixmap(img, 84, 108, Qt.KeepAspectRatio, Qt.SmoothTransformation, fallback=QColor(Qt.gray))
             item = QListWidgetItem(QIcon(pix), f"{c.get('label','')}\nCost {c.get('cost',0)}")
             item.setData(Qt.UserRole, c.get('id'))
             self.list.addItem(item)
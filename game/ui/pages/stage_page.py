@@ -1,5 +1,6 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QGridLayout, QPushButton, QHBoxLayout
+from game.core.content import get_registry
 
 
 class StagePage(QWidget):
@@ -28,6 +29,8 @@ class StagePage(QWidget):
         grid.setSpacing(8)
         root.addLayout(grid)
 
+        # stages defined in data/stages.json are playable; the rest stay locked
+        available = {s.get("id"): s for s in get_registry().stages()}
         total = 40
         per_row = 5
         for i in range(total):
@@ -36,8 +39,10 @@ class StagePage(QWidget):
             idx = i + 1
             btn = QPushButton(str(idx))
             btn.setFixedSize(80, 80)
-            if idx == 1:
+            stage = available.get(idx)
+            if stage is not None:
                 btn.setEnabled(True)
+                btn.setToolTip(f"{stage.get('name', '')}  {len(stage.get('player_team', []))} vs {len(stage.get('enemy_team', []))}")
                 btn.clicked.connect(lambda _, sid=idx: self.on_pick(sid))
             else:
                 btn.setEnabled(False)
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QColor
+
+
+class PixmapCache:
+    # decoded and pre-scaled pixmaps keyed by (path, w, h, aspect, transform), LRU within a byte budget
+
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024):
+        self.budget_bytes = int(budget_bytes)
+        self._items: OrderedDict = OrderedDict()  # key -> (QPixmap, cost)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _cost(pix: QPixmap) -> int:
+        return max(1, pix.width() * pix.height() * max(1, pix.depth()) // 8)
+
+    def _lookup(self, key):
+        hit = self._items.get(key)
+        if hit is None:
+            return None
+        self._items.move_to_end(key)
+        return hit[0]
+
+    def _store(self, key, pix: QPixmap):
+        cost = self._cost(pix)
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._items[key] = (pix, cost)
+        self.bytes += cost
+        # evict least recently used, but never the entry just stored
+        while self.bytes > self.budget_bytes and len(self._items) > 1:
+            _, (_, c) = self._items.popitem(last=False)
+            self.bytes -= c
+
+    def source(self, path: str) -> QPixmap:
+        # the decoded file at its native size (null pixmap if missing)
+        key = (path, 0, 0, None, None)
+        pix = self._lookup(key)
+        if pix is None:
+            pix = QPixmap(path) if path else QPixmap()
+            if not pix.isNull():
+                self._store(key, pix)
+        return pix
+
+    def get(self, path: str, width: int = 0, height: int = 0,
+            aspect=Qt.IgnoreAspectRatio, transform=Qt.FastTransformation,
+            fallback: QColor | None = None) -> QPixmap:
+        if width <= 0 or height <= 0:
+            return self.source(path)
+        key = (path, int(width), int(height), int(aspect), int(transform))
+        pix = self._lookup(key)
+        if pix is not None:
+            self.hits += 1
+            return pix
+        self.misses += 1
+        src = self.source(path)
+        if src.isNull():
+            pix = QPixmap(int(width), int(height))
+            pix.fill(fallback if fallback is not None else QColor("gray"))
+        else:
+            pix = src.scaled(int(width), int(height), aspect, transform)
+        self._store(key, pix)
+        return pix
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+
+_cache: PixmapCache | None = None
+
+
+def pixmap_cache() -> PixmapCache:
+    global _cache
+    if _cache is None:
+        _cache = PixmapCache()
+    return _cache
+
+
+def get_pixmap(path: str, width: int = 0, height: int = 0,
+               aspect=Qt.IgnoreAspectRatio, transform=Qt.FastTransformation,
+               fallback: QColor | None = None) -> QPixmap:
+    return pixmap_cache().get(path, width, height, aspect, transform, fallback)
@@ -0,0 +1,197 @@
+"""Monte Carlo balance runner: plays seeded headless battles per (deck, stage).
+
+    python scripts/balance_runner.py -n 10000 --out runs.csv.gz --summary summary.json
+    python scripts/balance_runner.py -n 1000 --stage 1 --deck burst=heavy_strike,twin_strike,attack_basic
+
+Per-battle rows are streamed to --out as they arrive, so memory stays flat
+however many battles are played; only per-pair histograms are kept.
+
+Enemies make plain attacks unless --planner is given; then they plan their turns
+with the game's EnemyPlanner at the stage's difficulty, like in real battles.
+That is much slower, and because the planner searches on a wall-clock budget,
+those runs are not exactly reproducible from the seed.
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from game.core import content  # noqa: E402
+from game.core.enemy_ai import EnemyPlanner  # noqa: E402
+
+# per-process content, loaded once by the pool initializer
+_worker = {}
+
+
+def _init_worker(project_root: str, planner: bool = False):
+    _worker["root"] = project_root
+    _worker["cards"] = content.load_skill_cards(project_root)
+    _worker["logic"] = content.load_effect_logic(project_root)
+    _worker["compiled"] = content.get_registry(project_root).compiled_cards()
+    _worker["planner"] = planner
+
+
+def _play_chunk(task):
+    deck_name, deck_ids, stage, start, count, base_seed, max_rounds = task
+    rows = []
+    for i in range(start, start + count):
+        seed = base_seed + i
+        # energy comes from the stage leader's entry in data/cards.json (build_engine default)
+        engine = content.build_engine(_worker["root"], stage, deck=deck_ids, seed=seed,
+                                      cards=_worker["cards"], logic=_worker["logic"],
+                                      compiled=_worker["compiled"])
+        enemy = None
+        if _worker["planner"]:
+            enemy = EnemyPlanner.for_floor(stage.get("id"), seed=seed).plan
+        res = engine.run(max_rounds=max_rounds, enemy=enemy)
+        st = res["stats"]
+        rows.append((seed, res["result"] or "timeout", st["rounds"], st["damage_dealt"], st["damage_taken"]))
+    return deck_name, stage.get("id"), rows
+
+
+class PairStats:
+    def __init__(self):
+        self.results = Counter()
+        self.rounds = Counter()
+        self.damage_dealt = Counter()
+        self.damage_taken = Counter()
+
+    def add(self, result: str, rounds: int, dealt: int, taken: int):
+        self.results[result] += 1
+        self.rounds[rounds] += 1
+        self.damage_dealt[dealt] += 1
+        self.damage_taken[taken] += 1
+
+    @staticmethod
+    def _dist(hist: Counter) -> dict:
+        n = sum(hist.values())
+        if n == 0:
+            return {}
+        out = {"mean": round(sum(k * v for k, v in hist.items()) / n, 3), "min": min(hist), "max": max(hist)}
+        marks = [(0.5, "p50"), (0.95, "p95"), (0.99, "p99")]
+        seen = 0
+        for k in sorted(hist):
+            seen += hist[k]
+            while marks and seen >= marks[0][0] * n:
+                out[marks.pop(0)[1]] = k
+        return out
+
+    def summary(self) -> dict:
+        n = sum(self.results.values())
+        return {
+            "battles": n,
+            "win_rate": round(self.results["win"] / n, 4) if n else 0.0,
+            "results": dict(self.results),
+            "rounds": self._dist(self.rounds),
+            "damage_dealt": self._dist(self.damage_dealt),
+            "damage_taken": self._dist(self.damage_taken),
+        }
+
+
+def _parse_decks(args) -> dict:
+    decks = {}
+    if args.decks:
+        with open(args.decks, "r", encoding="utf-8") as f:
+            decks.update({str(k): list(v) for k, v in json.load(f).items()})
+    for spec in args.deck or []:
+        name, _, ids = spec.partition("=")
+        decks[name] = [i for i in ids.split(",") if i]
+    if not decks:
+        decks["deck"] = (content.load_json(ROOT, "data/deck.json", {}) or {}).get("deck", [])
+        profile = _profile_deck(args.profile)
+        if profile:
+            decks["player"] = profile
+    return decks
+
+
+def _profile_deck(username: str) -> list:
+    # the deck of a saved profile, read without starting a SaveManager (no writes)
+    from game.save.save_manager import BACKENDS
+    backend = BACKENDS["journal"](os.path.join(ROOT, "data", "saves"), username)
+    try:
+        state = backend.load() or {}
+    except ValueError:
+        state = {}
+    finally:
+        backend.close()
+    return list(state.get("deck", []))
+
+
+def _tasks(decks: dict, stages: list, n: int, chunk: int, base_seed: int, max_rounds: int):
+    for name, ids in decks.items():
+        for stage in stages:
+            for start in range(0, n, chunk):
+                yield name, ids, stage, start, min(chunk, n - start), base_seed, max_rounds
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Play seeded headless battles and report balance stats.")
+    ap.add_argument("-n", "--battles", type=int, default=1000, help="battles per (deck, stage) pair")
+    ap.add_argument("--stage", type=int, action="append", help="stage id (repeatable; default: all)")
+    ap.add_argument("--deck", action="append", help="name=id1,id2,... (repeatable)")
+    ap.add_argument("--decks", help="json file mapping deck name -> list of card ids")
+    ap.add_argument("--profile", default="player", help="saved profile whose deck is run as 'player'")
+    ap.add_argument("--seed", type=int, default=0, help="base seed; battle i uses seed+i")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk", type=int, default=500, help="battles per worker task")
+    ap.add_argument("--max-rounds", type=int, default=200)
+    ap.add_argument("--planner", action="store_true",
+                    help="enemies plan like in the game (slow, not exactly reproducible); default: plain attacks")
+    ap.add_argument("--out", help="per-battle csv (.gz to compress)")
+    ap.add_argument("--summary", help="write aggregated stats as json")
+    args = ap.parse_args(argv)
+
+    stages = content.load_stages(ROOT)
+    if args.stage:
+        stages = [s for s in stages if s.get("id") in set(args.stage)]
+    if not stages:
+        ap.error("no matching stages in data/stages.json")
+    decks = _parse_decks(args)
+
+    stats: dict[tuple, PairStats] = {}
+    out_f = writer = None
+    if args.out:
+        opener = gzip.open if args.out.endswith(".gz") else open
+        out_f = opener(args.out, "wt", encoding="utf-8", newline="")
+        writer = csv.writer(out_f)
+        writer.writerow(["deck", "stage", "seed", "result", "rounds", "damage_dealt", "damage_taken"])
+
+    t0 = time.perf_counter()
+    total = 0
+    tasks = _tasks(decks, stages, args.battles, max(1, args.chunk), args.seed, args.max_rounds)
+    try:
+        with Pool(max(1, args.workers), initializer=_init_worker, initargs=(ROOT, args.planner)) as pool:
+            for deck_name, stage_id, rows in pool.imap_unordered(_play_chunk, tasks):
+                ps = stats.setdefault((deck_name, stage_id), PairStats())
+                for seed, result, rounds, dealt, taken in rows:
+                    ps.add(result, rounds, dealt, taken)
+                if writer is not None:
+                    writer.writerows((deck_name, stage_id) + r for r in rows)
+                total += len(rows)
+    finally:
+        if out_f is not None:
+            out_f.close()
+    elapsed = time.perf_counter() - t0
+
+    report = {f"{d}@{s}": ps.summary() for (d, s), ps in sorted(stats.items(), key=lambda kv: str(kv[0]))}
+    for key, r in report.items():
+        print(f"{key:24s} n={r['battles']:<9d} win={r['win_rate']:.2%}  "
+              f"rounds={r['rounds'].get('mean')}  dealt={r['damage_dealt'].get('mean')}  "
+              f"taken={r['damage_taken'].get('mean')} (p95 {r['damage_taken'].get('p95')})")
+    print(f"{total} battles in {elapsed:.2f}s ({total / max(elapsed, 1e-9):.0f}/s)")
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"battles": total, "seconds": round(elapsed, 3), "pairs": report}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
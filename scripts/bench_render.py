@@ -0,0 +1,133 @@
+"""Repeatable battle-view render benchmark: same units, same animation script, per render profile.
+
+    python scripts/bench_render.py                    # all profiles, GL viewport if available
+    python scripts/bench_render.py --raster --units 24 --seconds 8 --csv bench.csv
+
+Frame time is the interval between consecutive viewport paints while a fixed,
+seeded mix of hit/heartbeat/charge/wobble tweens keeps the scene busy.
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from PyQt5.QtCore import QObject, QEvent, QTimer, QPointF  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from game.battle.battle_view import BattleView  # noqa: E402
+from game.battle.card_item import CardItem  # noqa: E402
+from game.battle import render_policy  # noqa: E402
+
+
+class PaintClock(QObject):
+    def __init__(self):
+        super().__init__()
+        self.stamps = []
+
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint:
+            self.stamps.append(time.perf_counter())
+        return False
+
+
+def _pct(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+def run_profile(app, profile: str, units: int, seconds: float, opengl: bool, seed: int) -> dict:
+    view = BattleView(use_opengl=opengl)
+    view.set_render_profile(profile)
+    view.resize(920, 520)
+    view.show()
+    scene = view.battle_scene
+    face = os.path.join(ROOT, "assets", "Card", "FrontTexture.png")
+    cols = max(1, int(units ** 0.5 + 0.999))
+    size = 900 / (cols + 1)
+    items = []
+    for i in range(units):
+        it = CardItem(face, name=f"U{i}", max_hp=100, atk=10)
+        it.setScale(1.0)
+        scene.addItem(it)
+        it.setPos(20 + (i % cols) * size, 20 + (i // cols) * size * 0.8)
+        items.append(it)
+
+    rng = random.Random(seed)
+
+    def script():
+        # fixed mix of effects, same sequence for every profile
+        for _ in range(max(1, units // 4)):
+            it = items[rng.randrange(len(items))]
+            k = rng.randrange(4)
+            if k == 0:
+                it.play_hit_fx()
+                it.take_damage(1)
+            elif k == 1:
+                it.heartbeat(times=2, duration_ms=600)
+            elif k == 2:
+                other = items[rng.randrange(len(items))]
+                it.charge_attack(QPointF(other.pos()), None)
+            else:
+                it.wobble(duration_ms=400)
+        scene.animator.call_later(120, script)
+
+    clock = PaintClock()
+    view.viewport().installEventFilter(clock)
+    scene.animator.call_later(0, script)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    scene.animator.pause()
+
+    frames = [b - a for a, b in zip(clock.stamps, clock.stamps[1:])]
+    frames_ms = sorted(f * 1000 for f in frames)
+    n = len(frames_ms)
+    res = {
+        "profile": profile,
+        "viewport": "opengl" if view.is_opengl() else "raster",
+        "units": units,
+        "frames": n,
+        "fps": round(n / seconds, 1),
+        "mean_ms": round(sum(frames_ms) / n, 2) if n else 0.0,
+        "p50_ms": round(_pct(frames_ms, 0.50), 2),
+        "p95_ms": round(_pct(frames_ms, 0.95), 2),
+        "p99_ms": round(_pct(frames_ms, 0.99), 2),
+    }
+    view.close()
+    view.deleteLater()
+    return res
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark BattleView render profiles.")
+    ap.add_argument("--profile", action="append", help="profile name (repeatable; default: all)")
+    ap.add_argument("--units", type=int, default=12)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--raster", action="store_true", help="force the raster viewport")
+    ap.add_argument("--csv", help="append results to this csv")
+    args = ap.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    profiles = args.profile or [p for _, p in render_policy.PROFILES]
+    rows = [run_profile(app, p, args.units, args.seconds, not args.raster, args.seed) for p in profiles]
+    for r in rows:
+        print(f"{r['profile']:12s} {r['viewport']:7s} units={r['units']:<4d} fps={r['fps']:<7} "
+              f"mean={r['mean_ms']}ms p50={r['p50_ms']} p95={r['p95_ms']} p99={r['p99_ms']}")
+    if args.csv:
+        new = not os.path.exists(args.csv)
+        with open(args.csv, "a", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            if new:
+                w.writeheader()
+            w.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Import data/saves/<user>.json (and journal snapshots) into the SQLite save database.
+
+    python scripts/migrate_saves.py
+    python scripts/migrate_saves.py --db data/saves/saves.db
+
+Profiles already in the database are left alone; the source files are kept.
+Start the game with SaveManager(..., backend="sqlite") to use the database.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from game.save.sqlite_backend import migrate_json_saves, DB_NAME  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--saves", default=os.path.join(ROOT, "data", "saves"))
+    ap.add_argument("--db", default=None, help=f"database file (default: <saves>/{DB_NAME})")
+    args = ap.parse_args()
+    users = migrate_json_saves(args.saves, args.db)
+    print(f"imported {len(users)} profile(s)" + (": " + ", ".join(users) if users else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Pack every PNG under assets/ into one atlas image plus a JSON index of sub-rects.
+
+    python scripts/pack_atlas.py                       # assets/ -> assets/atlas/cards.png + cards.json
+    python scripts/pack_atlas.py --src assets/Card --padding 2 --max-width 1024
+
+Frames are keyed by project-relative path ("assets/Card/GoldFrame.png"), the same
+strings data/skillscard.json uses, so game.ui.atlas can map card images to rects.
+Each sprite's border pixels are extruded into its padding to avoid filtering bleed.
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def pack_shelves(sizes: dict, padding: int = 2, max_width: int = 1024):
+    # simple shelf packer: tallest first, left to right, new shelf when a row is full.
+    # returns (width, height, {name: (x, y)}) with power-of-two width/height.
+    order = sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k))
+    widest = max((w for w, _ in sizes.values()), default=0) + 2 * padding
+    width = 1
+    while width < max(max_width, widest):
+        width *= 2
+    pos = {}
+    x = y = shelf_h = 0
+    for name in order:
+        w, h = sizes[name]
+        cw, ch = w + 2 * padding, h + 2 * padding
+        if x + cw > width:
+            x, y = 0, y + shelf_h
+            shelf_h = 0
+        pos[name] = (x + padding, y + padding)
+        x += cw
+        shelf_h = max(shelf_h, ch)
+    used_h = y + shelf_h
+    height = 1
+    while height < used_h:
+        height *= 2
+    # shrink width when everything fits on one short shelf
+    used_w = max((pos[n][0] + sizes[n][0] + padding for n in pos), default=1)
+    while width // 2 >= used_w:
+        width //= 2
+    return width, height, pos
+
+
+def _collect(src_dir: str, skip_dir: str) -> list:
+    found = []
+    for dirpath, _, files in os.walk(src_dir):
+        if os.path.abspath(dirpath).startswith(os.path.abspath(skip_dir)):
+            continue
+        for fn in sorted(files):
+            if fn.lower().endswith(".png"):
+                found.append(os.path.join(dirpath, fn))
+    return sorted(found)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build a sprite atlas from PNGs under assets/.")
+    ap.add_argument("--src", default=os.path.join(ROOT, "assets"))
+    ap.add_argument("--out", default=os.path.join(ROOT, "assets", "atlas", "cards.png"))
+    ap.add_argument("--padding", type=int, default=2)
+    ap.add_argument("--max-width", type=int, default=1024)
+    args = ap.parse_args(argv)
+
+    # Qt is only needed for image IO; the packing itself is plain python
+    from PyQt5.QtCore import QRect
+    from PyQt5.QtGui import QImage, QPainter
+
+    out_dir = os.path.dirname(os.path.abspath(args.out))
+    images = {}
+    for path in _collect(args.src, out_dir):
+        img = QImage(path)
+        if img.isNull():
+            print(f"skip (unreadable): {path}")
+            continue
+        key = os.path.relpath(path, ROOT).replace(os.sep, "/")
+        images[key] = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    if not images:
+        print("no images found")
+        return 1
+
+    sizes = {k: (img.width(), img.height()) for k, img in images.items()}
+    pad = max(0, args.padding)
+    width, height, pos = pack_shelves(sizes, pad, args.max_width)
+
+    atlas = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(0)
+    p = QPainter(atlas)
+    frames = {}
+    for key, img in images.items():
+        x, y = pos[key]
+        w, h = sizes[key]
+        p.drawImage(x, y, img)
+        if pad:
+            # extrude edges and corners into the padding
+            p.drawImage(QRect(x, y - pad, w, pad), img, QRect(0, 0, w, 1))
+            p.drawImage(QRect(x, y + h, w, pad), img, QRect(0, h - 1, w, 1))
+            p.drawImage(QRect(x - pad, y, pad, h), img, QRect(0, 0, 1, h))
+            p.drawImage(QRect(x + w, y, pad, h), img, QRect(w - 1, 0, 1, h))
+            for cx, cy, sx, sy in ((x - pad, y - pad, 0, 0), (x + w, y - pad, w - 1, 0),
+                                   (x - pad, y + h, 0, h - 1), (x + w, y + h, w - 1, h - 1)):
+                p.drawImage(QRect(cx, cy, pad, pad), img, QRect(sx, sy, 1, 1))
+        frames[key] = {"x": x, "y": y, "w": w, "h": h}
+    p.end()
+
+    os.makedirs(out_dir, exist_ok=True)
+    if not atlas.save(args.out, "PNG"):
+        print(f"failed to write {args.out}")
+        return 1
+    index_path = os.path.splitext(args.out)[0] + ".json"
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"image": os.path.basename(args.out), "size": [width, height], "padding": pad,
+                   "frames": frames}, f, ensure_ascii=False, indent=2)
+    print(f"packed {len(frames)} sprites into {width}x{height}: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
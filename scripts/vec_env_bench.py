@@ -0,0 +1,98 @@
+"""Throughput and baseline win rates of the vectorized battle environment.
+
+    python scripts/vec_env_bench.py                       # every stage, 4096 battles, 3 s each
+    python scripts/vec_env_bench.py --bench --stage 5 -k 16384 --policy random --seconds 10
+
+--bench runs the large-team encounters in scripts/bench_stages.json (up to 4 vs 20)
+instead of the game's data/stages.json.
+
+Needs numpy.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_STAGES = os.path.join(ROOT, "scripts", "bench_stages.json")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from game.core.content import get_registry  # noqa: E402
+from game.core.vec_env import VecBattleEnv, END_TURN  # noqa: E402
+
+
+def first_affordable(env, rng):
+    # same as battle_engine.first_affordable: leftmost playable slot, front target
+    mask = env.action_mask()
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), END_TURN), None
+
+
+def random_policy(env, rng):
+    # uniform over playable slots and end turn; random target index (invalid -> front)
+    mask = np.concatenate([env.action_mask(), np.ones((env.k, 1), dtype=bool)], axis=1)
+    keys = np.where(mask, rng.random(mask.shape), -1.0)
+    pick = keys.argmax(axis=1)
+    cards = np.where(pick == env.HAND_SIZE, END_TURN, pick)
+    return cards, rng.integers(0, env.n_units, env.k)
+
+
+POLICIES = {"first": first_affordable, "random": random_policy}
+
+
+def run(stage: dict, k: int, seconds: float, policy: str, seed: int) -> dict:
+    env = VecBattleEnv.from_stage(ROOT, stage, k, seed=seed)
+    act = POLICIES[policy]
+    rng = np.random.default_rng(seed)
+    wins = losses = truncated = steps = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        cards, targets = act(env, rng)
+        _, _, done, info = env.step(cards, targets)
+        steps += k
+        res = info["result"][done]
+        wins += int((res == 1).sum())
+        losses += int((res == -1).sum())
+        truncated += int(info["truncated"].sum())
+    dt = time.perf_counter() - t0
+    finished = max(1, wins + losses + truncated)
+    return {
+        "stage": stage.get("id"),
+        "units": env.n_units,
+        "k": k,
+        "steps_per_s": int(steps / dt),
+        "battles": wins + losses + truncated,
+        "win_rate": round(wins / finished, 4),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Step K battles in lock-step and report throughput.")
+    ap.add_argument("--stage", type=int, action="append", help="stage id (repeatable; default: all)")
+    ap.add_argument("-k", type=int, default=4096, help="parallel battles")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="first")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--bench", action="store_true", help="use scripts/bench_stages.json")
+    args = ap.parse_args(argv)
+
+    if args.bench:
+        with open(BENCH_STAGES, "r", encoding="utf-8") as f:
+            stages = json.load(f).get("stages", [])
+    else:
+        stages = get_registry(ROOT).stages()
+    if args.stage:
+        stages = [s for s in stages if s.get("id") in set(args.stage)]
+    if not stages:
+        ap.error("no matching stages")
+    for stage in stages:
+        r = run(stage, args.k, args.seconds, args.policy, args.seed)
+        print(f"stage {r['stage']:<3} units={r['units']:<3} k={r['k']:<6} {r['steps_per_s']:>9} steps/s  "
+              f"battles={r['battles']:<8} win={r['win_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from game.battle import timing
+from game.battle.battle_view import BattleView
+from game.battle.battle_controller import BattleController
+from game.core import content
+from game.core.replay import BattleReplay
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+def instant():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    old = timing.speed()
+    timing.set_speed(0.0)
+    yield app
+    timing.set_speed(old)
+
+
+def _wait(app, cond, timeout=10.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < end, "timed out"
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def test_instant_speed_starts_each_player_turn_once(instant):
+    view = BattleView(use_opengl=False)
+    ctrl = BattleController(view)
+    ctrl.load_stage(1)
+    started = []
+    real_start = ctrl.start_player_turn
+
+    def start_player_turn():
+        started.append(ctrl.engine.rounds)
+        real_start()
+    ctrl.start_player_turn = start_player_turn
+    ctrl.start_battle(seed=7)
+
+    assert len(started) == 1
+    for turn in range(2, 7):
+        if ctrl._ended:
+            break
+        ctrl.engine.play_card(0)
+        ctrl.end_player_turn()
+        _wait(instant, lambda: ctrl._ended or len(started) >= turn)
+        # let a duplicate start (the old double finish()) surface before counting
+        for _ in range(50):
+            instant.processEvents()
+        assert len(started) == turn or ctrl._ended
+        assert len(started) == len(set(started))
+
+    replay = BattleReplay.from_engine(ctrl.engine, stage=ctrl.stage_id)
+    stage = content.get_registry(ROOT).stage(ctrl.stage_id)
+    assert replay.verify(content.build_engine(ROOT, stage))
+
+
+def test_paused_battle_holds_the_enemy_plan(instant):
+    view = BattleView(use_opengl=False)
+    ctrl = BattleController(view)
+    ctrl.load_stage(1)
+    ctrl.start_battle(seed=7)
+    ctrl.scene.animator.pause()
+    ctrl.end_player_turn()
+    job = ctrl._ai_job
+    _wait(instant, lambda: job is None or job.done())
+    for _ in range(50):
+        instant.processEvents()
+    assert ctrl.engine.enemy_plans == []
+    ctrl.scene.animator.resume()
+    _wait(instant, lambda: ctrl._ai_job is None and ctrl.turn == 0)
+    assert len(ctrl.engine.enemy_plans) == 1
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from game.core import content
+from game.core.battle_engine import BattleEngine
+from game.core.combatant import Combatant
+from game.core.combatant_table import CombatantTable
+
+
+def test_engine_clone_detaches_from_the_table():
+    reg = content.get_registry()
+    table = CombatantTable.from_combatants([Combatant("Hero", 120, 20)],
+                                           [Combatant(f"Slime{i}", 100, 10) for i in range(3)])
+    players, enemies = table.teams()
+    engine = BattleEngine(players, enemies, reg.skill_cards(), reg.effect_logic(), reg.deck(), seed=1)
+    engine.start()
+    engine.start_player_turn()
+    hp = table.hp.copy()
+
+    clone = engine.clone()
+    clone.play_card(0)
+    clone.end_player_turn()
+    clone.enemy_turn()
+    clone.enemy_team[0].take_damage(30)
+
+    assert (table.hp == hp).all()
+    assert [u.hp for u in engine.enemy_team] == [100, 100, 100]
+    assert clone.enemy_team[0].hp < 100
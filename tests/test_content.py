@@ -0,0 +1,29 @@
+from game.core import content
+from game.core.battle_engine import BattleEngine
+from game.core.combatant import Combatant
+
+
+def _engine(reg):
+    return BattleEngine(Combatant("Hero", 100, 20), Combatant("Slime", 100, 10),
+                        reg.skill_cards(), reg.effect_logic(), reg.deck(), compiled=reg.compiled_cards())
+
+
+def test_cards_compile_once_per_content_version():
+    reg = content.get_registry()
+    assert reg.compiled_cards() is reg.compiled_cards()
+    engine = _engine(reg)
+    compiled, pool = engine._compiled, engine._pool
+    # per-turn refresh with unchanged content keeps everything
+    engine.set_content(reg.skill_cards(), reg.effect_logic(), reg.deck(), reg.compiled_cards())
+    assert engine._compiled is compiled and engine._pool is pool
+    card = reg.skill_cards()[0]
+    assert engine.compiled(card) is compiled[card["id"]]
+
+
+def test_foreign_card_dict_is_compiled_on_its_own():
+    reg = content.get_registry()
+    engine = _engine(reg)
+    card = dict(reg.skill_cards()[0])  # same id, different dict
+    cc = engine.compiled(card)
+    assert cc.card is card
+    assert cc is not engine._compiled[card["id"]]
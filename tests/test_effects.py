@@ -0,0 +1,58 @@
+import pytest
+
+from game.core import content
+from game.core.battle_engine import BattleEngine
+from game.core.status import describe
+from game.core.combatant import Combatant
+
+# test-only cards: exercise apply kinds that no shipped card uses
+CLEAVE = {"id": "cleave", "label": "横扫", "image": "", "cost": 2,
+          "effects": [{"name": "deal_damage_all", "multiplier": 0.5}]}
+POISON_BLADE = {"id": "poison_blade", "label": "淬毒", "image": "", "cost": 1,
+                "effects": [{"name": "apply_poison", "multiplier": 4}]}
+
+
+def _units(n_enemies):
+    return [Combatant("Hero", 120, 20)], [Combatant(f"Slime{i}", 100, 10) for i in range(n_enemies)]
+
+
+def _engine(card, n_enemies=3):
+    reg = content.get_registry()
+    players, enemies = _units(n_enemies)
+    engine = BattleEngine(players, enemies, reg.skill_cards() + [card], reg.effect_logic(), [card["id"]], seed=1)
+    engine.start()
+    engine.start_player_turn()
+    return engine
+
+
+def test_damage_all_hits_every_enemy():
+    engine = _engine(CLEAVE)
+    assert engine.play_card(0) is not None
+    hp = [u.hp for u in engine.enemy_team]
+    assert hp[0] < 100 and len(set(hp)) == 1
+
+
+def test_damage_all_matches_vec_env():
+    pytest.importorskip("numpy")
+    from game.core.vec_env import VecBattleEnv
+    reg = content.get_registry()
+    players, enemies = _units(3)
+    env = VecBattleEnv(players, enemies, reg.skill_cards() + [CLEAVE], reg.effect_logic(), ["cleave"], k=4, seed=1)
+    obs, _, _, _ = env.step([0] * 4)
+    engine = _engine(CLEAVE)
+    engine.play_card(0)
+    expected = [u.hp for u in engine.player_team + engine.enemy_team]
+    assert all(list(row) == expected for row in obs["hp"])
+
+
+def test_poison_ticks_at_round_start():
+    engine = _engine(POISON_BLADE, n_enemies=1)
+    engine.play_card(0)
+    target = engine.enemy_team[0]
+    stacks = target.statuses["poison"].stacks
+    assert stacks > 0 and describe(target)
+    engine.end_player_turn()
+    engine.enemy_turn()
+    engine.start_player_turn()
+    assert target.hp == 100 - stacks
+    assert target.statuses["poison"].stacks == stacks - 1
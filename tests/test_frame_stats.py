@@ -0,0 +1,25 @@
+from game.battle.frame_stats import FrameStats
+
+
+def _burst(stats, start, n, step=0.016):
+    stats.set_active(True)
+    t = start
+    for _ in range(n):
+        stats.frame(t, t + 0.002)
+        t += step
+    stats.set_active(False)
+    return t
+
+
+def test_idle_gap_is_not_a_frame():
+    stats = FrameStats()
+    t = _burst(stats, 0.0, 30)
+    # idle: the overlay refreshes every 250 ms
+    for i in range(8):
+        stats.frame(t + 0.25 * i, t + 0.25 * i + 0.001)
+    _burst(stats, t + 5.0, 30)
+    assert len(stats.frames) == 58  # 29 intervals per burst
+    pct = stats.percentiles()
+    assert pct["p99"] < 17.0
+    assert stats.histogram()[-1] == 0
+    assert stats.snapshot(0, 0)["fps"] > 60
@@ -0,0 +1,52 @@
+from game.save.packed import _ENTRY, _HEADER
+from game.save.save_manager import SaveManager
+
+
+def _section(path, wanted):
+    data = path.read_bytes()
+    _, _, count = _HEADER.unpack_from(data, 0)
+    for i in range(count):
+        name, offset, size, _ = _ENTRY.unpack_from(data, _HEADER.size + i * _ENTRY.size)
+        if name.rstrip(b"\0") == wanted:
+            return offset, size
+    raise KeyError(wanted)
+
+
+def test_lazy_sections_load_on_first_use(tmp_path):
+    sm = SaveManager(str(tmp_path), "u", write_behind=False, backend="packed")
+    sm.add_cards(["rare_a"])
+    sm.record_pull(0, {"cards": ["rare_a"]})
+    sm.close()
+    again = SaveManager(str(tmp_path), "u", write_behind=False, backend="packed")
+    assert "owned_cards" not in again.state
+    assert "rare_a" in again.get_owned()
+    assert again.get_pull_history() == [[0, {"cards": ["rare_a"]}]]
+    again.close()
+
+
+def test_damaged_lazy_section_is_quarantined_on_first_use(tmp_path):
+    sm = SaveManager(str(tmp_path), "u", write_behind=False, backend="packed")
+    sm.add_cards(["rare_a"])
+    sm.record_pull(0, {"cards": ["rare_a"]})
+    sm.add_diamonds(5000)
+    sm.close()
+    path = tmp_path / "data" / "saves" / "u.sav"
+    offset, size = _section(path, b"collect")
+    data = bytearray(path.read_bytes())
+    data[offset + size // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    again = SaveManager(str(tmp_path), "u", write_behind=False, backend="packed")
+    assert not again.quarantined  # startup reads only the header and the wallet
+    assert again.get_diamonds() == 6000
+    assert "rare_a" not in again.get_owned()  # damaged collection reset to the starter cards
+    assert again.quarantined
+    assert again.get_pull_history() == [[0, {"cards": ["rare_a"]}]]  # readable sections kept
+    again.add_diamonds(1)
+    again.close()
+
+    reloaded = SaveManager(str(tmp_path), "u", write_behind=False, backend="packed")
+    assert reloaded.get_diamonds() == 6001
+    assert reloaded.get_owned() == again.get_owned()
+    assert len(reloaded.get_pull_history()) == 1
+    reloaded.close()
@@ -0,0 +1,60 @@
+import time
+from game.save.journal import JournalBackend
+from game.save.save_manager import SaveManager
+
+
+class FlakyJournal(JournalBackend):
+    # fails the next `failures` commits that carry operations
+    def __init__(self, saves_dir, username, failures=1):
+        super().__init__(saves_dir, username, fsync=False)
+        self.failures = failures
+
+    def commit(self, ops, state_json):
+        if ops and self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        super().commit(ops, state_json)
+
+
+def test_failed_commit_keeps_operations(tmp_path):
+    saves = tmp_path / "data" / "saves"
+    sm = SaveManager(str(tmp_path), "u", write_behind=False, backend=FlakyJournal(str(saves), "u"))
+    try:
+        sm.add_diamonds(100)
+    except OSError:
+        pass
+    assert sm.get_diamonds() == 1100
+    assert sm.is_dirty()
+    sm.add_diamonds(1)  # the retry commits both changes
+    sm.close()
+    assert not sm.is_dirty()
+    again = SaveManager(str(tmp_path), "u", write_behind=False)
+    assert again.get_diamonds() == 1101
+    again.close()
+
+
+class BrokenOnce(JournalBackend):
+    # a non-OSError failure, as raised by the sqlite or packed backends
+    def __init__(self, saves_dir, username):
+        super().__init__(saves_dir, username, fsync=False)
+        self.failed = False
+
+    def commit(self, ops, state_json):
+        if ops and not self.failed:
+            self.failed = True
+            raise ValueError("damaged section")
+        super().commit(ops, state_json)
+
+
+def test_writer_survives_backend_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(SaveManager, "RETRY_MIN_S", 0.01)
+    saves = tmp_path / "data" / "saves"
+    sm = SaveManager(str(tmp_path), "u", debounce_ms=0, max_delay_ms=0,
+                     backend=BrokenOnce(str(saves), "u"))
+    sm.add_diamonds(5)
+    deadline = time.monotonic() + 5
+    while sm.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sm.writes == 1 and not sm.is_dirty()
+    assert sm._writer.is_alive()
+    sm.close()
@@ -0,0 +1,26 @@
+import sqlite3
+
+from game.save.save_manager import SaveManager
+
+
+def test_unreadable_rows_are_quarantined(tmp_path):
+    sm = SaveManager(str(tmp_path), "u", write_behind=False, backend="sqlite")
+    sm.add_diamonds(5000)
+    sm.add_cards(["rare_a", "rare_b"])
+    sm.close()
+    db = tmp_path / "data" / "saves" / "saves.db"
+    con = sqlite3.connect(str(db))
+    con.execute("UPDATE profile SET value = '{broken' WHERE user = 'u' AND key = 'playtime_seconds'")
+    con.commit()
+
+    again = SaveManager(str(tmp_path), "u", write_behind=False, backend="sqlite")
+    assert again.get_diamonds() == 1000  # fresh profile
+    assert again.quarantined
+    again.close()
+    kept = {t: con.execute(f'SELECT * FROM "{t}"').fetchall()
+            for p in again.quarantined for t in [p.rsplit(":", 1)[1]]}
+    profile = next(rows for t, rows in kept.items() if t.endswith("_profile"))
+    cards = next(rows for t, rows in kept.items() if t.endswith("_owned_cards"))
+    assert ("u", "diamonds", "6000") in profile
+    assert {("u", "rare_a"), ("u", "rare_b")} <= set(cards)
+    con.close()